@@ -0,0 +1,230 @@
+"""
+Vectorized scoring backend for CandidateScorer: a candidate pool is turned
+into a feature matrix once, and every job is scored over it with array
+operations instead of per-candidate rule calls
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from candidate import SCORE_CATEGORIES, Candidate, as_candidate
+from job_context import JobContext
+from skill_bitset import batch_skill_overlap, pack_masks, popcount
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Scores given to a candidate whose fields cannot be scored (same as the rule path)
+FAILED_SCORE = 1.0
+
+
+class CandidateFeatures:
+    """
+    Job-independent features of a candidate pool, one row per candidate.
+
+    Education, companies and location are stored as indexes into their
+    distinct values: pools share a small set of schools, employers and
+    cities, so the text rules run once per distinct value and job instead
+    of once per candidate. The headline-only trajectory score and the skill
+    masks are computed here, since they don't depend on the job.
+    """
+
+    def __init__(self, candidates: Iterable, scorer):
+        self.candidates: List[Candidate] = list(map(as_candidate, candidates))
+        self.educations: List[str] = []
+        self.companies: List[str] = []
+        self.locations: List[str] = []
+        education_ids: Dict[Tuple[str, ...], int] = {}
+        company_ids: Dict[Tuple[str, ...], int] = {}
+        location_ids: Dict[str, int] = {}
+        trajectories: Dict[str, float] = {}
+
+        rows = []
+        masks = []
+        failed = []
+        for row, candidate in enumerate(self.candidates):
+            try:
+                education = candidate.education
+                education_id = education_ids.get(education)
+                if education_id is None:
+                    self.educations.append(' '.join(education).lower())
+                    education_id = education_ids[education] = len(self.educations) - 1
+
+                companies = candidate.companies
+                company_id = company_ids.get(companies)
+                if company_id is None:
+                    self.companies.append(' '.join(companies).lower())
+                    company_id = company_ids[companies] = len(self.companies) - 1
+
+                location = candidate.location
+                location_id = location_ids.get(location)
+                if location_id is None:
+                    self.locations.append(location.lower())
+                    location_id = location_ids[location] = len(self.locations) - 1
+
+                headline = candidate.headline
+                trajectory = trajectories.get(headline)
+                if trajectory is None:
+                    trajectory = trajectories[headline] = scorer._score_headline_trajectory(headline.lower())
+
+                rows.append((education_id, company_id, location_id, trajectory,
+                             len(companies) if companies else 1, candidate.get('experience_years', 0)))
+                masks.append(scorer._candidate_skill_mask(candidate))
+            except Exception as e:
+                print(f"Error scoring candidate {candidate.name}: {e}")
+                rows.append((0, 0, 0, FAILED_SCORE, 1, 0))
+                masks.append(0)
+                failed.append(row)
+
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        self.education_id = columns[:, 0].astype(np.intp)
+        self.company_id = columns[:, 1].astype(np.intp)
+        self.location_id = columns[:, 2].astype(np.intp)
+        self.trajectory = columns[:, 3]
+        self.company_count = columns[:, 4]
+        self.experience_years = columns[:, 5]
+        self.failed = np.zeros(len(self.candidates), dtype=bool)
+        self.failed[failed] = True
+
+        self.skill_width = scorer.skill_vocabulary.width
+        if self.skill_width <= 64:
+            self.skill_masks = np.fromiter(masks, dtype=np.uint64, count=len(masks))
+        else:
+            self.skill_masks = pack_masks(masks, self.skill_width)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
+class BatchScorer:
+    """
+    Scores a CandidateFeatures matrix with the scorer's rubric.
+
+    Results are identical to CandidateScorer's rule path: text rules are the
+    scorer's own methods applied to distinct values, numeric rules keep the
+    same comparisons, and the weighted sum adds the columns in weight order
+    so every fit score is the same float before rounding.
+    """
+
+    def __init__(self, scorer):
+        self.scorer = scorer
+
+    def _distinct_scores(self, values: List[str], rule: Callable[[str, JobContext], float], job: JobContext):
+        """Score of each distinct value; NaN where the rule raises"""
+        scores = np.empty(len(values) or 1, dtype=np.float64)
+        for position, value in enumerate(values):
+            try:
+                scores[position] = rule(value, job)
+            except Exception as e:
+                print(f"Error scoring '{value}': {e}")
+                scores[position] = np.nan
+        return scores
+
+    def _skills_scores(self, features: CandidateFeatures, job: JobContext):
+        job_count = popcount(job.skill_mask)
+        if not job_count:
+            return np.full(len(features), 5.0)
+        if features.skill_masks.ndim == 1 and hasattr(np, 'bitwise_count'):
+            overlap = np.bitwise_count(features.skill_masks & np.uint64(job.skill_mask)) / job_count
+        else:
+            overlap = batch_skill_overlap(features.skill_masks.reshape(len(features), -1), job.skill_mask)
+        return np.select(
+            [overlap >= 0.8, overlap >= 0.6, overlap >= 0.4, overlap >= 0.2],
+            [9.5, 8.0, 7.0, 6.0],
+            default=4.0
+        )
+
+    def _tenure_scores(self, features: CandidateFeatures):
+        company_count = features.company_count
+        avg_tenure = features.experience_years / company_count
+        return np.select(
+            [
+                (avg_tenure >= 2.0) & (avg_tenure <= 3.0),
+                (avg_tenure >= 1.5) & (avg_tenure < 2.0),
+                (avg_tenure >= 1.0) & (avg_tenure < 1.5),
+                (avg_tenure >= 0.5) & (avg_tenure < 1.0),
+                (company_count > 3) & (avg_tenure < 1.0)
+            ],
+            [9.5, 8.0, 7.0, 6.0, 3.0],
+            default=5.0
+        )
+
+    def score_matrix(self, features: CandidateFeatures, job: JobContext,
+                     weights: Optional[Dict[str, float]] = None):
+        """
+        Returns ``(breakdown, fit_scores)``: an (n, 6) array of dimension
+        scores in SCORE_CATEGORIES order and the rounded weighted fit scores
+        """
+        scorer = self.scorer
+        weights = weights or scorer.weights
+        breakdown = np.empty((len(features), len(SCORE_CATEGORIES)), dtype=np.float64)
+        breakdown[:, 0] = self._distinct_scores(
+            features.educations, scorer._score_education_text, job)[features.education_id]
+        breakdown[:, 1] = features.trajectory
+        breakdown[:, 2] = self._distinct_scores(
+            features.companies, scorer._score_companies_text, job)[features.company_id]
+        breakdown[:, 3] = self._skills_scores(features, job)
+        breakdown[:, 4] = self._distinct_scores(
+            features.locations, scorer._score_location_text, job)[features.location_id]
+        breakdown[:, 5] = self._tenure_scores(features)
+
+        # A rule failing for a candidate scores the whole candidate as failed
+        failed = features.failed | np.isnan(breakdown).any(axis=1)
+        breakdown[failed] = FAILED_SCORE
+
+        fit_scores = self.weighted_fit_scores(breakdown, weights)
+        fit_scores[failed] = FAILED_SCORE
+        return breakdown, fit_scores
+
+    def weighted_fit_scores(self, breakdown, weights: Dict[str, float]):
+        """Rounded fit score of every breakdown row, exactly as the rule path computes it"""
+        # Column by column in weight order, like the rule path's running sum:
+        # a BLAS dot product may add in another order and round differently
+        total = np.zeros(len(breakdown), dtype=np.float64)
+        for category, weight in weights.items():
+            if category in SCORE_CATEGORIES:
+                total += breakdown[:, SCORE_CATEGORIES.index(category)] * weight
+            else:
+                total += 5.0 * weight
+
+        # np.round rounds the scaled binary value; Python's round is exact
+        # for the decimal value, so apply it once per distinct total
+        distinct, inverse = np.unique(total, return_inverse=True)
+        return np.array([round(value, 2) for value in distinct.tolist()], dtype=np.float64)[inverse]
+
+    def rank(self, fit_scores, top_k: Optional[int] = None) -> 'np.ndarray':
+        """
+        Row order by fit score, highest first, ties keeping pool order. With
+        ``top_k`` only those rows are selected (np.partition) and sorted.
+        """
+        if top_k is None or top_k >= len(fit_scores):
+            return np.argsort(-fit_scores, kind='stable')
+        if top_k <= 0:
+            return np.empty(0, dtype=np.intp)
+        # The k-th best score; everything above it is in, ties at it go by pool order
+        cutoff = -np.partition(-fit_scores, top_k - 1)[top_k - 1]
+        above = np.flatnonzero(fit_scores > cutoff)
+        tied = np.flatnonzero(fit_scores == cutoff)[:top_k - len(above)]
+        rows = np.concatenate([above, tied])
+        rows.sort()
+        return rows[np.argsort(-fit_scores[rows], kind='stable')]
+
+    def score_candidates(self, candidates, job: JobContext, weights: Optional[Dict[str, float]] = None,
+                         top_k: Optional[int] = None) -> List[Candidate]:
+        """Same result as the rule path: scored candidates sorted by fit score"""
+        features = candidates if isinstance(candidates, CandidateFeatures) \
+            else CandidateFeatures(candidates, self.scorer)
+        breakdown, fit_scores = self.score_matrix(features, job, weights)
+        return self.materialize(features, breakdown, fit_scores, self.rank(fit_scores, top_k))
+
+    def materialize(self, features: CandidateFeatures, breakdown, fit_scores, rows) -> List[Candidate]:
+        """Write the scores of ``rows`` onto their candidates, in that order"""
+        pool = features.candidates
+        breakdown_rows = breakdown[rows].tolist()
+        scored = []
+        for row, fit_score, scores in zip(rows.tolist(), fit_scores[rows].tolist(), breakdown_rows):
+            candidate = pool[row]
+            candidate.fit_score = fit_score
+            candidate.score_breakdown = dict(zip(SCORE_CATEGORIES, scores))
+            scored.append(candidate)
+        return scored
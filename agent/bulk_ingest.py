@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Stream a large dump of raw profiles through CandidateParser on a process
+pool and write the enriched records to the profile store
+
+The input is read lazily in fixed-size chunks and at most --max-in-flight
+chunks are queued at once, so memory stays flat however big the file is.
+Only this process writes to SQLite; workers just parse.
+
+Usage:
+    python agent/bulk_ingest.py profiles.jsonl [--format jsonl|csv]
+        [--chunk-size 500] [--workers N] [--max-in-flight 2*N] [--db agent/profiles.db]
+
+JSONL input has one profile object per line; CSV input needs a header row.
+Either way a profile needs at least linkedin_url (name, headline and
+location are used when present).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List
+
+# Workers only parse: they get a private registry and a memory-only cache
+_worker_parser = None
+_worker_job = None
+
+
+def _init_worker():
+    global _worker_parser, _worker_job
+    from enrichment_cache import EnrichmentCache
+    from job_context import JobContext
+    from parser import CandidateParser, extractor_version
+    from profile_registry import ProfileRegistry
+    _worker_parser = CandidateParser(
+        registry=ProfileRegistry(),
+        enrichment_cache=EnrichmentCache(extractor_version(), persist=False)
+    )
+    # No job: candidates keep only the skills found in their own headline
+    _worker_job = JobContext('')
+
+
+def _parse_chunk(profiles: List[Dict]) -> List[Dict]:
+    """Enrich one chunk; returns store-ready records (raw fields plus enrichment)"""
+    records = []
+    for profile in profiles:
+        candidate = next(_worker_parser.iter_parse_candidates([profile], _worker_job), None)
+        if candidate is not None:
+            records.append({**profile, **candidate.to_dict()})
+    return records
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                profile = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Skipping line {line_number}: {e}")
+                continue
+            if isinstance(profile, dict):
+                yield profile
+
+
+def iter_csv(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            profile = {key: value for key, value in row.items() if key and value not in (None, '')}
+            if 'confidence' in profile:
+                try:
+                    profile['confidence'] = float(profile['confidence'])
+                except ValueError:
+                    del profile['confidence']
+            yield profile
+
+
+def iter_chunks(profiles: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while True:
+        chunk = list(islice(profiles, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ingest(path: str, fmt: str = None, chunk_size: int = 500, workers: int = None,
+           max_in_flight: int = None, store=None) -> Dict:
+    """Parse every profile in ``path`` and upsert the results; returns run statistics"""
+    # Imported here so --db can set PROFILE_STORE_FILE before config loads
+    from profile_registry import registry_for_store
+    from profile_store import get_profile_store
+    store = store or get_profile_store()
+    # Profiles already in the store are only rewritten if the new record changes them
+    registry = registry_for_store(store)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    reader = iter_csv(path) if fmt == 'csv' else iter_jsonl(path)
+
+    stats = {'read': 0, 'written': 0, 'unchanged': 0, 'skipped': 0, 'chunks': 0}
+    started = time.perf_counter()
+
+    def collect(done):
+        for future in done:
+            records = future.result()
+            written = store.save_profiles(records, known=registry.seen)
+            registry.add_many(record['linkedin_url'] for record in records)
+            stats['written'] += written
+            stats['unchanged'] += len(records) - written
+            stats['chunks'] += 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        in_flight = set()
+        for chunk in iter_chunks(reader, chunk_size):
+            stats['read'] += len(chunk)
+            # Bound queued work so a huge file never sits in memory
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(_parse_chunk, chunk))
+        collect(wait(in_flight)[0])
+
+    elapsed = time.perf_counter() - started
+    stats['skipped'] = stats['read'] - stats['written'] - stats['unchanged']
+    stats['seconds'] = round(elapsed, 2)
+    stats['profiles_per_second'] = round(stats['read'] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest raw LinkedIn profiles into the profile store")
+    parser.add_argument("path", help="JSONL or CSV file of raw profiles")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Profiles per worker task")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, help="Chunks queued at once (default: 2 x workers)")
+    parser.add_argument("--db", help="Profile store file (defaults to PROFILE_STORE_FILE)")
+    args = parser.parse_args()
+
+    if args.db:
+        # Must be set before config is imported
+        os.environ["PROFILE_STORE_FILE"] = os.path.abspath(args.db)
+    if not os.path.exists(args.path):
+        print(f"No such file: {args.path}")
+        sys.exit(1)
+
+    stats = ingest(args.path, args.format, args.chunk_size, args.workers, args.max_in_flight)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
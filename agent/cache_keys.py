@@ -0,0 +1,40 @@
+"""
+Stable, content-addressed cache keys for search results
+"""
+import hashlib
+import re
+from typing import Dict, Iterator
+
+# Bump whenever the shape of cached search entries changes
+CACHE_SCHEMA_VERSION = 2
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Lowercase and collapse whitespace so trivial formatting changes share a key"""
+    return re.sub(r'\s+', ' ', (job_description or '').lower()).strip()
+
+
+def job_fingerprint(job_description: str) -> str:
+    """Stable digest of the normalized job description (identical across processes)"""
+    normalized = normalize_job_description(job_description)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def search_cache_key(job_description: str) -> str:
+    """Versioned cache key for a job description's search results"""
+    return f"v{CACHE_SCHEMA_VERSION}:{job_fingerprint(job_description)}"
+
+
+def iter_cached_profiles(cache: Dict) -> Iterator[Dict]:
+    """Yield every profile in the cache, including legacy list-shaped entries"""
+    for entry in cache.values():
+        if isinstance(entry, dict):
+            profiles = entry.get('profiles', [])
+        elif isinstance(entry, list):
+            profiles = entry
+        else:
+            continue
+
+        for profile in profiles:
+            if isinstance(profile, dict):
+                yield profile
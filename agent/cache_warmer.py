@@ -0,0 +1,179 @@
+"""
+Background refresh of stale, frequently requested cached searches
+"""
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+import config
+
+
+class CacheWarmer:
+    """
+    Periodically re-runs the searches behind the most-requested stale cache
+    entries so hot jobs keep being served from a fresh cache.
+
+    It only works while the app is idle (no worker has served a request for
+    ``idle_seconds``, going by the last-request time every worker writes to
+    the shared profile store) and only starts a refresh when the search rate
+    limiter has a full query budget plus ``reserve_tokens`` to spare, so it
+    never competes with request traffic for provider quota. With several
+    uvicorn workers every one starts a warmer, but only the holder of a lease
+    in the shared profile store refreshes anything.
+    """
+
+    LEASE_NAME = 'cache_warmer'
+    # Longest gap between this worker's last-request writes while it is busy
+    ACTIVITY_WRITE_SECONDS = 5.0
+
+    def __init__(self, searcher, interval_seconds: float = None, idle_seconds: float = None,
+                 batch_size: int = None, refresh_ahead_hours: float = None,
+                 requested_within_hours: float = None, reserve_tokens: float = None):
+        self.searcher = searcher
+        self.interval_seconds = interval_seconds or config.CACHE_WARMER_INTERVAL_SECONDS
+        self.idle_seconds = idle_seconds if idle_seconds is not None else config.CACHE_WARMER_IDLE_SECONDS
+        self.batch_size = batch_size or config.CACHE_WARMER_BATCH_SIZE
+        self.refresh_ahead_hours = (refresh_ahead_hours if refresh_ahead_hours is not None
+                                    else config.CACHE_REFRESH_AHEAD_HOURS)
+        self.requested_within_hours = requested_within_hours or config.CACHE_WARMER_ACTIVE_HOURS
+        self.reserve_tokens = reserve_tokens if reserve_tokens is not None else config.CACHE_WARMER_RESERVE_TOKENS
+
+        self._lock = threading.Lock()
+        self._activity_written = None
+        self._task: Optional[asyncio.Task] = None
+        self.owner = uuid.uuid4().hex
+        self.leader = False
+        self.runs = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.skipped_busy = 0
+        self.skipped_budget = 0
+        self.skipped_follower = 0
+        self.last_run_at = None
+
+    def request_started(self):
+        self._note_activity()
+
+    def request_finished(self):
+        self._note_activity()
+
+    def _note_activity(self):
+        """
+        Record traffic in the shared store at most every few seconds; the
+        write runs off the event loop and a failed one is only logged
+        """
+        now = time.monotonic()
+        with self._lock:
+            if (self._activity_written is not None
+                    and now - self._activity_written < min(self.ACTIVITY_WRITE_SECONDS, self.idle_seconds / 2)):
+                return
+            self._activity_written = now
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self._record_activity)
+        except RuntimeError:
+            self._record_activity()
+
+    def _record_activity(self):
+        try:
+            self.searcher.store.record_activity()
+        except Exception as e:
+            print(f"Cache warmer could not record activity: {e}")
+
+    def is_idle(self) -> bool:
+        """No worker sharing the store has served a request for idle_seconds"""
+        last_request_at = self.searcher.store.last_request_at()
+        return last_request_at is None or time.time() - last_request_at >= self.idle_seconds
+
+    def _has_budget(self) -> bool:
+        """Enough search tokens for a whole query plan with some left for requests"""
+        if not self.searcher.provider.rate_limited:
+            return True
+        available = self.searcher.rate_limiter.get_status()['tokens_available']
+        return available >= self.searcher.query_planner.budget + self.reserve_tokens
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"Cache warmer started (every {self.interval_seconds}s when idle)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader:
+            self.leader = False
+            try:
+                await asyncio.to_thread(self.searcher.store.release_lease, self.LEASE_NAME, self.owner)
+            except Exception as e:
+                print(f"Cache warmer could not release its lease: {e}")
+
+    def _elect(self) -> bool:
+        """Hold the warmer lease for a few intervals; it is renewed on every run"""
+        leader = self.searcher.store.acquire_lease(self.LEASE_NAME, self.owner, self.interval_seconds * 3)
+        if leader and not self.leader:
+            print("Cache warmer elected to refresh for all workers")
+        self.leader = leader
+        return leader
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Cache warmer error: {e}")
+
+    async def run_once(self) -> int:
+        """Refresh up to batch_size hot stale entries; returns how many were refreshed"""
+        self.runs += 1
+        self.last_run_at = datetime.now().isoformat()
+        if not await asyncio.to_thread(self._elect):
+            self.skipped_follower += 1
+            return 0
+        if not await asyncio.to_thread(self.is_idle):
+            self.skipped_busy += 1
+            return 0
+
+        candidates = await asyncio.to_thread(
+            self.searcher.store.get_refresh_candidates,
+            self.batch_size, self.refresh_ahead_hours, self.requested_within_hours
+        )
+        refreshed = 0
+        for candidate in candidates:
+            # Stop as soon as real traffic arrives or quota gets tight
+            if not await asyncio.to_thread(self.is_idle):
+                self.skipped_busy += 1
+                break
+            if not self._has_budget():
+                self.skipped_budget += 1
+                break
+            if await asyncio.to_thread(self.searcher.refresh_cached_search, candidate['job_description']):
+                refreshed += 1
+                print(f"Cache warmer refreshed a job requested {candidate['hit_count']} times")
+            else:
+                self.failed += 1
+
+        self.refreshed += refreshed
+        return refreshed
+
+    def get_status(self) -> Dict:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'leader': self.leader,
+            'interval_seconds': self.interval_seconds,
+            'idle': self.is_idle(),
+            'runs': self.runs,
+            'refreshed': self.refreshed,
+            'failed_refreshes': self.failed,
+            'skipped_busy': self.skipped_busy,
+            'skipped_no_budget': self.skipped_budget,
+            'skipped_not_leader': self.skipped_follower,
+            'last_run_at': self.last_run_at
+        }
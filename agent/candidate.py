@@ -0,0 +1,107 @@
+"""
+Compact candidate record passed between the parser, scorer and messenger
+"""
+import sys
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Rubric categories, in score_breakdown order
+SCORE_CATEGORIES = ('education', 'trajectory', 'company', 'skills', 'location', 'tenure')
+_SCORE_SLOTS = tuple(f'{category}_score' for category in SCORE_CATEGORIES)
+
+_FIELDS = (
+    'name', 'linkedin_url', 'headline', 'location', 'skills', 'experience_level',
+    'education', 'companies', 'tenure_estimate', 'career_trajectory', 'confidence', 'parsed_at'
+)
+
+
+def _intern_all(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values) if values else ()
+
+
+class Candidate:
+    """
+    One enriched candidate. Uses ``__slots__`` instead of a per-instance
+    dict, and interns the strings that repeat across a pool (skills,
+    companies, education, locations, labels) so large pools share them.
+
+    Scores live in one slot per rubric category; ``score_breakdown`` exposes
+    them as the usual dict. ``get`` keeps the dict-style read API working
+    for helpers that still take candidate dicts.
+    """
+
+    __slots__ = _FIELDS + ('skill_mask', 'fit_score', 'outreach_message') + _SCORE_SLOTS
+
+    def __init__(self, name: str = 'Unknown', linkedin_url: str = '', headline: str = '', location: str = 'Unknown',
+                 skills: Iterable[str] = (), experience_level: str = 'unknown',
+                 education: Iterable[str] = (), companies: Iterable[str] = (),
+                 tenure_estimate: str = 'unknown', career_trajectory: str = 'unknown',
+                 confidence: float = 0.7, parsed_at: str = None, skill_mask: Optional[int] = None):
+        self.name = name
+        self.linkedin_url = linkedin_url
+        self.headline = headline
+        self.location = sys.intern(location) if location else location
+        self.skills = _intern_all(skills)
+        self.experience_level = sys.intern(experience_level)
+        self.education = _intern_all(education)
+        self.companies = _intern_all(companies)
+        self.tenure_estimate = sys.intern(tenure_estimate)
+        self.career_trajectory = sys.intern(career_trajectory)
+        self.confidence = confidence
+        self.parsed_at = parsed_at
+        # Job-skill bitmask of the headline alone (see skill_bitset); None until computed
+        self.skill_mask = skill_mask
+        self.fit_score: Optional[float] = None
+        self.outreach_message: Optional[str] = None
+        for slot in _SCORE_SLOTS:
+            setattr(self, slot, None)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Candidate':
+        candidate = cls(**{field: data[field] for field in _FIELDS if data.get(field) is not None},
+                        skill_mask=data.get('skill_mask'))
+        if data.get('score_breakdown'):
+            candidate.score_breakdown = data['score_breakdown']
+        candidate.fit_score = data.get('fit_score')
+        candidate.outreach_message = data.get('outreach_message')
+        return candidate
+
+    @property
+    def score_breakdown(self) -> Optional[Dict[str, float]]:
+        if self.education_score is None:
+            return None
+        return {category: getattr(self, slot) for category, slot in zip(SCORE_CATEGORIES, _SCORE_SLOTS)}
+
+    @score_breakdown.setter
+    def score_breakdown(self, breakdown: Dict[str, float]):
+        for category, slot in zip(SCORE_CATEGORIES, _SCORE_SLOTS):
+            setattr(self, slot, breakdown.get(category, 5.0))
+
+    def get(self, key: str, default=None):
+        """Dict-style read; unknown keys and unset scores return ``default``"""
+        if key == 'score_breakdown':
+            value = self.score_breakdown
+        elif key in _FIELDS or key in ('fit_score', 'outreach_message'):
+            value = getattr(self, key)
+        else:
+            return default
+        if value is None:
+            return default
+        return list(value) if isinstance(value, tuple) else value
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the original candidate shape; score fields only once set"""
+        data = {field: self.get(field) for field in _FIELDS}
+        if self.fit_score is not None:
+            data['fit_score'] = self.fit_score
+            data['score_breakdown'] = self.score_breakdown
+        if self.outreach_message is not None:
+            data['outreach_message'] = self.outreach_message
+        return data
+
+    def __repr__(self) -> str:
+        return f'Candidate({self.name!r}, {self.linkedin_url!r}, fit_score={self.fit_score!r})'
+
+
+def as_candidate(candidate: Union[Candidate, Dict]) -> Candidate:
+    """Accept either a Candidate or a candidate dict in the original shape"""
+    return candidate if isinstance(candidate, Candidate) else Candidate.from_dict(candidate)
@@ -0,0 +1,154 @@
+"""
+Circuit breakers for search providers and a short-lived negative cache
+for queries that just failed
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+import config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Closed: requests flow and consecutive failures are counted.
+    Open: requests are refused until ``reset_timeout`` has passed.
+    Half-open: up to ``half_open_probes`` probe requests are let through;
+    a successful probe closes the circuit, a failed one reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None,
+                 half_open_probes: int = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or config.CIRCUIT_RESET_SECONDS
+        self.half_open_probes = half_open_probes or config.CIRCUIT_HALF_OPEN_PROBES
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _maybe_half_open(self):
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+            print(f"Circuit '{self.name}' half-open, probing")
+
+    def is_open(self) -> bool:
+        """True while requests would be refused (does not use up a probe)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self.state == OPEN or (
+                self.state == HALF_OPEN and self._probes_in_flight >= self.half_open_probes
+            )
+
+    def allow_request(self) -> bool:
+        """Check whether a request may go out; in half-open state this claims a probe slot"""
+        with self._lock:
+            self._maybe_half_open()
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                print(f"Circuit '{self.name}' closed after a successful probe")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probes_in_flight = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                self._probes_in_flight = 0
+                print(f"Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures")
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            self._maybe_half_open()
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'times_opened': self.times_opened,
+                'rejected_requests': self.rejected,
+                'half_open_in_seconds': retry_in
+            }
+
+
+class NegativeCache:
+    """Remembers recently failed keys for ``ttl`` seconds (bounded, oldest evicted first)"""
+
+    def __init__(self, ttl: float = None, max_entries: int = 1024):
+        self.ttl = ttl if ttl is not None else config.SEARCH_NEGATIVE_CACHE_SECONDS
+        self.max_entries = max_entries
+        self._expires: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def add(self, key: Hashable):
+        with self._lock:
+            self._expires.pop(key, None)
+            self._expires[key] = time.monotonic() + self.ttl
+            while len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._expires[key]
+                return False
+            self.hits += 1
+            return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'ttl_seconds': self.ttl,
+                'failed_queries': sum(1 for expires in self._expires.values() if expires > now),
+                'skipped_requests': self.hits
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Process-wide breaker for a provider, shared by every searcher"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def get_circuit_status() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.get_status() for breaker in breakers}
@@ -27,6 +27,33 @@ MAX_CANDIDATES_PER_SEARCH = int(os.getenv("MAX_CANDIDATES_PER_SEARCH", "25"))
 SEARCH_DELAY_SECONDS = int(os.getenv("SEARCH_DELAY_SECONDS", "2"))
 CACHE_DURATION_HOURS = int(os.getenv("CACHE_DURATION_HOURS", "24"))
 
+# Background cache warmer (refreshes hot stale searches while the app is idle)
+CACHE_WARMER_ENABLED = os.getenv("CACHE_WARMER_ENABLED", "true").lower() == "true"
+CACHE_WARMER_INTERVAL_SECONDS = float(os.getenv("CACHE_WARMER_INTERVAL_SECONDS", "60"))
+CACHE_WARMER_IDLE_SECONDS = float(os.getenv("CACHE_WARMER_IDLE_SECONDS", "30"))  # quiet time before refreshing
+CACHE_WARMER_BATCH_SIZE = int(os.getenv("CACHE_WARMER_BATCH_SIZE", "5"))
+CACHE_REFRESH_AHEAD_HOURS = float(os.getenv("CACHE_REFRESH_AHEAD_HOURS", "1"))  # also refresh entries about to expire
+CACHE_WARMER_ACTIVE_HOURS = float(os.getenv("CACHE_WARMER_ACTIVE_HOURS", "72"))  # only jobs requested this recently
+CACHE_WARMER_RESERVE_TOKENS = float(os.getenv("CACHE_WARMER_RESERVE_TOKENS", "2"))  # search tokens left for requests
+
+# Headline enrichment cache (parsed fields reused for unchanged profiles)
+ENRICHMENT_CACHE_SIZE = int(os.getenv("ENRICHMENT_CACHE_SIZE", "10000"))
+ENRICHMENT_CACHE_PERSIST = os.getenv("ENRICHMENT_CACHE_PERSIST", "false").lower() == "true"  # keep in the profile store
+
+# Vectorized scoring (numpy) for pools at least this large; smaller pools use the per-candidate rules
+BATCH_SCORING_MIN_CANDIDATES = int(os.getenv("BATCH_SCORING_MIN_CANDIDATES", "100"))
+
+# Score cache (per candidate, job and rubric version); 0 disables it
+SCORE_CACHE_MAX_MB = int(os.getenv("SCORE_CACHE_MAX_MB", "64"))
+
+# Scored candidate pools kept for /results/{job_id}/rerank (most recent jobs)
+RERANK_MAX_POOLS = int(os.getenv("RERANK_MAX_POOLS", "100"))
+
+# Near-duplicate job description reuse (MinHash/LSH)
+JD_SIMILARITY_THRESHOLD = float(os.getenv("JD_SIMILARITY_THRESHOLD", "0.8"))
+JD_MINHASH_PERMUTATIONS = int(os.getenv("JD_MINHASH_PERMUTATIONS", "64"))
+JD_LSH_BANDS = int(os.getenv("JD_LSH_BANDS", "16"))
+
 # API Configuration
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
@@ -40,10 +67,54 @@ USE_LINKEDIN_API = os.getenv("USE_LINKEDIN_API", "false").lower() == "true"
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 LINKEDIN_API_KEY = os.getenv("LINKEDIN_API_KEY")
 
-# Rate Limiting
+# Rate Limiting (requests per minute, enforced by a shared token bucket)
 SEARCH_RATE_LIMIT = int(os.getenv("SEARCH_RATE_LIMIT", "10"))
 AI_RATE_LIMIT = int(os.getenv("AI_RATE_LIMIT", "50"))
 
+# Batched LLM scoring (candidates per request, batches in flight at once)
+AI_SCORING_ENABLED = os.getenv("AI_SCORING_ENABLED", "false").lower() == "true"  # rescore each shortlist with the LLM
+AI_SCORING_BATCH_SIZE = int(os.getenv("AI_SCORING_BATCH_SIZE", "10"))
+AI_SCORING_CONCURRENCY = int(os.getenv("AI_SCORING_CONCURRENCY", "4"))
+
+# Outbound HTTP transport (shared by search, SerpAPI and LLM clients)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # hosts kept in the pool cache
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))  # keep-alive connections per host
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+
+# Concurrent search fan-out
+SEARCH_FAN_OUT = os.getenv("SEARCH_FAN_OUT", "true").lower() == "true"
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+SEARCH_THROTTLE_RETRIES = int(os.getenv("SEARCH_THROTTLE_RETRIES", "2"))
+
+# Search provider circuit breaker and negative cache for failed queries
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))  # consecutive failed queries
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))  # open time before probing
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+SEARCH_NEGATIVE_CACHE_SECONDS = float(os.getenv("SEARCH_NEGATIVE_CACHE_SECONDS", "120"))
+
+# Query planning (per-job request budget, results requested per query)
+SEARCH_QUERY_BUDGET = int(os.getenv("SEARCH_QUERY_BUDGET", "3"))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "50"))
+SEARCH_OVERFETCH = float(os.getenv("SEARCH_OVERFETCH", "1.5"))  # non-profile hits and duplicates
+SEARCH_STREAMING = os.getenv("SEARCH_STREAMING", "false").lower() == "true"  # parse result pages as they arrive
+SEARCH_STREAM_PAGE_SIZE = int(os.getenv("SEARCH_STREAM_PAGE_SIZE", "10"))  # results per page when streaming
+SEARCH_STREAM_PAGE_BUDGET = int(os.getenv("SEARCH_STREAM_PAGE_BUDGET", "10"))  # pages per streamed job
+
+# Search provider mode: live, record (save provider responses) or replay (serve saved responses offline)
+SEARCH_MODE = os.getenv("SEARCH_MODE", "live").lower()
+SEARCH_RECORDINGS_DIR = os.getenv(
+    "SEARCH_RECORDINGS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+)
+SEARCH_REPLAY_PROVIDER = os.getenv("SEARCH_REPLAY_PROVIDER")  # defaults to get_search_client()
+SEARCH_REPLAY_LATENCY = os.getenv("SEARCH_REPLAY_LATENCY", "recorded")  # recorded, empirical, none, fixed:S, uniform:LO,HI, lognormal:MU,SIGMA
+SEARCH_REPLAY_STRICT = os.getenv("SEARCH_REPLAY_STRICT", "false").lower() == "true"
+
 # Search Configuration
 GOOGLE_SEARCH_URL = "https://www.google.com/search"
 SERPAPI_URL = "https://serpapi.com/search"
@@ -65,7 +136,11 @@ FIT_SCORE_WEIGHTS = {
 
 # File Paths - Fixed to use correct relative paths
 DATA_FILE = "data.json"
-CACHE_FILE = "cache.json"
+CACHE_FILE = "cache.json"  # legacy JSON cache, merged into the profile store whenever it changes
+PROFILE_STORE_FILE = os.getenv(
+    "PROFILE_STORE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.db")
+)
 
 # Message Generation Templates
 OUTREACH_MESSAGE_TEMPLATE = """
@@ -104,6 +179,26 @@ Job Description:
 Provide scores for each category and a brief explanation for each score.
 """
 
+BATCH_SCORING_PROMPT_TEMPLATE = """
+Score each candidate below (1-10) for the job description, based on these criteria:
+
+education (20%): Relevance of their educational background
+trajectory (20%): Progression and growth in their career
+company (15%): Quality and relevance of companies they've worked at
+skills (25%): Experience match, direct alignment with job requirements
+location (10%): Geographic fit for the role
+tenure (10%): Stability and commitment shown in roles
+
+Candidates (JSON):
+{candidates}
+
+Job Description:
+{job_description}
+
+Respond with JSON only, no explanation, with exactly one entry per candidate id:
+{{"scores": [{{"id": 0, "education": 7.0, "trajectory": 6.5, "company": 8.0, "skills": 9.0, "location": 10.0, "tenure": 7.0}}]}}
+"""
+
 # AI Provider Functions
 def get_ai_client():
     """Get the appropriate AI client based on configuration"""
@@ -119,6 +214,9 @@ def get_ai_client():
         try:
             import openai
             openai.api_key = OPENAI_API_KEY
+            # Timeouts and retries are handled by the shared transport
+            openai.timeout = LLM_TIMEOUT_SECONDS
+            openai.max_retries = 0
             return openai
         except ImportError:
             print("Warning: openai not installed. Install with: pip install openai")
@@ -126,7 +224,7 @@ def get_ai_client():
     elif AI_PROVIDER == "anthropic" and ANTHROPIC_API_KEY:
         try:
             import anthropic
-            return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+            return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, timeout=LLM_TIMEOUT_SECONDS, max_retries=0)
         except ImportError:
             print("Warning: anthropic not installed. Install with: pip install anthropic")
             return None
@@ -171,6 +269,8 @@ def validate_config():
         issues.append("SerpAPI enabled but no API key provided")
     elif search_client == "linkedin" and not LINKEDIN_API_KEY:
         issues.append("LinkedIn API enabled but no API key provided")
+    if SEARCH_MODE not in ("live", "record", "replay"):
+        issues.append(f"Unknown SEARCH_MODE '{SEARCH_MODE}', expected live, record or replay")
     
     return issues
 
@@ -179,7 +279,7 @@ if DEBUG:
     print("=== Configuration Status ===")
     print(f"AI Provider: {AI_PROVIDER}")
     print(f"Available AI Providers: {get_available_ai_providers()}")
-    print(f"Search Client: {get_search_client()}")
+    print(f"Search Client: {get_search_client()} ({SEARCH_MODE})")
     print(f"Max Candidates: {MAX_CANDIDATES_PER_SEARCH}")
     print(f"Search Delay: {SEARCH_DELAY_SECONDS}s")
     print(f"Debug Mode: {DEBUG}")
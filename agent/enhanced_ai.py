@@ -1,85 +1,125 @@
 """
 Enhanced AI client supporting multiple providers
 """
+import hashlib
 import json
+import math
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import config
+from rate_limiter import TokenBucket
+from singleflight import SingleFlight
+from transport import get_transport
+
+# Keys of a score dict, in rubric order
+SCORE_CATEGORIES = ("education", "trajectory", "company", "skills", "location", "tenure")
 
 class EnhancedAIClient:
     def __init__(self):
         self.ai_client = config.get_ai_client()
         self.provider = config.AI_PROVIDER
+        self.transport = get_transport()
+        # Identical prompts generated concurrently share one provider call
+        self.inflight = SingleFlight('llm')
+        # Every provider call, from any thread, is paced by AI_RATE_LIMIT
+        self.rate_limiter = TokenBucket(config.AI_RATE_LIMIT)
         
         if config.DEBUG:
             print(f"Initialized EnhancedAIClient with {self.provider} provider")
     
-    def generate_text(self, prompt: str, max_tokens: int = 1000) -> Optional[str]:
-        """Generate text using the configured AI provider"""
+    def generate_text(self, prompt: str, max_tokens: int = 1000, json_mode: bool = False) -> Optional[str]:
+        """
+        Generate text using the configured AI provider; ``json_mode`` asks
+        the provider for a JSON reply where it supports one
+        """
         if not self.ai_client:
             print("No AI client available")
             return None
         
         try:
-            if self.provider == "gemini":
-                return self._generate_with_gemini(prompt, max_tokens)
-            elif self.provider == "openai":
-                return self._generate_with_openai(prompt, max_tokens)
-            elif self.provider == "anthropic":
-                return self._generate_with_anthropic(prompt, max_tokens)
-            else:
-                print(f"Unknown AI provider: {self.provider}")
-                return None
+            key = (self.provider, max_tokens, json_mode, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+            text, _ = self.inflight.do(key, self._generate_rate_limited, prompt, max_tokens, json_mode)
+            return text
                 
         except Exception as e:
             print(f"AI generation error: {e}")
             return None
     
-    def _generate_with_gemini(self, prompt: str, max_tokens: int) -> Optional[str]:
+    def _generate_rate_limited(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
+        self.rate_limiter.acquire()
+        return self._generate(prompt, max_tokens, json_mode)
+    
+    def _generate(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
+        if self.provider == "gemini":
+            return self._generate_with_gemini(prompt, max_tokens, json_mode)
+        elif self.provider == "openai":
+            return self._generate_with_openai(prompt, max_tokens, json_mode)
+        elif self.provider == "anthropic":
+            return self._generate_with_anthropic(prompt, max_tokens, json_mode)
+        else:
+            print(f"Unknown AI provider: {self.provider}")
+            return None
+    
+    def _generate_with_gemini(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Generate text using Google Gemini"""
         try:
-            response = self.ai_client.generate_content(prompt)
+            generation_config = {"response_mime_type": "application/json"} if json_mode else None
+            response = self.transport.call(
+                "gemini", lambda: self.ai_client.generate_content(prompt, generation_config=generation_config),
+                timeout=config.LLM_TIMEOUT_SECONDS
+            )
             return response.text
         except Exception as e:
             print(f"Gemini generation error: {e}")
             return None
     
-    def _generate_with_openai(self, prompt: str, max_tokens: int) -> Optional[str]:
+    def _generate_with_openai(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Generate text using OpenAI"""
         try:
-            response = self.ai_client.ChatCompletion.create(
+            options = {"response_format": {"type": "json_object"}} if json_mode else {}
+            response = self.transport.call("openai", lambda: self.ai_client.ChatCompletion.create(
                 model=config.OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a helpful AI assistant for LinkedIn candidate analysis."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=max_tokens,
-                temperature=0.7
-            )
+                temperature=0.7,
+                **options
+            ))
             return response.choices[0].message.content
         except Exception as e:
             print(f"OpenAI generation error: {e}")
             return None
     
-    def _generate_with_anthropic(self, prompt: str, max_tokens: int) -> Optional[str]:
+    def _generate_with_anthropic(self, prompt: str, max_tokens: int, json_mode: bool = False) -> Optional[str]:
         """Generate text using Anthropic Claude"""
         try:
-            response = self.ai_client.messages.create(
+            messages = [{"role": "user", "content": prompt}]
+            # No JSON mode: prefilling the reply with "{" keeps it to a bare object
+            if json_mode:
+                messages.append({"role": "assistant", "content": "{"})
+            response = self.transport.call("anthropic", lambda: self.ai_client.messages.create(
                 model=config.ANTHROPIC_MODEL,
                 max_tokens=max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.content[0].text
+                messages=messages
+            ))
+            text = response.content[0].text
+            return "{" + text if json_mode else text
         except Exception as e:
             print(f"Anthropic generation error: {e}")
             return None
     
     def score_candidate(self, candidate: Dict, job_description: str) -> Dict:
         """Score a candidate using AI"""
+        return self._request_score(candidate, job_description) or self._get_default_score()
+    
+    def _request_score(self, candidate: Dict, job_description: str) -> Optional[Dict]:
+        """One scoring request for a candidate; None when the AI gives no usable reply"""
         if not self.ai_client:
-            return self._get_default_score()
+            return None
         
         try:
             prompt = config.SCORING_PROMPT_TEMPLATE.format(
@@ -95,11 +135,66 @@ class EnhancedAIClient:
             if response:
                 return self._parse_scoring_response(response)
             else:
-                return self._get_default_score()
+                return None
                 
         except Exception as e:
             print(f"Scoring error: {e}")
-            return self._get_default_score()
+            return None
+    
+    def score_candidates_batch(self, candidates: List[Dict], job_description: str,
+                               batch_size: int = None) -> List[Optional[Dict]]:
+        """
+        Score many candidates with one LLM request per batch instead of one
+        per candidate. Batches run concurrently (the rate limiter still paces
+        them); candidates a batch reply doesn't validly score fall back to a
+        request of their own. Returns score dicts in input order, None for a
+        candidate the AI could not score at all.
+        """
+        if not self.ai_client:
+            return [None] * len(candidates)
+        
+        batch_size = max(1, batch_size or config.AI_SCORING_BATCH_SIZE)
+        batches = [candidates[start:start + batch_size] for start in range(0, len(candidates), batch_size)]
+        if not batches:
+            return []
+        
+        workers = max(1, min(config.AI_SCORING_CONCURRENCY, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda batch: self._score_batch(batch, job_description), batches))
+        
+        return [scores for batch_scores in results for scores in batch_scores]
+    
+    def _score_batch(self, batch: List[Dict], job_description: str) -> List[Optional[Dict]]:
+        """Score one batch in a single request, falling back per candidate"""
+        scores: List[Optional[Dict]] = [None] * len(batch)
+        try:
+            profiles = [
+                {
+                    "id": index,
+                    "name": candidate.get('name', 'Unknown'),
+                    "headline": candidate.get('headline', 'Unknown'),
+                    "location": candidate.get('location', 'Unknown'),
+                    "experience": candidate.get('experience', 'Unknown')
+                }
+                for index, candidate in enumerate(batch)
+            ]
+            prompt = config.BATCH_SCORING_PROMPT_TEMPLATE.format(
+                candidates=json.dumps(profiles, indent=2),
+                job_description=job_description
+            )
+            response = self.generate_text(prompt, max_tokens=200 + 100 * len(batch), json_mode=True)
+            if response:
+                scores = self._parse_batch_scoring_response(response, len(batch))
+        except Exception as e:
+            print(f"Batch scoring error: {e}")
+        
+        missing = [index for index, entry in enumerate(scores) if entry is None]
+        if missing:
+            print(f"Batch scoring: {len(missing)} of {len(batch)} candidates scored individually")
+            for index in missing:
+                scores[index] = self._request_score(batch[index], job_description)
+        
+        return scores
     
     def generate_outreach_message(self, candidate: Dict, job_description: str) -> str:
         """Generate personalized outreach message"""
@@ -156,6 +251,45 @@ class EnhancedAIClient:
             print(f"Score parsing error: {e}")
             return self._get_default_score()
     
+    def _parse_batch_scoring_response(self, response: str, count: int) -> List[Optional[Dict]]:
+        """
+        Validate a JSON batch reply: one entry per candidate id with a number
+        for every category. Entries that don't validate come back as None.
+        """
+        results: List[Optional[Dict]] = [None] * count
+        
+        # Models often wrap the JSON in a markdown fence or add a preamble
+        match = re.search(r'[\[{].*[\]}]', response, re.DOTALL)
+        try:
+            data = json.loads(match.group() if match else response)
+        except ValueError:
+            print("Batch scoring reply is not valid JSON")
+            return results
+        
+        entries = data.get('scores') if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return results
+        
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get('id')
+            if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < count:
+                continue
+            if results[index] is not None:
+                continue  # Keep the first entry for a duplicated id
+            
+            scores = {}
+            for category in SCORE_CATEGORIES:
+                value = entry.get(category)
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                    break
+                scores[category] = min(10.0, max(1.0, float(value)))
+            else:
+                results[index] = scores
+        
+        return results
+    
     def _get_default_score(self) -> Dict:
         """Get default scoring when AI is not available"""
         return {
@@ -190,7 +324,8 @@ Best regards,
         return {
             "provider": self.provider,
             "available": self.is_available(),
-            "model": self._get_model_name()
+            "model": self._get_model_name(),
+            "rate_limiter": self.rate_limiter.get_status()
         }
     
     def _get_model_name(self) -> str:
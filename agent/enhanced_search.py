@@ -1,67 +1,140 @@
 """
 Enhanced LinkedIn profile discovery with multiple search providers
 """
-import requests
-import time
-import json
+import math
 import re
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from urllib.parse import quote_plus, urlparse
-from bs4 import BeautifulSoup
 import config
-import os
+from circuit_breaker import NegativeCache, get_circuit_breaker
+from cache_keys import job_fingerprint, search_cache_key
+from keyword_matcher import get_keyword_matcher
+from minhash import JobSimilarityIndex
+from profile_index import ProfileIndex
+from profile_registry import canonical_profile_url, get_profile_registry, profile_key
+from profile_store import get_profile_store
+from query_planner import PlannedQuery, QueryPlan, QueryPlanner
+from rate_limiter import RateLimitExceeded, TokenBucket
+from search_providers import create_search_provider
+from serp import is_linkedin_profile_url
+from singleflight import SingleFlight
+from transport import get_transport
+from vocabularies import SEARCH_KEYWORDS
 
 class EnhancedLinkedInSearcher:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config.USER_AGENT
-        })
-        self.cache = self._load_cache()
-        self.search_client = config.get_search_client()
+        self.transport = get_transport()
+        self.store = get_profile_store()
+        # Every profile seen by this process, keyed by canonical slug
+        self.registry = get_profile_registry()
+        # Built once at startup and kept current as new results are saved
+        self.profile_index = ProfileIndex()
+        self.profile_index.add_profiles(
+            profile for profile in self.store.iter_profiles() if self._is_real_profile(profile)
+        )
+        self.similar_jobs = JobSimilarityIndex(
+            threshold=config.JD_SIMILARITY_THRESHOLD,
+            num_perm=config.JD_MINHASH_PERMUTATIONS,
+            bands=config.JD_LSH_BANDS
+        )
+        for cache_key, signature in self.store.iter_job_signatures():
+            if len(signature) == config.JD_MINHASH_PERMUTATIONS:
+                self.similar_jobs.add(cache_key, signature)
+        # Live, recording or replaying provider depending on SEARCH_MODE
+        self.provider = create_search_provider()
+        self.search_client = self.provider.name
+        # Coalesces concurrent searches for the same job description
+        self.inflight = SingleFlight('search')
+        # Stops sending queries to a provider that keeps failing
+        self.circuit_breaker = get_circuit_breaker(self.provider.name)
+        self.failed_queries = NegativeCache()
+        # Ranks queries per job and learns which kinds of query yield new profiles
+        self.query_planner = QueryPlanner()
+        self.matcher = get_keyword_matcher()
+        # Shared by every query worker so concurrent fan-out still respects SEARCH_RATE_LIMIT
+        self.rate_limiter = TokenBucket(config.SEARCH_RATE_LIMIT)
         
         if config.DEBUG:
-            print(f"Initialized EnhancedLinkedInSearcher with {self.search_client} client")
+            print(f"Initialized EnhancedLinkedInSearcher with {self.search_client} client ({config.SEARCH_MODE})")
     
-    def _load_cache(self) -> Dict:
-        """Load cached search results"""
-        try:
-            with open(config.CACHE_FILE, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+    def search_linkedin_profiles(self, job_description: str, max_results: int = None,
+                                 search_metadata: Dict = None) -> List[Dict]:
+        """
+        Search for LinkedIn profiles using the configured search provider.
+        If ``search_metadata`` is given it is filled in with where the results
+        came from and, for live searches, the executed query plan.
+        
+        Concurrent calls for the same normalized job description share one
+        in-flight search; the callers that waited get copies of its results.
+        """
+        if max_results is None:
+            max_results = config.MAX_CANDIDATES_PER_SEARCH
+        
+        cache_key = search_cache_key(job_description)
+        (profiles, metadata), shared = self.inflight.do(
+            (cache_key, max_results), self._search_once, job_description, cache_key, max_results
+        )
+        if search_metadata is not None:
+            search_metadata.update(metadata)
+            if shared:
+                search_metadata['coalesced'] = True
+        self._record_request(cache_key)
+        
+        return [dict(profile) for profile in profiles] if shared else profiles
     
-    def _save_cache(self):
-        """Save search results to cache"""
+    def _record_request(self, cache_key: str):
+        """Count the request for the cache warmer's hot-entry ranking"""
         try:
-            with open(config.CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            self.store.record_request(cache_key)
         except Exception as e:
-            print(f"Warning: Could not save cache: {e}")
+            print(f"Warning: Could not record cache request: {e}")
     
-    def search_linkedin_profiles(self, job_description: str, max_results: int = None) -> List[Dict]:
-        """Search for LinkedIn profiles using the configured search provider"""
+    def refresh_cached_search(self, job_description: str, max_results: int = None) -> bool:
+        """
+        Re-run the live search for a cached job description and overwrite its
+        entry; used by the background cache warmer. The entry is left as is
+        when the search finds nothing, so a provider outage never replaces
+        real results with fallbacks.
+        """
+        if self.circuit_breaker.is_open():
+            return False
         if max_results is None:
             max_results = config.MAX_CANDIDATES_PER_SEARCH
         
-        # Check cache first for exact match
-        cache_key = f"{hash(job_description)}"
-        if cache_key in self.cache:
-            print(f"Using cached results for job description")
-            cached_profiles = self.cache[cache_key][:max_results]
-            # Check if cached profiles are real or demo
-            if any(not any(demo_suffix in p.get('linkedin_url', '') for demo_suffix in ['-ai', '-dev', '-eng', '-aws', '-ml']) for p in cached_profiles):
-                print("Found real profiles in cache")
-                return cached_profiles
-            else:
-                print("Found demo profiles in cache, will try to get real profiles")
+        if self.search_client == "serpapi":
+            profiles = self._search_with_serpapi(job_description, max_results)
+        else:
+            profiles = self._search_with_google(job_description, max_results)
+        if not profiles:
+            return False
         
-        # Try configured search provider
+        self._save_search_results(search_cache_key(job_description), job_description, profiles)
+        return True
+    
+    def _search_once(self, job_description: str, cache_key: str, max_results: int) -> Tuple[List[Dict], Dict]:
+        search_metadata = {}
+        profiles = self._search_profiles(job_description, cache_key, max_results, search_metadata)
+        return profiles, search_metadata
+    
+    def _search_profiles(self, job_description: str, cache_key: str, max_results: int,
+                         search_metadata: Dict) -> List[Dict]:
+        profiles, signature = self._reuse_cached_results(job_description, cache_key, max_results, search_metadata)
+        if profiles is not None:
+            return profiles
+        
+        # Try configured search provider, unless it is failing and its circuit is open
         try:
-            if self.search_client == "serpapi":
-                profiles = self._search_with_serpapi(job_description, max_results)
+            if self.circuit_breaker.is_open():
+                print(f"{self.search_client} circuit open, going straight to fallback")
+                search_metadata['circuit_open'] = True
+                profiles = []
+            elif self.search_client == "serpapi":
+                profiles = self._search_with_serpapi(job_description, max_results, search_metadata)
             else:
-                profiles = self._search_with_google(job_description, max_results)
+                profiles = self._search_with_google(job_description, max_results, search_metadata)
+            search_metadata['results_source'] = 'search'
             
             # If no results, use real profiles from cache (unconditional fallback)
             if not profiles:
@@ -69,17 +142,18 @@ class EnhancedLinkedInSearcher:
                 real_profiles = self._get_real_profiles_from_cache(job_description)
                 if real_profiles:
                     print(f"Using {len(real_profiles)} real profiles from cache as fallback")
-                    # Cache these results for future use
-                    self.cache[cache_key] = real_profiles
-                    self._save_cache()
+                    # Cache these results for future use, unless the provider is just unavailable
+                    if not self.circuit_breaker.is_open():
+                        self._save_search_results(cache_key, job_description, real_profiles, signature)
+                    search_metadata['results_source'] = 'cache_fallback'
                     return real_profiles[:max_results]
                 else:
                     print("No real profiles in cache, using demo profiles")
+                    search_metadata['results_source'] = 'demo'
                     profiles = self._get_mock_profiles(job_description)
             
             # Cache results
-            self.cache[cache_key] = profiles
-            self._save_cache()
+            self._save_search_results(cache_key, job_description, profiles, signature)
             
             return profiles[:max_results]
             
@@ -89,97 +163,387 @@ class EnhancedLinkedInSearcher:
             real_profiles = self._get_real_profiles_from_cache(job_description)
             if real_profiles:
                 print(f"Using {len(real_profiles)} real profiles from cache after search failure")
+                search_metadata['results_source'] = 'cache_fallback'
                 return real_profiles[:max_results]
             else:
                 print("No real profiles available, using demo profiles")
+                search_metadata['results_source'] = 'demo'
                 return self._get_mock_profiles(job_description)
     
-    def _search_with_serpapi(self, job_description: str, max_results: int) -> List[Dict]:
-        """Search using SerpAPI (most reliable)"""
-        if not config.SERPAPI_KEY:
-            print("SerpAPI key not configured")
-            return []
+    def _reuse_cached_results(self, job_description: str, cache_key: str, max_results: int,
+                              search_metadata: Dict) -> Tuple[Optional[List[Dict]], Optional[List[int]]]:
+        """
+        Results for the job from the cache or a near-duplicate job, or None on
+        a real miss; also returns the job's MinHash signature once computed
+        """
+        # Check cache first for exact match (normalized fingerprint, fresh entries only)
+        cached = self.store.get_search_results(cache_key)
+        if cached is not None:
+            print(f"Using cached results for job description")
+            cached_profiles = cached[:max_results]
+            # Check if cached profiles are real or demo
+            if any(self._is_real_profile(p) for p in cached_profiles):
+                print("Found real profiles in cache")
+                search_metadata['results_source'] = 'cache'
+                return cached_profiles, None
+            else:
+                print("Found demo profiles in cache, will try to get real profiles")
         
-        keywords = self._extract_keywords(job_description)
-        profiles = []
+        # Then reuse results from a near-duplicate job description, if one is cached
+        signature = self.similar_jobs.hasher.signature(job_description)
+        similar_profiles = self._get_similar_job_results(cache_key, signature)
+        if similar_profiles:
+            self._save_search_results(cache_key, job_description, similar_profiles, signature)
+            search_metadata['results_source'] = 'similar_job_cache'
+            return similar_profiles[:max_results], signature
         
-        for keyword in keywords[:3]:
-            try:
-                query = f'site:linkedin.com/in {keyword}'
-                params = {
-                    'q': query,
-                    'api_key': config.SERPAPI_KEY,
-                    'engine': 'google',
-                    'num': min(max_results, 10)
-                }
-                
-                response = self.session.get(config.SERPAPI_URL, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                organic_results = data.get('organic_results', [])
-                
-                for result in organic_results:
-                    profile = self._parse_serpapi_result(result)
-                    if profile:
-                        profiles.append(profile)
-                
-                time.sleep(config.SEARCH_DELAY_SECONDS)
-                
-            except Exception as e:
-                print(f"SerpAPI search error for '{keyword}': {e}")
-                continue
+        return None, signature
+    
+    def iter_linkedin_profiles(self, job_description: str, max_results: int = None,
+                               search_metadata: Dict = None) -> Iterator[Dict]:
+        """
+        Yield deduplicated profiles as each result page arrives.
+        
+        Cached and near-duplicate results are served as by
+        search_linkedin_profiles, and concurrent searches for the same job,
+        streamed or not, share one in-flight search. Only on a real miss are
+        live result pages requested lazily (``start=`` pagination), one page
+        ahead of the consumer, until ``max_results`` profiles have been
+        yielded, SEARCH_STREAM_PAGE_BUDGET pages were requested or the caller
+        stops iterating. Newly found profiles are cached when the generator
+        finishes or is closed.
+        """
+        if max_results is None:
+            max_results = config.MAX_CANDIDATES_PER_SEARCH
+        if search_metadata is None:
+            search_metadata = {}
+        cache_key = search_cache_key(job_description)
+        flight_key = (cache_key, max_results)
+        call, leader = self.inflight.join(flight_key)
+        if not leader:
+            profiles, metadata = self.inflight.wait(call)
+            search_metadata.update(metadata)
+            search_metadata['coalesced'] = True
+            self._record_request(cache_key)
+            for profile in profiles:
+                yield dict(profile)
+            return
         
-        return self._deduplicate_profiles(profiles)
+        # Callers waiting on this stream get whatever it yielded, even if the
+        # consumer stopped early
+        metadata = {}
+        yielded = []
+        error = None
+        stream = self._stream_profiles(job_description, cache_key, max_results, metadata)
+        try:
+            for profile in stream:
+                yielded.append(profile)
+                yield profile
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                error = e
+            raise
+        finally:
+            stream.close()
+            search_metadata.update(metadata)
+            self.inflight.finish(flight_key, call, None if error else (yielded, metadata), error)
+            # After the stream has cached its results, so a new entry counts this request too
+            self._record_request(cache_key)
     
-    def _search_with_google(self, job_description: str, max_results: int) -> List[Dict]:
-        """Search using Google (free but may be rate limited)"""
-        keywords = self._extract_keywords(job_description)
-        search_queries = self._build_search_queries(keywords)
+    def _stream_profiles(self, job_description: str, cache_key: str, max_results: int,
+                         search_metadata: Dict) -> Iterator[Dict]:
+        profiles, signature = self._reuse_cached_results(job_description, cache_key, max_results, search_metadata)
+        if profiles is not None:
+            yield from profiles
+            return
         
-        all_profiles = []
+        seen_urls = set()
+        live_profiles = []
         
-        for query in search_queries:
-            try:
-                profiles = self._execute_google_search(query, max_results // len(search_queries))
-                all_profiles.extend(profiles)
+        def is_new(profile: Dict) -> bool:
+            key = profile_key(profile)
+            if not key or key in seen_urls:
+                return False
+            seen_urls.add(key)
+            return True
+        
+        try:
+            if self.circuit_breaker.is_open():
+                print(f"{self.search_client} circuit open, going straight to fallback")
+                search_metadata['circuit_open'] = True
+            else:
+                pages = self._iter_result_pages(job_description, max_results, seen_urls, search_metadata)
+                try:
+                    for page in pages:
+                        for profile in page:
+                            if is_new(profile):
+                                live_profiles.append(profile)
+                                search_metadata['results_source'] = 'search'
+                                yield profile
+                                if len(seen_urls) >= max_results:
+                                    return
+                finally:
+                    pages.close()
+            
+            if not seen_urls:
+                print("Streaming search found nothing, using real profiles from cache if available")
+                fallback = self._get_real_profiles_from_cache(job_description)
+                search_metadata['results_source'] = 'cache_fallback' if fallback else 'demo'
+                for profile in fallback or self._get_mock_profiles(job_description):
+                    if is_new(profile):
+                        yield profile
+                        if len(seen_urls) >= max_results:
+                            return
+        finally:
+            if live_profiles:
+                self._save_search_results(cache_key, job_description, live_profiles, signature)
+    
+    def _iter_result_pages(self, job_description: str, max_results: Optional[int], seen_urls: set,
+                           search_metadata: Dict) -> Iterator[List[Dict]]:
+        """
+        Fetch result pages for the planned queries, paging each query while it
+        keeps producing new profiles. The next page is requested before the
+        current one is handed to the consumer so the two overlap.
+        """
+        target = max_results or config.MAX_CANDIDATES_PER_SEARCH
+        plan = self.query_planner.plan(self._extract_keyword_groups(job_description), target)
+        if self.search_client == "serpapi":
+            fetch, provider_label = self._execute_serpapi_search, "SerpAPI"
+        else:
+            fetch, provider_label = self._execute_google_search, "Google"
+        page_size = config.SEARCH_STREAM_PAGE_SIZE
+        
+        def fetch_page(planned, start: int) -> List[Dict]:
+            planned.num = page_size
+            return self._run_single_query(
+                planned.query, lambda query: fetch(query, page_size, start), provider_label
+            )
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        queued = list(plan.queries)
+        pages_requested = 0
+        future = None
+        try:
+            current = (queued.pop(0), 0) if queued else None
+            if current:
+                future = executor.submit(fetch_page, *current)
+                pages_requested += 1
+            
+            while future is not None:
+                batch = future.result()
+                future = None
+                planned, start = current
+                new_profiles = len({profile_key(profile) for profile in batch} - seen_urls - {''})
+                self.query_planner.record(planned, len(batch), new_profiles)
                 
-                time.sleep(config.SEARCH_DELAY_SECONDS)
+                # Keep paging this query while it turns up new profiles, else move to the next one
+                if new_profiles:
+                    current = (planned, start + page_size)
+                else:
+                    current = (queued.pop(0), 0) if queued else None
+                if current and pages_requested < config.SEARCH_STREAM_PAGE_BUDGET:
+                    future = executor.submit(fetch_page, *current)
+                    pages_requested += 1
                 
-                if len(all_profiles) >= max_results:
-                    break
-                    
-            except Exception as e:
-                print(f"Google search error for '{query}': {e}")
-                continue
+                yield batch
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+            plan.unique_profiles = len(seen_urls)
+            plan.stop_reason = 'target_reached' if len(seen_urls) >= target else (
+                'page_budget_exhausted' if pages_requested >= config.SEARCH_STREAM_PAGE_BUDGET else 'results_exhausted'
+            )
+            search_metadata['query_plan'] = plan.to_dict()
+    
+    def _get_similar_job_results(self, cache_key: str, signature: List[int]) -> Optional[List[Dict]]:
+        """Return fresh cached results of the most similar earlier job description, if any"""
+        for similar_key, similarity in self.similar_jobs.query(signature, exclude=cache_key):
+            cached = self.store.get_search_results(similar_key)
+            if cached and any(self._is_real_profile(p) for p in cached):
+                print(f"Reusing cached results from a similar job description (similarity {similarity:.2f})")
+                self.similar_jobs.record_lookup(True)
+                return cached
         
-        return self._deduplicate_profiles(all_profiles)[:max_results]
+        self.similar_jobs.record_lookup(False)
+        return None
     
-    def _execute_google_search(self, query: str, max_results: int) -> List[Dict]:
-        """Execute Google search and extract LinkedIn profiles"""
+    def _save_search_results(self, cache_key: str, job_description: str, profiles: List[Dict],
+                             signature: List[int] = None):
+        """Upsert search results and the job's MinHash signature into the profile store"""
+        if signature is None:
+            signature = self.similar_jobs.hasher.signature(job_description)
         try:
-            params = {
-                'q': query,
-                'num': min(max_results, 10)
-            }
-            
-            response = self.session.get(config.GOOGLE_SEARCH_URL, params=params)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            search_results = soup.find_all('div', class_='g')
-            
-            profiles = []
-            for result in search_results:
-                profile = self._parse_google_result(result)
-                if profile:
-                    profiles.append(profile)
-            
-            return profiles
-            
+            self.store.save_search_results(
+                cache_key, profiles,
+                job_description=job_description,
+                job_fingerprint=job_fingerprint(job_description),
+                known=self.registry.seen
+            )
+            self.store.save_job_signature(cache_key, signature)
         except Exception as e:
-            print(f"Google search execution error: {e}")
+            print(f"Warning: Could not save cache: {e}")
+        
+        self.similar_jobs.add(cache_key, signature)
+        self.registry.add_many(profile.get('linkedin_url', '') for profile in profiles)
+        self.profile_index.add_profiles(profile for profile in profiles if self._is_real_profile(profile))
+    
+    def get_cache_stats(self) -> Dict:
+        """Profile store counts plus near-duplicate reuse hit/miss counts"""
+        stats = self.store.get_stats()
+        stats.update(self.similar_jobs.get_stats())
+        stats['query_planner'] = self.query_planner.get_stats()
+        stats['coalescing'] = self.inflight.get_stats()
+        stats['negative_cache'] = self.failed_queries.get_stats()
+        stats['profile_registry'] = self.registry.get_stats()
+        return stats
+    
+    def _search_with_serpapi(self, job_description: str, max_results: int,
+                             search_metadata: Dict = None) -> List[Dict]:
+        """Search using SerpAPI (most reliable)"""
+        plan = self.query_planner.plan(self._extract_keyword_groups(job_description), max_results)
+        profiles = self._run_plan(plan, self._execute_serpapi_search, "SerpAPI")
+        if search_metadata is not None:
+            search_metadata['query_plan'] = plan.to_dict()
+        
+        return profiles
+    
+    def _search_with_google(self, job_description: str, max_results: int,
+                            search_metadata: Dict = None) -> List[Dict]:
+        """Search using Google (free but may be rate limited)"""
+        plan = self.query_planner.plan(self._extract_keyword_groups(job_description), max_results)
+        profiles = self._run_plan(plan, self._execute_google_search, "Google")
+        if search_metadata is not None:
+            search_metadata['query_plan'] = plan.to_dict()
+        
+        return profiles[:max_results]
+    
+    def _run_plan(self, plan: QueryPlan, fetch: Callable[[str, int], List[Dict]],
+                  provider_label: str) -> List[Dict]:
+        """
+        Issue a query plan under the shared rate limiter, stopping as soon as
+        the target number of unique profiles is collected. The top-ranked
+        query runs alone with a page size for the whole target; only if it
+        falls short are the next queries issued, sized for the shortfall.
+        With SEARCH_FAN_OUT up to SEARCH_CONCURRENCY of them are in flight at
+        once, but only as many as their expected yields need to cover the
+        shortfall. Results are merged in plan order.
+        """
+        unique_profiles = {}
+        queries = iter(plan.queries)
+        window = max(1, config.SEARCH_CONCURRENCY) if config.SEARCH_FAN_OUT else 1
+        in_flight = deque()
+        executor = ThreadPoolExecutor(max_workers=window)
+        
+        def shortfall() -> float:
+            expected = sum(planned.expected_yield * planned.num for planned, _ in in_flight)
+            return plan.target - len(unique_profiles) - expected
+        
+        def submit() -> bool:
+            planned = next(queries, None)
+            if planned is None:
+                return False
+            planned.num = self.query_planner.page_size(math.ceil(shortfall()))
+            in_flight.append((planned, executor.submit(
+                self._run_single_query, planned.query, lambda query, num=planned.num: fetch(query, num),
+                provider_label
+            )))
+            return True
+        
+        def merge(planned: PlannedQuery, batch: List[Dict]):
+            new_profiles = 0
+            for profile in batch:
+                key = profile_key(profile)
+                if key and key not in unique_profiles:
+                    unique_profiles[key] = profile
+                    new_profiles += 1
+            self.query_planner.record(planned, len(batch), new_profiles)
+        
+        try:
+            submit()
+            while in_flight:
+                planned, future = in_flight.popleft()
+                merge(planned, future.result())
+                if len(unique_profiles) >= plan.target:
+                    break
+                while len(in_flight) < window and shortfall() > 0 and submit():
+                    pass
+        finally:
+            # Queued queries are dropped; ones already sent still cost quota,
+            # so wait for them and count their results
+            for planned, future in in_flight:
+                if not future.cancel():
+                    try:
+                        merge(planned, future.result())
+                    except Exception as e:
+                        print(f"{provider_label} query '{planned.query}' failed: {e}")
+            executor.shutdown(wait=False)
+        
+        plan.unique_profiles = len(unique_profiles)
+        plan.stop_reason = 'target_reached' if len(unique_profiles) >= plan.target else 'budget_exhausted'
+        print(f"{provider_label}: {len(plan.issued)} queries for {len(unique_profiles)} unique profiles "
+              f"(target {plan.target}, budget {plan.budget})")
+        return list(unique_profiles.values())
+    
+    def _run_single_query(self, query: str, fetch: Callable[[str], List[Dict]],
+                          provider_label: str) -> List[Dict]:
+        """
+        Execute one query, backing off on provider 429s instead of sleeping a
+        fixed delay. Queries that just failed, and all queries while the
+        provider's circuit is open, are skipped without a request.
+        """
+        if query in self.failed_queries:
+            print(f"Skipping {provider_label} query that failed recently: '{query}'")
+            return []
+        if not self.circuit_breaker.allow_request():
+            print(f"{provider_label} circuit open, skipping '{query}'")
             return []
+        
+        for attempt in range(config.SEARCH_THROTTLE_RETRIES + 1):
+            if self.provider.rate_limited:
+                self.rate_limiter.acquire()
+            try:
+                profiles = fetch(query)
+                if self.provider.rate_limited:
+                    self.rate_limiter.record_success()
+                self.circuit_breaker.record_success()
+                return profiles
+            except RateLimitExceeded as e:
+                print(f"{provider_label} throttled for '{query}' (attempt {attempt + 1}, retry after {e.retry_after}s)")
+                self.rate_limiter.throttle(e.retry_after)
+            except Exception as e:
+                print(f"{provider_label} search error for '{query}': {e}")
+                break
+        
+        self.failed_queries.add(query)
+        self.circuit_breaker.record_failure()
+        return []
+    
+    def _execute_serpapi_search(self, query: str, num: int, start: int = 0) -> List[Dict]:
+        """Execute a SerpAPI query and extract LinkedIn profiles"""
+        response = self.provider.fetch(query, num, start)
+        response.raise_for_status()
+        
+        profiles = []
+        for result in self.provider.extract_results(response):
+            profile = self._parse_serpapi_result(result)
+            if profile:
+                profiles.append(profile)
+        
+        return profiles
+    
+    def _execute_google_search(self, query: str, num: int, start: int = 0) -> List[Dict]:
+        """Execute Google search and extract LinkedIn profiles (errors reach the circuit breaker)"""
+        response = self.provider.fetch(query, num, start)
+        response.raise_for_status()
+        
+        profiles = []
+        for result in self.provider.extract_results(response):
+            profile = self._parse_google_result(result)
+            if profile:
+                profiles.append(profile)
+        
+        return profiles
     
     def _parse_serpapi_result(self, result: Dict) -> Optional[Dict]:
         """Parse SerpAPI search result"""
@@ -195,7 +559,7 @@ class EnhancedLinkedInSearcher:
             location = self._extract_location_from_snippet(snippet)
             
             return {
-                'linkedin_url': link,
+                'linkedin_url': canonical_profile_url(link),
                 'name': name,
                 'headline': title.replace(f"{name} - ", "").split(" | ")[0],
                 'location': location,
@@ -206,26 +570,23 @@ class EnhancedLinkedInSearcher:
             print(f"Error parsing SerpAPI result: {e}")
             return None
     
-    def _parse_google_result(self, result_element) -> Optional[Dict]:
-        """Parse Google search result"""
+    def _parse_google_result(self, result: Dict) -> Optional[Dict]:
+        """Parse a Google search result extracted by the serp module"""
         try:
-            title_element = result_element.find('h3')
-            link_element = result_element.find('a')
+            title = result.get('title', '')
+            link = result.get('link', '')
             
-            if not title_element or not link_element:
+            if not title or not link:
                 return None
             
-            title = title_element.get_text()
-            link = link_element.get('href', '')
-            
             if not self._is_linkedin_profile_url(link):
                 return None
             
             name = self._extract_name_from_title(title)
-            location = self._extract_location_from_result(result_element)
+            location = self._extract_location_from_result(result)
             
             return {
-                'linkedin_url': link,
+                'linkedin_url': canonical_profile_url(link),
                 'name': name,
                 'headline': title.replace(f"{name} - ", "").split(" | ")[0],
                 'location': location,
@@ -236,51 +597,31 @@ class EnhancedLinkedInSearcher:
             print(f"Error parsing Google result: {e}")
             return None
     
-    def _extract_keywords(self, job_description: str) -> List[str]:
-        """Extract relevant keywords from job description"""
-        tech_keywords = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'aws', 'docker',
-            'kubernetes', 'machine learning', 'ai', 'data science', 'devops',
-            'frontend', 'backend', 'full stack', 'mobile', 'ios', 'android',
-            'sql', 'nosql', 'mongodb', 'postgresql', 'redis', 'elasticsearch',
-            'software engineer', 'developer', 'architect', 'manager', 'lead'
-        ]
-        
+    def _extract_keyword_groups(self, job_description: str) -> Dict[str, List[str]]:
+        """Extract skill, location and company keywords from job description for query planning"""
         location_pattern = r'\b(?:in|at|based in|located in)\s+([A-Za-z\s,]+?)(?:\s|\.|$)'
-        locations = re.findall(location_pattern, job_description, re.IGNORECASE)
-        
         company_pattern = r'\b(?:at|with|from)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        companies = re.findall(company_pattern, job_description, re.IGNORECASE)
         
-        found_keywords = []
-        job_lower = job_description.lower()
-        for keyword in tech_keywords:
-            if keyword in job_lower:
-                found_keywords.append(keyword)
+        matches = self.matcher.find(job_description)
+        skills = matches['search_keyword']
+        # Known locations are reliable; the preposition pattern only catches the first word
+        locations = list(matches['search_location'])
+        locations += [location for location in re.findall(location_pattern, job_description, re.IGNORECASE)
+                      if not any(location.strip().lower() in known for known in locations)]
+        # Case-sensitive so only capitalized names count as companies
+        companies = [company for company in re.findall(company_pattern, job_description)
+                     if company.lower() not in SEARCH_KEYWORDS]
         
-        return found_keywords[:5] + locations[:2] + companies[:2]
-    
-    def _build_search_queries(self, keywords: List[str]) -> List[str]:
-        """Build search queries from keywords"""
-        queries = []
-        
-        if len(keywords) >= 2:
-            primary_keywords = keywords[:2]
-            queries.append(f'site:{config.LINKEDIN_DOMAIN} {" ".join(primary_keywords)}')
-        
-        location_keywords = [k for k in keywords if any(word in k.lower() for word in ['california', 'new york', 'texas', 'florida', 'washington', 'seattle', 'san francisco', 'austin'])]
-        if location_keywords:
-            for location in location_keywords[:2]:
-                queries.append(f'site:{config.LINKEDIN_DOMAIN} {location}')
-        
-        if not queries:
-            queries.append(f'site:{config.LINKEDIN_DOMAIN} software engineer')
-        
-        return queries
+        return {
+            'skills': skills[:5],
+            'locations': [location for location in dict.fromkeys(location.strip().lower() for location in locations)
+                          if location not in {company.lower() for company in companies}][:2],
+            'companies': companies[:2]
+        }
     
     def _is_linkedin_profile_url(self, url: str) -> bool:
         """Check if URL is a LinkedIn profile URL"""
-        return config.LINKEDIN_DOMAIN in url and '/in/' in url
+        return is_linkedin_profile_url(url)
     
     def _extract_name_from_title(self, title: str) -> str:
         """Extract name from LinkedIn profile title"""
@@ -304,31 +645,30 @@ class EnhancedLinkedInSearcher:
         
         return "Unknown"
     
-    def _extract_location_from_result(self, result_element) -> str:
+    def _extract_location_from_result(self, result: Dict) -> str:
         """Extract location from Google search result"""
         try:
-            snippet_element = result_element.find('span', class_='aCOpRe')
-            if snippet_element:
-                return self._extract_location_from_snippet(snippet_element.get_text())
+            snippet = result.get('snippet', '')
+            if snippet:
+                return self._extract_location_from_snippet(snippet)
             
-            for element in result_element.find_all(['span', 'div']):
-                text = element.get_text()
-                if any(location in text.lower() for location in ['california', 'new york', 'texas', 'florida', 'washington']):
-                    return self._extract_location_from_snippet(text)
+            text = result.get('text', '')
+            if any(location in text.lower() for location in ['california', 'new york', 'texas', 'florida', 'washington']):
+                return self._extract_location_from_snippet(text)
             
             return "Unknown"
         except:
             return "Unknown"
     
     def _deduplicate_profiles(self, profiles: List[Dict]) -> List[Dict]:
-        """Remove duplicate profiles based on LinkedIn URL"""
+        """Remove duplicate profiles based on canonical LinkedIn profile slug"""
         seen_urls = set()
         unique_profiles = []
         
         for profile in profiles:
-            url = profile.get('linkedin_url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
+            key = profile_key(profile)
+            if key and key not in seen_urls:
+                seen_urls.add(key)
                 unique_profiles.append(profile)
         
         return unique_profiles
@@ -398,27 +738,18 @@ class EnhancedLinkedInSearcher:
         
         return filtered_profiles[:config.MAX_CANDIDATES_PER_SEARCH]
     
+    def _is_real_profile(self, profile: Dict) -> bool:
+        """True for profiles that are not one of the built-in demo profiles"""
+        return (isinstance(profile, dict) and 
+                'linkedin_url' in profile and 
+                not any(demo_suffix in profile['linkedin_url'] for demo_suffix in ['-ai', '-dev', '-eng', '-aws', '-ml']))
+    
     def _get_real_profiles_from_cache(self, job_description: str = None) -> List[Dict]:
-        """Return all real profiles from cache, no filtering or scoring. Always reload cache from disk."""
+        """Return the cached real profiles most relevant to the job, via the in-memory index"""
         try:
-            # Always reload cache from disk to ensure up-to-date data
-            cache_path = os.path.join(os.path.dirname(__file__), 'cache.json')
-            if os.path.exists(cache_path):
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-            else:
-                self.cache = {}
-            if not self.cache:
-                return []
-            real_profiles = []
-            for cache_key, profiles in self.cache.items():
-                for profile in profiles:
-                    if (isinstance(profile, dict) and 
-                        'linkedin_url' in profile and 
-                        not any(demo_suffix in profile['linkedin_url'] for demo_suffix in ['-ai', '-dev', '-eng', '-aws', '-ml'])):
-                        real_profiles.append(profile)
-            print(f"[CACHE FALLBACK] Returning {len(real_profiles)} real profiles from cache (no filtering)")
-            return real_profiles[:config.MAX_CANDIDATES_PER_SEARCH]
+            real_profiles = self.profile_index.search(job_description, config.MAX_CANDIDATES_PER_SEARCH)
+            print(f"[CACHE FALLBACK] Returning {len(real_profiles)} real profiles from cache (ranked by relevance)")
+            return real_profiles
         except Exception as e:
             print(f"Error getting real profiles from cache: {e}")
-            return [] 
\ No newline at end of file
+            return []
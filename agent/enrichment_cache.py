@@ -0,0 +1,136 @@
+"""
+Bounded LRU cache of headline enrichment keyed by profile content, with
+optional persistence in the profile store
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import config
+from profile_store import get_profile_store
+
+
+def _freeze(fields: Dict) -> Dict:
+    """Store lists as tuples so cached entries can be shared without copying them"""
+    return {key: tuple(value) if isinstance(value, list) else value for key, value in fields.items()}
+
+
+class EnrichmentCache:
+    """
+    Maps (headline, location, extractor_version) to the job-independent
+    fields the parser extracts from a profile, so a profile whose content
+    hasn't changed is never parsed twice.
+
+    ``extractor_version`` should change whenever extraction can give a
+    different answer (the parser includes a hash of every vocabulary), so
+    stale entries are never served and persisted ones are purged on load.
+    """
+
+    def __init__(self, extractor_version: str, max_entries: int = None, persist: bool = None, store=None):
+        self.extractor_version = extractor_version
+        self.max_entries = max_entries or config.ENRICHMENT_CACHE_SIZE
+        self.persist = config.ENRICHMENT_CACHE_PERSIST if persist is None else persist
+        self._entries: OrderedDict = OrderedDict()
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+        self.store = None
+        if self.persist:
+            self.store = store or get_profile_store()
+            self._load()
+
+    def _key(self, headline: str, location: str) -> str:
+        content = f'{self.extractor_version}\0{headline or ""}\0{location or ""}'
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        try:
+            purged = self.store.delete_stale_enrichments(self.extractor_version)
+            entries = list(self.store.iter_enrichments(self.extractor_version, self.max_entries))
+        except Exception as e:
+            print(f"Warning: Could not load enrichment cache: {e}")
+            return
+        # Most recent first from the store; insert oldest first so they end up most recently used
+        for key, data in reversed(entries):
+            self._entries[key] = _freeze(data)
+        if purged:
+            print(f"Enrichment cache: dropped {purged} entries from older extractor versions")
+
+    def _insert(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, headline: str, location: str, check_store: bool = False) -> Optional[Dict]:
+        """
+        Cached fields, or None. With ``check_store`` (the profile was seen
+        before), a memory miss falls back to the enrichments persisted in the
+        profile store, which outlive the in-memory LRU.
+        """
+        key = self._key(headline, location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry)
+
+        if check_store and self.persist:
+            try:
+                data = self.store.get_enrichment(key, self.extractor_version)
+            except Exception as e:
+                print(f"Warning: Could not read enrichment cache: {e}")
+                data = None
+            if data is not None:
+                entry = _freeze(data)
+                with self._lock:
+                    self._insert(key, entry)
+                    self.hits += 1
+                    self.store_hits += 1
+                return dict(entry)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, headline: str, location: str, fields: Dict):
+        key = self._key(headline, location)
+        entry = _freeze(fields)
+        with self._lock:
+            self._insert(key, entry)
+            if self.persist:
+                self._pending[key] = fields
+
+    def flush(self):
+        """Write entries added since the last flush to the profile store in one transaction"""
+        if not self.persist:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            self.store.save_enrichments(self.extractor_version, pending)
+        except Exception as e:
+            print(f"Warning: Could not persist enrichment cache: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'extractor_version': self.extractor_version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'store_hits': self.store_hits,
+                'evictions': self.evictions,
+                'persisted': self.persist
+            }
@@ -0,0 +1,53 @@
+"""
+Per-request job context: everything mined from the job description, computed
+once and shared by the parser, scorer and messenger
+"""
+from typing import Dict, List, Optional, Union
+
+from cache_keys import job_fingerprint
+from keyword_matcher import get_keyword_matcher
+from skill_bitset import get_skill_vocabulary
+from vocabularies import INDUSTRY_KEYWORDS, SKILL_PATTERNS
+
+
+class JobContext:
+    """
+    Job description features, extracted with one keyword-matcher pass so
+    per-candidate work no longer depends on the job description's length
+    """
+
+    def __init__(self, job_description: str):
+        self.text = job_description
+        self.fingerprint = job_fingerprint(job_description)
+        matches = get_keyword_matcher().find(job_description)
+
+        # Parser skill vocabulary, in vocabulary order
+        self.skills: List[str] = list(dict.fromkeys(
+            skill for category in SKILL_PATTERNS for skill in matches[f'skill:{category}']
+        ))
+        # Scorer skill vocabulary, used for the skills match
+        self.required_skills: List[str] = matches['job_skill']
+        self.skill_mask: int = get_skill_vocabulary().encode(self.required_skills)
+        # Tech hubs are listed in priority order, so the first match wins
+        self.location: str = matches['job_location'][0] if matches['job_location'] else ''
+        self.industry: Optional[str] = next(
+            (industry for industry in INDUSTRY_KEYWORDS if matches[f'industry:{industry}']), None
+        )
+        self.requires_education: bool = bool(matches['education_requirement'])
+        self.remote: bool = bool(matches['remote'])
+
+    def to_dict(self) -> Dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'skills': self.skills,
+            'required_skills': self.required_skills,
+            'location': self.location,
+            'industry': self.industry,
+            'requires_education': self.requires_education,
+            'remote': self.remote
+        }
+
+
+def as_job_context(job: Union[str, JobContext]) -> JobContext:
+    """Accept either a raw job description or an already built context"""
+    return job if isinstance(job, JobContext) else JobContext(job)
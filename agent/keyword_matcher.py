@@ -0,0 +1,89 @@
+"""
+One compiled multi-pattern keyword matcher shared by search, parsing and
+scoring, so every vocabulary is matched in a single pass over the text
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from vocabularies import all_vocabularies
+
+# Terms like 'c++', '.net' and 'ci/cd' start or end with punctuation, so
+# boundaries are "not next to a letter or digit" rather than \b
+_BOUNDARY_BEFORE = r'(?<![a-z0-9])'
+_BOUNDARY_AFTER = r'(?![a-z0-9])'
+
+
+class KeywordMatches(dict):
+    """Matches by category; categories without a match read as an empty list"""
+
+    def __missing__(self, category: str) -> List[str]:
+        return []
+
+
+class KeywordMatcher:
+    """
+    Matches many keyword vocabularies at once with one compiled alternation.
+
+    Terms are matched case-insensitively as whole words (so 'go' no longer
+    hits 'google' and 'ms' no longer hits 'teams'). Alternatives are tried
+    longest first; a long term that wins also counts the shorter vocabulary
+    terms it contains ('react native' also yields 'react').
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        self.vocabularies = {category: list(dict.fromkeys(term.lower() for term in terms))
+                             for category, terms in vocabularies.items()}
+
+        # term -> [(category, position in that category's vocabulary)]
+        self._postings: Dict[str, List[Tuple[str, int]]] = {}
+        for category, terms in self.vocabularies.items():
+            for position, term in enumerate(terms):
+                self._postings.setdefault(term, []).append((category, position))
+
+        terms = sorted(self._postings, key=lambda term: (-len(term), term))
+        self._pattern = re.compile(
+            _BOUNDARY_BEFORE + '(?:' + '|'.join(re.escape(term) for term in terms) + ')' + _BOUNDARY_AFTER
+        )
+        self._contained = {term: self._contained_terms(term) for term in terms}
+
+    def _contained_terms(self, term: str) -> List[str]:
+        """Vocabulary terms that occur as whole words inside ``term`` (including itself)"""
+        return [other for other in self._postings
+                if len(other) <= len(term)
+                and re.search(_BOUNDARY_BEFORE + re.escape(other) + _BOUNDARY_AFTER, term)]
+
+    def find(self, text: str) -> 'KeywordMatches':
+        """Matched terms for every category, each in its vocabulary order"""
+        hits: Dict[str, List[int]] = {}
+        seen = set()
+        for match in self._pattern.finditer((text or '').lower()):
+            for term in self._contained[match.group()]:
+                if term not in seen:
+                    seen.add(term)
+                    for category, position in self._postings[term]:
+                        hits.setdefault(category, []).append(position)
+        return KeywordMatches(
+            (category, [self.vocabularies[category][position] for position in sorted(positions)])
+            for category, positions in hits.items()
+        )
+
+    def get_stats(self) -> Dict:
+        return {
+            'vocabularies': len(self.vocabularies),
+            'terms': len(self._postings)
+        }
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Process-wide matcher over every vocabulary in ``vocabularies``"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = KeywordMatcher(all_vocabularies())
+    return _matcher
@@ -4,8 +4,9 @@ FastAPI entrypoint for the LinkedIn Sourcing Agent
 import json
 import uuid
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -19,13 +20,29 @@ from enhanced_search import EnhancedLinkedInSearcher
 from parser import CandidateParser
 from scorer import CandidateScorer
 from messenger import MessageGenerator
+from enhanced_ai import EnhancedAIClient
+from job_context import JobContext
+from candidate import Candidate
+from reranker import PoolStore, ScoredPool, normalize_weights
+from transport import get_transport
+from circuit_breaker import get_circuit_status
+from cache_warmer import CacheWarmer
 import config
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background cache warmer for the lifetime of the app"""
+    if config.CACHE_WARMER_ENABLED:
+        cache_warmer.start()
+    yield
+    await cache_warmer.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="LinkedIn Sourcing Agent",
     description="Autonomous AI agent for finding and scoring LinkedIn candidates",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -45,6 +62,49 @@ searcher = EnhancedLinkedInSearcher()
 parser = CandidateParser()
 scorer = CandidateScorer()
 messenger = MessageGenerator()
+ai_client = EnhancedAIClient() if config.AI_SCORING_ENABLED else None
+cache_warmer = CacheWarmer(searcher)
+
+def ai_scoring_enabled() -> bool:
+    """Whether shortlists are rescored with the LLM (opted in and a provider is configured)"""
+    return ai_client is not None and ai_client.is_available()
+
+def search_and_parse(job_description: str, max_results: int, job: JobContext,
+                     search_metadata: Dict = None) -> Tuple[int, List[Candidate]]:
+    """
+    Find profiles for a job and parse them; returns how many profiles were
+    found and the parsed candidates. With SEARCH_STREAMING the profiles come
+    from iter_linkedin_profiles and each page is parsed while the next one
+    is fetched.
+    """
+    if config.SEARCH_STREAMING:
+        found = 0
+        
+        def counted(profiles):
+            nonlocal found
+            for profile in profiles:
+                found += 1
+                yield profile
+        
+        stream = searcher.iter_linkedin_profiles(job_description, max_results, search_metadata=search_metadata)
+        candidates = parser.parse_candidates(counted(stream), job)
+        return found, candidates
+    
+    raw_profiles = searcher.search_linkedin_profiles(job_description, max_results, search_metadata=search_metadata)
+    if not raw_profiles:
+        return 0, []
+    return len(raw_profiles), parser.parse_candidates(raw_profiles, job)
+
+@app.middleware("http")
+async def track_activity(request: Request, call_next):
+    """Tell the cache warmer when real traffic is in flight (health checks don't count)"""
+    if request.url.path == "/health":
+        return await call_next(request)
+    cache_warmer.request_started()
+    try:
+        return await call_next(request)
+    finally:
+        cache_warmer.request_finished()
 
 # Pydantic models
 class JobRequest(BaseModel):
@@ -69,8 +129,14 @@ class MatchResponse(BaseModel):
     top_candidates: List[CandidateResponse]
     search_metadata: Dict
 
+class RerankRequest(BaseModel):
+    weights: Dict[str, float] = Field(..., description="Weight per score category (education, trajectory, company, skills, location, tenure)")
+    max_candidates: Optional[int] = Field(None, ge=1, le=50, description="Top K to return (defaults to the original request's)")
+
 # In-memory storage for results (in production, use a proper database)
 job_results = {}
+# Scored candidate pools, so results can be re-ranked with other weights
+job_pools = PoolStore()
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -87,6 +153,7 @@ async def api_info():
             "POST /match": "Find and score candidates for a job description",
             "GET /health": "Health check",
             "GET /results/{job_id}": "Get results for a specific job",
+            "POST /results/{job_id}/rerank": "Re-rank a job's candidates with custom weights",
             "GET /stats": "Application statistics"
         }
     }
@@ -94,16 +161,21 @@ async def api_info():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    circuits = get_circuit_status()
     return {
-        "status": "healthy",
+        # Degraded while a search provider circuit is open and /match serves cached fallbacks
+        "status": "degraded" if any(c["state"] != "closed" for c in circuits.values()) else "healthy",
         "timestamp": datetime.now().isoformat(),
-        "gemini_available": bool(config.GEMINI_API_KEY)
+        "gemini_available": bool(config.GEMINI_API_KEY),
+        "search_circuits": circuits
     }
 
 @app.post("/match", response_model=MatchResponse)
-async def match_candidates(request: JobRequest, background_tasks: BackgroundTasks):
+def match_candidates(request: JobRequest, background_tasks: BackgroundTasks):
     """
-    Main endpoint to find and score candidates for a job description
+    Main endpoint to find and score candidates for a job description.
+    Declared sync so FastAPI runs it in its threadpool: the pipeline blocks
+    on network calls, and concurrent identical searches are coalesced there.
     """
     try:
         # Generate job ID if not provided
@@ -111,24 +183,26 @@ async def match_candidates(request: JobRequest, background_tasks: BackgroundTask
         
         print(f"Starting candidate search for job ID: {job_id}")
         
-        # Step 1: Search for LinkedIn profiles
-        print("Step 1: Searching for LinkedIn profiles...")
-        raw_profiles = searcher.search_linkedin_profiles(
+        # Job description features are mined once and shared by every stage
+        job = JobContext(request.job_description)
+        
+        # Steps 1-2: Search for LinkedIn profiles, then parse and enrich them
+        print("Steps 1-2: Searching for LinkedIn profiles and parsing candidate data...")
+        search_info = {}
+        profiles_found, enriched_candidates = search_and_parse(
             request.job_description, 
-            request.max_candidates
+            request.max_candidates,
+            job,
+            search_metadata=search_info
         )
         
-        if not raw_profiles:
+        if not profiles_found:
             raise HTTPException(
                 status_code=404, 
                 detail="No LinkedIn profiles found for the given job description"
             )
         
-        print(f"Found {len(raw_profiles)} raw profiles")
-        
-        # Step 2: Parse and enrich candidate data
-        print("Step 2: Parsing and enriching candidate data...")
-        enriched_candidates = parser.parse_candidates(raw_profiles, request.job_description)
+        print(f"Found {profiles_found} raw profiles")
         
         if not enriched_candidates:
             raise HTTPException(
@@ -140,47 +214,52 @@ async def match_candidates(request: JobRequest, background_tasks: BackgroundTask
         
         # Step 3: Score candidates
         print("Step 3: Scoring candidates...")
-        scored_candidates = scorer.score_candidates(enriched_candidates, request.job_description)
+        scored_candidates = scorer.score_candidates(enriched_candidates, job, top_k=request.max_candidates)
+        pool = ScoredPool(enriched_candidates, job, scorer, request.max_candidates or len(enriched_candidates))
         
-        print(f"Scored {len(scored_candidates)} candidates")
+        print(f"Scored {len(enriched_candidates)} candidates, kept the top {len(scored_candidates)}")
+        ai_scored = 0
+        if ai_scoring_enabled():
+            scored_candidates, ai_scored = scorer.apply_ai_scores(scored_candidates, job, ai_client)
+            print(f"Rescored {ai_scored} of the top {len(scored_candidates)} candidates with AI")
         
         # Step 4: Generate outreach messages
         print("Step 4: Generating outreach messages...")
-        candidates_with_messages = messenger.generate_outreach_messages(
-            scored_candidates, 
-            request.job_description
-        )
+        candidates_with_messages = messenger.generate_outreach_messages(scored_candidates, job)
         
         print(f"Generated messages for {len(candidates_with_messages)} candidates")
+        job_pools.put(job_id, pool)
         
         # Step 5: Prepare response
-        top_candidates = candidates_with_messages[:request.max_candidates]
+        top_candidates = candidates_with_messages
         
         # Convert to response format
         candidate_responses = []
         for candidate in top_candidates:
             candidate_response = CandidateResponse(
-                name=candidate.get('name', 'Unknown'),
-                linkedin_url=candidate.get('linkedin_url', ''),
-                fit_score=candidate.get('fit_score', 0.0),
-                score_breakdown=candidate.get('score_breakdown', {}),
-                outreach_message=candidate.get('outreach_message', ''),
-                headline=candidate.get('headline'),
-                location=candidate.get('location'),
-                skills=candidate.get('skills'),
-                companies=candidate.get('companies')
+                name=candidate.name,
+                linkedin_url=candidate.linkedin_url,
+                fit_score=candidate.fit_score or 0.0,
+                score_breakdown=candidate.score_breakdown or {},
+                outreach_message=candidate.outreach_message or '',
+                headline=candidate.headline,
+                location=candidate.location,
+                skills=list(candidate.skills),
+                companies=list(candidate.companies)
             )
             candidate_responses.append(candidate_response)
         
         # Prepare metadata
         search_metadata = {
-            "total_profiles_found": len(raw_profiles),
+            "total_profiles_found": profiles_found,
             "enriched_candidates": len(enriched_candidates),
-            "scored_candidates": len(scored_candidates),
+            "scored_candidates": len(enriched_candidates),
             "search_timestamp": datetime.now().isoformat(),
             "job_description_length": len(request.job_description),
-            "ai_scoring_used": bool(config.GEMINI_API_KEY)
+            "ai_scoring_used": ai_scored > 0,
+            "ai_scored_candidates": ai_scored
         }
+        search_metadata.update(search_info)
         
         # Store results
         job_results[job_id] = {
@@ -223,6 +302,51 @@ async def get_job_results(job_id: str):
     
     return job_results[job_id]
 
+@app.post("/results/{job_id}/rerank")
+def rerank_job_results(job_id: str, request: RerankRequest):
+    """
+    Re-rank a job's scored candidates with custom weights. Fit scores are
+    recomputed from the stored score breakdowns: no search, parsing or LLM
+    calls. Candidates new to the top K get a rule-based outreach message.
+    """
+    pool = job_pools.get(job_id)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="No scored candidates stored for this job")
+    
+    try:
+        weights = normalize_weights(request.weights)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    ranked, new_entrants = pool.rerank(weights, messenger, request.max_candidates)
+    
+    candidate_responses = [
+        CandidateResponse(
+            name=candidate.name,
+            linkedin_url=candidate.linkedin_url,
+            fit_score=fit_score,
+            score_breakdown=score_breakdown,
+            outreach_message=candidate.outreach_message or '',
+            headline=candidate.headline,
+            location=candidate.location,
+            skills=list(candidate.skills),
+            companies=list(candidate.companies)
+        )
+        for candidate, fit_score, score_breakdown in ranked
+    ]
+    
+    return {
+        "job_id": job_id,
+        "weights": weights,
+        "candidates_found": len(candidate_responses),
+        "top_candidates": [c.dict() for c in candidate_responses],
+        "rerank_metadata": {
+            "pool_size": len(pool.candidates),
+            "new_entrants": new_entrants,
+            "reranked_at": datetime.now().isoformat()
+        }
+    }
+
 @app.get("/stats")
 async def get_stats():
     """Get application statistics"""
@@ -237,6 +361,11 @@ async def get_stats():
         "total_jobs": total_jobs,
         "total_candidates": total_candidates,
         "avg_candidates_per_job": round(avg_candidates, 1),
+        "search_cache": searcher.get_cache_stats(),
+        "enrichment_cache": parser.enrichment_cache.get_stats(),
+        "score_cache": scorer.score_cache.get_stats() if scorer.score_cache else None,
+        "cache_warmer": cache_warmer.get_status(),
+        "http_transport": get_transport().get_metrics(),
         "uptime": "Running",
         "last_updated": datetime.now().isoformat()
     }
@@ -245,8 +374,9 @@ def save_results_to_file(job_id: str):
     """Save results to JSON file"""
     try:
         if job_id in job_results:
+            # Snapshot first: other requests may add results while this is written
             with open("data.json", "w") as f:
-                json.dump(job_results, f, indent=2)
+                json.dump(dict(job_results), f, indent=2)
     except Exception as e:
         print(f"Error saving results: {e}")
 
@@ -260,7 +390,7 @@ async def global_exception_handler(request, exc):
     }
 
 @app.post("/api/hackathon", response_model=Dict)
-async def hackathon_endpoint(request: JobRequest):
+def hackathon_endpoint(request: JobRequest):
     """
     Hackathon-specific endpoint that returns top 10 candidates with personalized outreach
     Returns the exact format required for the competition
@@ -271,14 +401,18 @@ async def hackathon_endpoint(request: JobRequest):
         
         print(f"Processing hackathon request for job ID: {job_id}")
         
-        # Step 1: Search for LinkedIn profiles
-        print("Step 1: Searching for LinkedIn profiles...")
-        raw_profiles = searcher.search_linkedin_profiles(
+        # Job description features are mined once and shared by every stage
+        job = JobContext(request.job_description)
+        
+        # Steps 1-2: Search for LinkedIn profiles, then parse and enrich them
+        print("Steps 1-2: Searching for LinkedIn profiles and parsing candidate data...")
+        profiles_found, enriched_candidates = search_and_parse(
             request.job_description, 
-            10  # Always return top 10 for hackathon
+            10,  # Always return top 10 for hackathon
+            job
         )
         
-        if not raw_profiles:
+        if not profiles_found:
             return {
                 "job_id": job_id,
                 "candidates_found": 0,
@@ -286,11 +420,7 @@ async def hackathon_endpoint(request: JobRequest):
                 "error": "No LinkedIn profiles found for the given job description"
             }
         
-        print(f"Found {len(raw_profiles)} raw profiles")
-        
-        # Step 2: Parse and enrich candidate data
-        print("Step 2: Parsing and enriching candidate data...")
-        enriched_candidates = parser.parse_candidates(raw_profiles, request.job_description)
+        print(f"Found {profiles_found} raw profiles")
         
         if not enriched_candidates:
             return {
@@ -304,36 +434,39 @@ async def hackathon_endpoint(request: JobRequest):
         
         # Step 3: Score candidates using hackathon rubric
         print("Step 3: Scoring candidates using hackathon rubric...")
-        scored_candidates = scorer.score_candidates(enriched_candidates, request.job_description)
+        scored_candidates = scorer.score_candidates(enriched_candidates, job, top_k=10)  # Top 10 candidates
+        pool = ScoredPool(enriched_candidates, job, scorer, 10)
         
-        print(f"Scored {len(scored_candidates)} candidates")
+        print(f"Scored {len(enriched_candidates)} candidates, kept the top {len(scored_candidates)}")
+        ai_scored = 0
+        if ai_scoring_enabled():
+            scored_candidates, ai_scored = scorer.apply_ai_scores(scored_candidates, job, ai_client)
+            print(f"Rescored {ai_scored} of the top {len(scored_candidates)} candidates with AI")
         
         # Step 4: Generate personalized outreach messages
         print("Step 4: Generating personalized outreach messages...")
-        candidates_with_messages = messenger.generate_outreach_messages(
-            scored_candidates, 
-            request.job_description
-        )
+        candidates_with_messages = messenger.generate_outreach_messages(scored_candidates, job)
         
         print(f"Generated messages for {len(candidates_with_messages)} candidates")
+        job_pools.put(job_id, pool)
         
         # Step 5: Prepare hackathon response format
-        top_candidates = candidates_with_messages[:10]  # Top 10 candidates
+        top_candidates = candidates_with_messages
         
         # Convert to hackathon format
         hackathon_candidates = []
         for candidate in top_candidates:
             hackathon_candidate = {
-                "name": candidate.get('name', 'Unknown'),
-                "linkedin_url": candidate.get('linkedin_url', ''),
-                "fit_score": candidate.get('fit_score', 0.0),
-                "score_breakdown": candidate.get('score_breakdown', {}),
-                "outreach_message": candidate.get('outreach_message', ''),
-                "headline": candidate.get('headline', ''),
-                "location": candidate.get('location', ''),
-                "skills": candidate.get('skills', []),
-                "companies": candidate.get('companies', []),
-                "education": candidate.get('education', [])
+                "name": candidate.name,
+                "linkedin_url": candidate.linkedin_url,
+                "fit_score": candidate.fit_score or 0.0,
+                "score_breakdown": candidate.score_breakdown or {},
+                "outreach_message": candidate.outreach_message or '',
+                "headline": candidate.headline,
+                "location": candidate.location,
+                "skills": list(candidate.skills),
+                "companies": list(candidate.companies),
+                "education": list(candidate.education)
             }
             hackathon_candidates.append(hackathon_candidate)
         
@@ -4,9 +4,14 @@ Creates personalized outreach messages highlighting candidate characteristics
 """
 import re
 import json
-from typing import Dict, List, Optional
+import hashlib
+from typing import Dict, List, Optional, Union
 import google.generativeai as genai
 import config
+from candidate import Candidate, as_candidate
+from job_context import JobContext, as_job_context
+from singleflight import SingleFlight
+from transport import get_transport
 
 class MessageGenerator:
     def __init__(self):
@@ -14,6 +19,8 @@ class MessageGenerator:
         if config.GEMINI_API_KEY:
             genai.configure(api_key=config.GEMINI_API_KEY)
             self.gemini_client = genai.GenerativeModel(config.GEMINI_MODEL)
+        # Identical prompts generated concurrently share one LLM call
+        self.inflight = SingleFlight('messages')
         
         self.message_templates = {
             'senior': {
@@ -33,61 +40,69 @@ class MessageGenerator:
             }
         }
     
-    def generate_outreach_messages(self, candidates: List[Dict], job_description: str) -> List[Dict]:
+    def generate_outreach_messages(self, candidates: List[Candidate], job: Union[str, JobContext],
+                                   use_ai: bool = True) -> List[Candidate]:
         """
         Generate personalized outreach messages for candidates
+        (``use_ai=False`` keeps to the rule-based templates)
         """
+        job = as_job_context(job)
         candidates_with_messages = []
         
-        for candidate in candidates:
+        for candidate in map(as_candidate, candidates):
             try:
-                message = self._generate_single_message(candidate, job_description)
-                candidate['outreach_message'] = message
+                message = self._generate_single_message(candidate, job, use_ai)
+                candidate.outreach_message = message
                 candidates_with_messages.append(candidate)
             except Exception as e:
-                print(f"Error generating message for {candidate.get('name', 'Unknown')}: {e}")
+                print(f"Error generating message for {candidate.name}: {e}")
                 # Fallback message
-                candidate['outreach_message'] = self._generate_fallback_message(candidate, job_description)
+                candidate.outreach_message = self._generate_fallback_message(candidate, job)
                 candidates_with_messages.append(candidate)
         
         return candidates_with_messages
     
-    def _generate_single_message(self, candidate: Dict, job_description: str) -> str:
+    def _generate_single_message(self, candidate: Candidate, job: JobContext, use_ai: bool = True) -> str:
         """
         Generate a personalized message for a single candidate
         """
-        if self.gemini_client:
-            return self._generate_ai_message(candidate, job_description)
+        if self.gemini_client and use_ai:
+            return self._generate_ai_message(candidate, job)
         else:
-            return self._generate_rule_based_message(candidate, job_description)
+            return self._generate_rule_based_message(candidate, job)
     
-    def _generate_ai_message(self, candidate: Dict, job_description: str) -> str:
+    def _generate_ai_message(self, candidate: Candidate, job: JobContext) -> str:
         """
         Generate AI-powered personalized message
         """
         try:
             # Extract candidate details
-            name = candidate.get('name', 'there')
-            headline = candidate.get('headline', '')
-            location = candidate.get('location', '')
-            skills = candidate.get('skills', [])
-            companies = candidate.get('companies', [])
-            education = candidate.get('education', [])
-            fit_score = candidate.get('fit_score', 0)
-            score_breakdown = candidate.get('score_breakdown', {})
+            name = candidate.name or 'there'
+            headline = candidate.headline
+            location = candidate.location
+            skills = candidate.skills
+            companies = candidate.companies
+            education = candidate.education
+            fit_score = candidate.fit_score or 0
+            score_breakdown = candidate.score_breakdown or {}
             
             # Create personalized prompt
             prompt = self._create_personalization_prompt(
                 name, headline, location, skills, companies, education, 
-                fit_score, score_breakdown, job_description
+                fit_score, score_breakdown, job.text
             )
             
-            response = self.gemini_client.generate_content(prompt)
-            return response.text.strip()
+            message, _ = self.inflight.do(
+                hashlib.sha256(prompt.encode('utf-8')).hexdigest(),
+                lambda: get_transport().call(
+                    "gemini", lambda: self.gemini_client.generate_content(prompt), timeout=config.LLM_TIMEOUT_SECONDS
+                ).text.strip()
+            )
+            return message
             
         except Exception as e:
             print(f"AI message generation failed: {e}")
-            return self._generate_rule_based_message(candidate, job_description)
+            return self._generate_rule_based_message(candidate, job)
     
     def _create_personalization_prompt(self, name: str, headline: str, location: str, 
                                      skills: List[str], companies: List[str], 
@@ -133,18 +148,18 @@ Create a compelling, personalized message that highlights their specific qualifi
 """
         return prompt
     
-    def _generate_rule_based_message(self, candidate: Dict, job_description: str) -> str:
+    def _generate_rule_based_message(self, candidate: Candidate, job: JobContext) -> str:
         """
         Generate rule-based personalized message
         """
-        name = candidate.get('name', 'there')
-        headline = candidate.get('headline', '')
-        location = candidate.get('location', '')
-        skills = candidate.get('skills', [])
-        companies = candidate.get('companies', [])
-        education = candidate.get('education', [])
-        fit_score = candidate.get('fit_score', 0)
-        score_breakdown = candidate.get('score_breakdown', {})
+        name = candidate.name or 'there'
+        headline = candidate.headline
+        location = candidate.location
+        skills = candidate.skills
+        companies = candidate.companies
+        education = candidate.education
+        fit_score = candidate.fit_score or 0
+        score_breakdown = candidate.score_breakdown or {}
         
         # Extract key information for personalization
         top_skills = skills[:3] if skills else []
@@ -205,12 +220,12 @@ Create a compelling, personalized message that highlights their specific qualifi
         
         return ' '.join(message_parts)
     
-    def _generate_fallback_message(self, candidate: Dict, job_description: str) -> str:
+    def _generate_fallback_message(self, candidate: Candidate, job: JobContext) -> str:
         """
         Generate a simple fallback message
         """
-        name = candidate.get('name', 'there')
-        headline = candidate.get('headline', '')
+        name = candidate.name or 'there'
+        headline = candidate.headline
         
         if name and name != 'there':
             first_name = name.split()[0]
@@ -223,11 +238,11 @@ Create a compelling, personalized message that highlights their specific qualifi
         
         return message
     
-    def generate_batch_messages(self, candidates: List[Dict], job_description: str) -> List[Dict]:
+    def generate_batch_messages(self, candidates: List[Candidate], job: Union[str, JobContext]) -> List[Candidate]:
         """
         Generate messages for multiple candidates efficiently
         """
-        return self.generate_outreach_messages(candidates, job_description)
+        return self.generate_outreach_messages(candidates, job)
     
     def _extract_job_title(self, job_description: str) -> str:
         """
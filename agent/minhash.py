@@ -0,0 +1,117 @@
+"""
+MinHash/LSH similarity index for spotting near-duplicate job descriptions
+"""
+import hashlib
+import random
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from cache_keys import normalize_job_description
+
+# Mersenne prime modulus for the (a * x + b) permutation family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _shingles(text: str, size: int) -> Set[str]:
+    """Word n-gram shingles of the normalized text; numbers are masked so salary edits don't matter"""
+    words = re.findall(r"[a-z0-9+#.]+", normalize_job_description(text))
+    words = ['#' if word.replace('.', '').isdigit() else word for word in words]
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _stable_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big') % _PRIME
+
+
+class MinHasher:
+    """Deterministic MinHash signatures (identical across processes and restarts)"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 2, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> List[int]:
+        hashes = [_stable_hash(shingle) for shingle in _shingles(text, self.shingle_size)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets"""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class JobSimilarityIndex:
+    """
+    Banded LSH over MinHash signatures of past job descriptions.
+    Candidates sharing at least one band bucket are verified against the
+    configured threshold, and lookups are counted as hits or misses.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = defaultdict(set)
+        self._signatures: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _bands(self, signature: List[int]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, key: str, signature: List[int]):
+        """Index a signature under a cache key, replacing any previous one"""
+        with self._lock:
+            old = self._signatures.get(key)
+            if old is not None:
+                for bucket in self._bands(old):
+                    self._buckets[bucket].discard(key)
+            self._signatures[key] = signature
+            for bucket in self._bands(signature):
+                self._buckets[bucket].add(key)
+
+    def query(self, signature: List[int], exclude: str = None) -> List[Tuple[str, float]]:
+        """Keys whose estimated similarity meets the threshold, best first"""
+        with self._lock:
+            candidates = set()
+            for bucket in self._bands(signature):
+                candidates.update(self._buckets.get(bucket, ()))
+            candidates.discard(exclude)
+            matches = [(key, MinHasher.similarity(signature, self._signatures[key])) for key in candidates]
+        matches = [(key, score) for key, score in matches if score >= self.threshold]
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def record_lookup(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "indexed_jobs": len(self._signatures),
+                "similarity_threshold": self.threshold,
+                "near_duplicate_hits": self.hits,
+                "near_duplicate_misses": self.misses,
+                "near_duplicate_hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
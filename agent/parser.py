@@ -3,58 +3,62 @@ Parse search results into candidate dictionaries with enriched data
 """
 import re
 import json
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from datetime import datetime
 import config
+from candidate import Candidate
+from enrichment_cache import EnrichmentCache
+from job_context import JobContext, as_job_context
+from keyword_matcher import get_keyword_matcher
+from profile_registry import ProfileRegistry, canonical_profile_url, get_profile_registry
+from skill_bitset import get_skill_vocabulary
+from vocabularies import SKILL_PATTERNS, vocabulary_hash
+
+# Bump whenever the headline extraction rules below change; vocabulary
+# edits are picked up automatically through vocabulary_hash()
+EXTRACTOR_VERSION = 1
+
+def extractor_version() -> str:
+    return f'{EXTRACTOR_VERSION}-{vocabulary_hash()[:12]}'
 
 class CandidateParser:
-    def __init__(self):
-        self.skill_patterns = {
-            'programming': [
-                'python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'swift', 'kotlin',
-                'typescript', 'php', 'ruby', 'scala', 'r', 'matlab', 'perl', 'bash', 'shell'
-            ],
-            'frameworks': [
-                'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
-                'laravel', 'rails', 'asp.net', 'fastapi', 'gin', 'echo', 'koa'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
-                'dynamodb', 'sqlite', 'oracle', 'sql server', 'neo4j', 'influxdb'
-            ],
-            'cloud': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-                'jenkins', 'gitlab', 'github actions', 'circleci', 'travis ci'
-            ],
-            'ml_ai': [
-                'machine learning', 'deep learning', 'ai', 'artificial intelligence',
-                'tensorflow', 'pytorch', 'scikit-learn', 'keras', 'opencv', 'numpy',
-                'pandas', 'matplotlib', 'seaborn', 'jupyter', 'spark', 'hadoop'
-            ],
-            'mobile': [
-                'ios', 'android', 'react native', 'flutter', 'xamarin', 'swift',
-                'kotlin', 'objective-c', 'xcode', 'android studio'
-            ]
-        }
+    def __init__(self, registry: ProfileRegistry = None, enrichment_cache: EnrichmentCache = None):
+        self.skill_patterns = SKILL_PATTERNS
+        # Fixed order so the skill list (and its top-10 cut) is deterministic
+        self._skill_order = list(dict.fromkeys(
+            skill for skill_list in SKILL_PATTERNS.values() for skill in skill_list
+        ))
+        self.registry = registry or get_profile_registry()
+        self.matcher = get_keyword_matcher()
+        self.skill_vocabulary = get_skill_vocabulary()
+        self.enrichment_cache = enrichment_cache or EnrichmentCache(extractor_version())
     
-    def parse_candidates(self, raw_profiles: List[Dict], job_description: str) -> List[Dict]:
+    def parse_candidates(self, raw_profiles: List[Dict], job: Union[str, JobContext]) -> List[Candidate]:
         """
         Parse and enrich candidate data from raw LinkedIn profiles
         """
-        enriched_candidates = []
-        
-        for profile in raw_profiles:
-            try:
-                enriched = self._enrich_candidate_data(profile, job_description)
-                if enriched:
-                    enriched_candidates.append(enriched)
-            except Exception as e:
-                print(f"Error parsing candidate {profile.get('name', 'Unknown')}: {e}")
-                continue
-        
-        return enriched_candidates
+        return list(self.iter_parse_candidates(raw_profiles, job))
     
-    def _enrich_candidate_data(self, profile: Dict, job_description: str) -> Optional[Dict]:
+    def iter_parse_candidates(self, raw_profiles: Iterable[Dict], job: Union[str, JobContext]) -> Iterator[Candidate]:
+        """
+        Lazily parse and enrich profiles, e.g. straight from
+        EnhancedLinkedInSearcher.iter_linkedin_profiles as pages arrive
+        (main.search_and_parse with SEARCH_STREAMING)
+        """
+        job = as_job_context(job)
+        try:
+            for profile in raw_profiles:
+                try:
+                    enriched = self._enrich_candidate_data(profile, job)
+                    if enriched:
+                        yield enriched
+                except Exception as e:
+                    print(f"Error parsing candidate {profile.get('name', 'Unknown')}: {e}")
+                    continue
+        finally:
+            self.enrichment_cache.flush()
+    
+    def _enrich_candidate_data(self, profile: Dict, job: JobContext) -> Optional[Candidate]:
         """
         Enrich candidate data with extracted information
         """
@@ -66,56 +70,74 @@ class CandidateParser:
         if not linkedin_url:
             return None
         
-        # Extract skills from headline and job description
-        skills = self._extract_skills(headline, job_description)
-        
-        # Extract experience level
-        experience_level = self._determine_experience_level(headline)
-        
-        # Extract education hints
-        education = self._extract_education_hints(headline)
+        linkedin_url = canonical_profile_url(linkedin_url)
+        # Only a profile seen before can have its enrichment persisted; the
+        # registry's Bloom filter spares new profiles that store lookup
+        seen_before = self.registry.seen(linkedin_url)
+        self.registry.add(linkedin_url)
         
-        # Extract company information
-        companies = self._extract_companies(headline)
+        # Headline-derived fields don't depend on the job, so a profile whose
+        # content is unchanged reuses them from the enrichment cache
+        headline_fields = self.enrichment_cache.get(headline, location, check_store=seen_before)
+        if headline_fields is None:
+            headline_fields = self._extract_headline_fields(headline)
+            self.enrichment_cache.put(headline, location, headline_fields)
         
-        # Calculate tenure estimate
-        tenure_estimate = self._estimate_tenure(headline)
-        
-        # Determine career trajectory
-        trajectory = self._analyze_career_trajectory(headline, companies)
-        
-        enriched_candidate = {
-            'name': name,
-            'linkedin_url': linkedin_url,
-            'headline': headline,
-            'location': location,
-            'skills': skills,
-            'experience_level': experience_level,
-            'education': education,
+        # Extract skills from headline and job description
+        skills = self._merge_skills(headline_fields['headline_skills'], job.skills)
+        
+        return Candidate(
+            name=name,
+            linkedin_url=linkedin_url,
+            headline=headline,
+            location=location,
+            skills=skills,
+            experience_level=headline_fields['experience_level'],
+            education=headline_fields['education'],
+            companies=headline_fields['companies'],
+            tenure_estimate=headline_fields['tenure_estimate'],
+            career_trajectory=headline_fields['career_trajectory'],
+            confidence=profile.get('confidence', 0.7),
+            parsed_at=datetime.now().isoformat(),
+            # Headline skills only, so the stored mask holds for any job; the
+            # scorer adds the skill terms above when it scores a job
+            skill_mask=headline_fields['skill_mask']
+        )
+    
+    def _extract_headline_fields(self, headline: str) -> Dict:
+        """
+        Job-independent enrichment computed from the headline alone
+        """
+        matches = self.matcher.find(headline)
+        companies = matches['headline_company']
+        return {
+            'headline_skills': self._skills_from_matches(matches),
+            'experience_level': self._determine_experience_level(headline),
+            'education': matches['education'],
             'companies': companies,
-            'tenure_estimate': tenure_estimate,
-            'career_trajectory': trajectory,
-            'confidence': profile.get('confidence', 0.7),
-            'parsed_at': datetime.now().isoformat()
+            'tenure_estimate': self._estimate_tenure(headline),
+            'career_trajectory': self._analyze_career_trajectory(headline, companies),
+            'skill_mask': self.skill_vocabulary.encode(matches['job_skill'])
         }
-        
-        return enriched_candidate
+    
+    def _match_skills(self, text: str) -> List[str]:
+        """Vocabulary skills mentioned in the text, in vocabulary order"""
+        return self._skills_from_matches(self.matcher.find(text))
+    
+    def _skills_from_matches(self, matches: Dict[str, List[str]]) -> List[str]:
+        matched = {skill for category in self.skill_patterns for skill in matches[f'skill:{category}']}
+        return [skill for skill in self._skill_order if skill in matched]
+    
+    def _merge_skills(self, headline_skills: List[str], job_skills: List[str]) -> List[str]:
+        """Union of headline and job skills in vocabulary order, top 10"""
+        matched = set(headline_skills) | set(job_skills)
+        return [skill for skill in self._skill_order if skill in matched][:10]
     
     def _extract_skills(self, headline: str, job_description: str) -> List[str]:
         """
         Extract skills from headline and job description
         """
-        skills = []
-        text_lower = (headline + ' ' + job_description).lower()
-        
-        for category, skill_list in self.skill_patterns.items():
-            for skill in skill_list:
-                if skill in text_lower:
-                    skills.append(skill)
-        
-        # Remove duplicates and return top skills
-        unique_skills = list(set(skills))
-        return unique_skills[:10]  # Limit to top 10 skills
+        return self._merge_skills(self._match_skills(headline), self._match_skills(job_description))
     
     def _determine_experience_level(self, headline: str) -> str:
         """
@@ -143,45 +165,6 @@ class CandidateParser:
         
         return 'unknown'
     
-    def _extract_education_hints(self, headline: str) -> List[str]:
-        """
-        Extract education hints from headline
-        """
-        education_keywords = [
-            'phd', 'doctorate', 'masters', 'ms', 'ma', 'bachelors', 'bs', 'ba',
-            'computer science', 'cs', 'engineering', 'mathematics', 'statistics'
-        ]
-        
-        found_education = []
-        headline_lower = headline.lower()
-        
-        for keyword in education_keywords:
-            if keyword in headline_lower:
-                found_education.append(keyword)
-        
-        return found_education
-    
-    def _extract_companies(self, headline: str) -> List[str]:
-        """
-        Extract company names from headline
-        """
-        # Common tech companies
-        tech_companies = [
-            'google', 'microsoft', 'apple', 'amazon', 'meta', 'facebook', 'netflix',
-            'uber', 'lyft', 'airbnb', 'twitter', 'linkedin', 'salesforce', 'oracle',
-            'ibm', 'intel', 'nvidia', 'amd', 'cisco', 'vmware', 'adobe', 'paypal',
-            'stripe', 'square', 'zoom', 'slack', 'dropbox', 'box', 'atlassian'
-        ]
-        
-        found_companies = []
-        headline_lower = headline.lower()
-        
-        for company in tech_companies:
-            if company in headline_lower:
-                found_companies.append(company)
-        
-        return found_companies
-    
     def _estimate_tenure(self, headline: str) -> str:
         """
         Estimate tenure based on headline keywords
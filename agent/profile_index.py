@@ -0,0 +1,170 @@
+"""
+In-memory inverted index over cached profiles for relevance-ranked fallback
+"""
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from keyword_matcher import get_keyword_matcher
+from profile_registry import profile_key
+from vocabularies import SKILL_PATTERNS
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'at', 'for', 'from', 'in', 'of', 'on', 'or', 'the', 'to', 'with',
+    'we', 'our', 'you', 'your', 'is', 'are', 'be', 'will', 'looking', 'seeking', 'role',
+    'experience', 'years', 'year', 'team', 'work', 'linkedin', 'unknown'
+}
+
+# Field weights: a shared skill counts for more than a shared headline word
+FIELD_WEIGHTS = {
+    'skill': 3.0,
+    'location': 2.0,
+    'term': 1.0
+}
+
+MAX_PHRASE_WORDS = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping things like c++, c# and node.js intact"""
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+def _phrases(tokens: List[str], max_words: int = MAX_PHRASE_WORDS) -> Iterable[str]:
+    for size in range(1, max_words + 1):
+        for i in range(len(tokens) - size + 1):
+            yield ' '.join(tokens[i:i + size])
+
+
+def normalize_location(location: str) -> Set[str]:
+    """Normalized location phrases: the full location plus each comma-separated part"""
+    parts = [' '.join(tokenize(part)) for part in (location or '').split(',')]
+    parts = [part for part in parts if part and part not in STOPWORDS]
+    keys = set(parts)
+    if len(parts) > 1:
+        keys.add(' '.join(parts))
+    return keys
+
+
+class ProfileIndex:
+    """
+    Inverted index keyed by field-qualified terms (headline tokens, skills,
+    normalized location). Queries are scored with field-weighted IDF so the
+    fallback pool returns the cached profiles most relevant to the job.
+    """
+
+    def __init__(self):
+        # Skills are found by the shared matcher, exactly as the parser finds them
+        self.matcher = get_keyword_matcher()
+        self.skill_categories = [f'skill:{category}' for category in SKILL_PATTERNS]
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._docs: Dict[int, Dict] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _skills(self, text: str) -> Set[str]:
+        matches = self.matcher.find(text)
+        return {skill for category in self.skill_categories for skill in matches[category]}
+
+    def _profile_terms(self, profile: Dict) -> Set[str]:
+        headline = profile.get('headline', '')
+        tokens = tokenize(headline)
+        terms = {f"term:{token}" for token in tokens if token not in STOPWORDS}
+        terms.update(f"skill:{skill}" for skill in self._skills(headline))
+        terms.update(f"location:{location}" for location in normalize_location(profile.get('location', '')))
+        return terms
+
+    def _query_terms(self, job_description: str) -> Set[str]:
+        tokens = tokenize(job_description)
+        terms = {f"term:{token}" for token in tokens if token not in STOPWORDS}
+        terms.update(f"skill:{skill}" for skill in self._skills(job_description))
+        terms.update(f"location:{phrase}" for phrase in _phrases(tokens)
+                     if f"location:{phrase}" in self._postings)
+        return terms
+
+    def add_profile(self, profile: Dict):
+        """Index a profile, replacing any earlier version of the same profile (canonical slug)"""
+        url = profile_key(profile)
+        if not url:
+            return
+
+        terms = self._profile_terms(profile)
+        with self._lock:
+            doc_id = self._doc_ids.get(url)
+            if doc_id is not None:
+                self._remove(doc_id)
+            doc_id = self._next_id
+            self._next_id += 1
+            self._doc_ids[url] = doc_id
+            self._docs[doc_id] = profile
+            self._doc_terms[doc_id] = terms
+            for term in terms:
+                self._postings[term].add(doc_id)
+
+    def add_profiles(self, profiles: Iterable[Dict]):
+        for profile in profiles:
+            self.add_profile(profile)
+
+    def _remove(self, doc_id: int):
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[term]
+        self._docs.pop(doc_id, None)
+
+    def search(self, job_description: Optional[str], limit: int,
+               predicate: Callable[[Dict], bool] = None) -> List[Dict]:
+        """
+        Return up to ``limit`` profiles ranked by relevance to the job.
+        Profiles with no matching terms fill any remaining slots, newest first.
+        """
+        # Only the postings lookup needs the lock; scoring runs on copies
+        matched = []
+        with self._lock:
+            if job_description:
+                total = len(self._docs)
+                for term in self._query_terms(job_description):
+                    postings = self._postings.get(term)
+                    if postings:
+                        weight = FIELD_WEIGHTS[term.split(':', 1)[0]] * math.log(1 + total / len(postings))
+                        matched.append((weight, tuple(postings)))
+
+        scores: Dict[int, float] = defaultdict(float)
+        for weight, doc_ids in matched:
+            for doc_id in doc_ids:
+                scores[doc_id] += weight
+
+        def eligible(doc_ids: Iterable[int]) -> Iterator[Tuple[int, Dict]]:
+            for doc_id in doc_ids:
+                # A profile re-indexed since the lookup is simply skipped
+                profile = self._docs.get(doc_id)
+                if profile is not None and (predicate is None or predicate(profile)):
+                    yield doc_id, profile
+
+        # Highest score first, ties newest first; a heap only pays off for a small limit
+        rank_key = lambda item: (scores[item[0]], item[0])
+        if limit < len(scores):
+            top = heapq.nlargest(limit, eligible(scores), key=rank_key)
+        else:
+            top = sorted(eligible(scores), key=rank_key, reverse=True)
+        results = [profile for _, profile in top]
+        if len(results) < limit:
+            with self._lock:
+                newest = list(reversed(self._docs))
+            for _, profile in eligible(doc_id for doc_id in newest if doc_id not in scores):
+                results.append(profile)
+                if len(results) >= limit:
+                    break
+        return results
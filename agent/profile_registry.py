@@ -0,0 +1,182 @@
+"""
+Process-wide registry of LinkedIn profiles seen in any job, keyed by the
+canonical profile slug and held in Bloom filters that grow with it
+"""
+import hashlib
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+_PROFILE_PATH = re.compile(r'/in/([^/?#]+)', re.IGNORECASE)
+
+
+def profile_slug(url: str) -> Optional[str]:
+    """
+    Normalized profile slug, or None if the URL is not a LinkedIn profile.
+    Scheme, ``www``/locale subdomains, trailing slashes, locale path suffixes,
+    query strings and letter case are all ignored.
+    """
+    if not url:
+        return None
+    parsed = urlparse(url if '://' in url else f'https://{url}')
+    host = parsed.netloc.lower().split(':')[0]
+    if host != 'linkedin.com' and not host.endswith('.linkedin.com'):
+        return None
+    match = _PROFILE_PATH.search(parsed.path)
+    if not match:
+        return None
+    slug = unquote(match.group(1)).strip().lower()
+    return slug or None
+
+
+def canonical_profile_url(url: str) -> str:
+    """``https://www.linkedin.com/in/<slug>``; non-profile URLs are returned unchanged"""
+    slug = profile_slug(url)
+    if slug is None:
+        return url
+    return f'https://www.linkedin.com/in/{quote(slug, safe="-_.~")}'
+
+
+def profile_key(profile: Dict) -> str:
+    """Deduplication key for a profile dict: its slug, or the raw URL for non-profile links"""
+    url = profile.get('linkedin_url', '') if profile else ''
+    return profile_slug(url) or url
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def hashes(key: str) -> Tuple[int, int]:
+        """The two base hashes of a key; any number of filters can reuse them"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+    def _positions(self, hashes: Tuple[int, int]) -> Iterable[int]:
+        h1, h2 = hashes
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str, hashes: Tuple[int, int] = None):
+        for position in self._positions(hashes or self.hashes(key)):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains(self, key: str, hashes: Tuple[int, int] = None) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(hashes or self.hashes(key)))
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains(key)
+
+
+class ProfileRegistry:
+    """
+    Remembers every profile slug seen by this process, so a profile that
+    shows up again in another job is recognized immediately.
+
+    Only Bloom filters are kept, no exact set: ``seen`` never misses a
+    profile that was added, and may report an unseen one as seen at about
+    ``error_rate``. Callers use it as a hint to look in the profile store,
+    where a false positive only costs one lookup. When the current filter
+    fills up a larger one is added (a scalable Bloom filter), with tighter
+    error rates so the combined rate stays under ``error_rate``.
+    """
+
+    # Each new filter holds GROWTH times more profiles at TIGHTENING times the error rate
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self._filters: List[BloomFilter] = [BloomFilter(max(1, capacity), error_rate * (1 - self.TIGHTENING))]
+        self._capacities = [max(1, capacity)]
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.bloom_negatives = 0
+
+    def add(self, url: str) -> Optional[str]:
+        """Mark a profile URL as seen; returns its slug"""
+        slug = profile_slug(url)
+        if slug is None:
+            return None
+        hashes = BloomFilter.hashes(slug)
+        with self._lock:
+            if not self._contains(slug, hashes):
+                if self._filters[-1].count >= self._capacities[-1]:
+                    self._grow()
+                self._filters[-1].add(slug, hashes)
+        return slug
+
+    def _grow(self):
+        capacity = self._capacities[-1] * self.GROWTH
+        error_rate = self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** len(self._filters)
+        self._filters.append(BloomFilter(capacity, error_rate))
+        self._capacities.append(capacity)
+
+    def _contains(self, slug: str, hashes: Tuple[int, int]) -> bool:
+        return any(bloom.contains(slug, hashes) for bloom in reversed(self._filters))
+
+    def add_many(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def seen(self, url: str) -> bool:
+        """True if the profile was added (or, rarely, is a Bloom false positive)"""
+        slug = profile_slug(url)
+        if slug is None:
+            return False
+        hashes = BloomFilter.hashes(slug)
+        with self._lock:
+            self.lookups += 1
+            if self._contains(slug, hashes):
+                return True
+            self.bloom_negatives += 1
+            return False
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'profiles_seen': sum(bloom.count for bloom in self._filters),
+                'lookups': self.lookups,
+                'bloom_negatives': self.bloom_negatives,
+                'bloom_filters': len(self._filters),
+                'bloom_bits': sum(bloom.size for bloom in self._filters),
+                'bloom_hashes': [bloom.hash_count for bloom in self._filters]
+            }
+
+
+def registry_for_store(store, headroom: float = 2.0) -> ProfileRegistry:
+    """Registry sized for the store's profiles plus room to grow, seeded with all of them"""
+    registry = ProfileRegistry(capacity=max(100000, math.ceil(store.count_profiles() * headroom)))
+    registry.add_many(store.iter_profile_urls())
+    return registry
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    """Process-wide registry, seeded with every profile already in the profile store"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                # Imported here: the store keys its rows with this module's helpers
+                from profile_store import get_profile_store
+                try:
+                    registry = registry_for_store(get_profile_store())
+                except Exception as e:
+                    print(f"Warning: Could not seed profile registry from store: {e}")
+                    registry = ProfileRegistry()
+                _registry = registry
+    return _registry
@@ -0,0 +1,505 @@
+"""
+Embedded SQLite store for cached search results and LinkedIn profiles
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+from cache_keys import CACHE_SCHEMA_VERSION, iter_cached_profiles
+from profile_registry import canonical_profile_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_url TEXT PRIMARY KEY,
+    name TEXT,
+    headline TEXT,
+    location TEXT,
+    data TEXT NOT NULL,
+    first_seen_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_updated_at ON profiles (updated_at);
+
+CREATE TABLE IF NOT EXISTS search_results (
+    cache_key TEXT PRIMARY KEY,
+    job_fingerprint TEXT,
+    job_description TEXT,
+    schema_version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    last_requested_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_search_results_expires_at ON search_results (expires_at);
+
+CREATE TABLE IF NOT EXISTS search_result_profiles (
+    cache_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    profile_url TEXT NOT NULL,
+    PRIMARY KEY (cache_key, position)
+);
+CREATE INDEX IF NOT EXISTS idx_search_result_profiles_url ON search_result_profiles (profile_url);
+
+CREATE TABLE IF NOT EXISTS job_signatures (
+    cache_key TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS enrichments (
+    cache_key TEXT PRIMARY KEY,
+    extractor_version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enrichments_version ON enrichments (extractor_version, updated_at);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Set afresh on every parse; a record differing only here changes nothing
+_VOLATILE_FIELDS = {'parsed_at'}
+
+
+class ProfileStore:
+    """
+    Transactional store for search results and profiles.
+
+    Every write is a per-key upsert inside a short ``BEGIN IMMEDIATE``
+    transaction, so its cost is proportional to the new data only, and WAL
+    mode lets concurrent requests and uvicorn workers read while one writes.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or config.PROFILE_STORE_FILE
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements):
+        """Run (sql, params) pairs in one immediate transaction"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                if isinstance(params, list):
+                    conn.executemany(sql, params)
+                else:
+                    conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _initialize(self):
+        """Create the schema and import legacy cache.json files that changed since the last import"""
+        with self._init_lock:
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'canonical_profile_keys'").fetchone()
+            if row is None:
+                self._canonicalize_profile_keys()
+            self._import_legacy_caches()
+
+    def _canonicalize_profile_keys(self):
+        """
+        Re-key profiles stored under raw URLs by older versions: all rows of
+        one profile are merged, oldest first, into its canonical row and
+        search results are pointed at it
+        """
+        conn = self._connect()
+        groups: Dict[str, List[tuple]] = {}
+        for row in conn.execute("SELECT profile_url, data FROM profiles ORDER BY updated_at, rowid"):
+            groups.setdefault(canonical_profile_url(row['profile_url']), []).append(
+                (row['profile_url'], json.loads(row['data'])))
+
+        merged = []
+        old_urls = []
+        for url, rows in groups.items():
+            if all(old_url == url for old_url, _ in rows):
+                continue
+            profile = {}
+            for old_url, data in rows:
+                profile.update(data)
+                old_urls.append((old_url, url))
+            profile['linkedin_url'] = url
+            merged.append(profile)
+
+        statements = []
+        if merged:
+            statements = [
+                ("DELETE FROM profiles WHERE profile_url = ?", [(old_url,) for old_url, _ in old_urls]),
+                (self._UPSERT_PROFILE, self._profile_rows(merged)),
+                ("UPDATE search_result_profiles SET profile_url = ? WHERE profile_url = ?",
+                 [(url, old_url) for old_url, url in old_urls if old_url != url])
+            ]
+        statements.append((
+            "INSERT INTO store_meta (key, value) VALUES ('canonical_profile_keys', ?) "
+            "ON CONFLICT(key) DO NOTHING",
+            (str(time.time()),)
+        ))
+        self._write(statements)
+
+    def _import_legacy_caches(self):
+        """
+        Merge cache.json files (written by older versions and the setup
+        scripts) into the profile pool. Each file's mtime and size are kept
+        in store_meta, so a file is read again only after it changes.
+        """
+        agent_dir = os.path.dirname(os.path.abspath(__file__))
+        candidates = {os.path.join(agent_dir, 'cache.json'), os.path.abspath(config.CACHE_FILE)}
+        conn = self._connect()
+        profiles = []
+        statements = []
+        for path in sorted(candidates):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            meta_key = f'legacy_cache:{path}'
+            signature = f'{stat.st_mtime_ns}:{stat.st_size}'
+            row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (meta_key,)).fetchone()
+            if row is not None and row['value'] == signature:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    profiles.extend(iter_cached_profiles(json.load(f)))
+            except Exception as e:
+                print(f"Warning: Could not import legacy cache {path}: {e}")
+                continue
+            statements.append((
+                "INSERT INTO store_meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (meta_key, signature)
+            ))
+
+        if not statements:
+            return
+        rows = self._profile_rows(profiles)
+        if rows:
+            statements.insert(0, (self._UPSERT_PROFILE, rows))
+        self._write(statements)
+
+        if config.DEBUG and rows:
+            print(f"Imported {len(rows)} profiles from legacy cache.json into {self.db_path}")
+
+    # Merges into the stored record (json_patch), so a partial result such as
+    # a search hit never wipes fields an earlier bulk ingest or search added
+    _UPSERT_PROFILE = (
+        "INSERT INTO profiles (profile_url, name, headline, location, data, first_seen_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(profile_url) DO UPDATE SET "
+        "name = COALESCE(excluded.name, profiles.name), "
+        "headline = COALESCE(excluded.headline, profiles.headline), "
+        "location = COALESCE(excluded.location, profiles.location), "
+        "data = json_patch(profiles.data, excluded.data), updated_at = excluded.updated_at"
+    )
+
+    def _profile_rows(self, profiles: List[Dict]) -> List[tuple]:
+        now = time.time()
+        rows = []
+        for profile in profiles:
+            url = profile.get('linkedin_url')
+            if not url:
+                continue
+            # Keyed by the canonical URL, so every spelling of a profile's
+            # link (locale subdomain, trailing slash, case) is one row
+            url = canonical_profile_url(url)
+            # Missing values are left out so they can't overwrite stored ones
+            # (a JSON null in a json_patch would even delete the stored field)
+            data = {key: value for key, value in profile.items() if value is not None and value != ''}
+            data['linkedin_url'] = url
+            rows.append((
+                url,
+                data.get('name'),
+                data.get('headline'),
+                data.get('location'),
+                json.dumps(data),
+                now,
+                now
+            ))
+        return rows
+
+    def _changed_rows(self, rows: List[tuple], known: Callable[[str], bool] = None) -> List[tuple]:
+        """
+        Drop rows that would not change their stored profile. Only profiles
+        ``known`` reports as seen before are looked up; the rest are new and
+        written without a read.
+        """
+        if known is None:
+            return rows
+        urls = [row[0] for row in rows if known(row[0])]
+        if not urls:
+            return rows
+        conn = self._connect()
+        stored = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            for row in conn.execute(
+                f"SELECT profile_url, data FROM profiles WHERE profile_url IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ):
+                stored[row['profile_url']] = json.loads(row['data'])
+
+        changed = []
+        for row in rows:
+            current = stored.get(row[0])
+            if current is None or any(current.get(key) != value for key, value in json.loads(row[4]).items()
+                                      if key not in _VOLATILE_FIELDS):
+                changed.append(row)
+        return changed
+
+    def save_profiles(self, profiles: List[Dict], known: Callable[[str], bool] = None) -> int:
+        """
+        Upsert profiles that don't belong to a search result set; returns how
+        many were written. With ``known`` (e.g. ``ProfileRegistry.seen``),
+        profiles seen before whose stored record already holds every field
+        are left untouched.
+        """
+        rows = self._changed_rows(self._profile_rows(profiles), known)
+        if rows:
+            self._write([(self._UPSERT_PROFILE, rows)])
+        return len(rows)
+
+    def get_search_results(self, cache_key: str, include_expired: bool = False) -> Optional[List[Dict]]:
+        """Return the profiles cached under cache_key, or None if missing or expired"""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT expires_at FROM search_results WHERE cache_key = ? AND schema_version = ?",
+            (cache_key, CACHE_SCHEMA_VERSION)
+        ).fetchone()
+        if row is None or (not include_expired and row['expires_at'] < time.time()):
+            return None
+
+        rows = conn.execute(
+            "SELECT p.data FROM search_result_profiles r "
+            "JOIN profiles p ON p.profile_url = r.profile_url "
+            "WHERE r.cache_key = ? ORDER BY r.position",
+            (cache_key,)
+        ).fetchall()
+        return [json.loads(r['data']) for r in rows]
+
+    def save_search_results(self, cache_key: str, profiles: List[Dict], job_description: str = None,
+                            job_fingerprint: str = None, ttl_hours: float = None,
+                            known: Callable[[str], bool] = None):
+        """
+        Upsert one search result set and its profiles in a single
+        transaction; ``known`` skips unchanged profiles as in save_profiles
+        """
+        if ttl_hours is None:
+            ttl_hours = config.CACHE_DURATION_HOURS
+        now = time.time()
+        rows = self._profile_rows(profiles)
+
+        self._write([
+            (self._UPSERT_PROFILE, self._changed_rows(rows, known)),
+            (
+                "INSERT INTO search_results "
+                "(cache_key, job_fingerprint, job_description, schema_version, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET "
+                "job_fingerprint = excluded.job_fingerprint, job_description = excluded.job_description, "
+                "schema_version = excluded.schema_version, created_at = excluded.created_at, "
+                "expires_at = excluded.expires_at",
+                (cache_key, job_fingerprint, job_description, CACHE_SCHEMA_VERSION, now, now + ttl_hours * 3600)
+            ),
+            ("DELETE FROM search_result_profiles WHERE cache_key = ?", (cache_key,)),
+            (
+                "INSERT INTO search_result_profiles (cache_key, position, profile_url) VALUES (?, ?, ?)",
+                [(cache_key, position, row[0]) for position, row in enumerate(rows)]
+            )
+        ])
+
+    def record_request(self, cache_key: str):
+        """Count a request for cache_key; drives which stale entries the cache warmer refreshes"""
+        now = time.time()
+        self._write([
+            ("UPDATE search_results SET hit_count = hit_count + 1, last_requested_at = ? WHERE cache_key = ?",
+             (now, cache_key)),
+            self._activity_statement(now)
+        ])
+
+    def record_activity(self):
+        """Note that some process is serving traffic right now"""
+        self._write([self._activity_statement(time.time())])
+
+    def _activity_statement(self, now: float) -> Tuple[str, Tuple]:
+        return (
+            "INSERT INTO store_meta (key, value) VALUES ('last_request_at', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (now,)
+        )
+
+    def last_request_at(self) -> Optional[float]:
+        """Wall-clock time of the latest request seen by any process sharing this store"""
+        row = self._connect().execute("SELECT value FROM store_meta WHERE key = 'last_request_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def get_refresh_candidates(self, limit: int, refresh_ahead_hours: float = 0,
+                               requested_within_hours: float = None) -> List[Dict]:
+        """
+        Most-requested entries that are stale (or expire within
+        refresh_ahead_hours) and were requested within requested_within_hours
+        """
+        now = time.time()
+        sql = (
+            "SELECT cache_key, job_description, hit_count, expires_at FROM search_results "
+            "WHERE schema_version = ? AND job_description IS NOT NULL AND hit_count > 0 AND expires_at < ?"
+        )
+        params = [CACHE_SCHEMA_VERSION, now + refresh_ahead_hours * 3600]
+        if requested_within_hours is not None:
+            sql += " AND last_requested_at >= ?"
+            params.append(now - requested_within_hours * 3600)
+        sql += " ORDER BY hit_count DESC, last_requested_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Take or renew a named lease shared by every process using this store;
+        True if ``owner`` holds it. A lease nobody renews expires after
+        ``ttl_seconds``, so another process takes over from one that died.
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value "
+                "WHERE json_extract(store_meta.value, '$.owner') = ? "
+                "OR json_extract(store_meta.value, '$.expires_at') < ?",
+                (f'lease:{name}', json.dumps({'owner': owner, 'expires_at': now + ttl_seconds}), owner, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount > 0
+
+    def release_lease(self, name: str, owner: str):
+        """Give up a lease held by ``owner`` so another process can take it at once"""
+        self._write([(
+            "DELETE FROM store_meta WHERE key = ? AND json_extract(value, '$.owner') = ?",
+            (f'lease:{name}', owner)
+        )])
+
+    def save_job_signature(self, cache_key: str, signature: List[int]):
+        """Upsert the MinHash signature of the job description behind cache_key"""
+        self._write([(
+            "INSERT INTO job_signatures (cache_key, signature, created_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(cache_key) DO UPDATE SET signature = excluded.signature, created_at = excluded.created_at",
+            (cache_key, json.dumps(signature), time.time())
+        )])
+
+    def iter_job_signatures(self) -> Iterator[tuple]:
+        """Yield (cache_key, signature) for every stored job description"""
+        for row in self._connect().execute("SELECT cache_key, signature FROM job_signatures"):
+            yield row['cache_key'], json.loads(row['signature'])
+
+    def save_enrichments(self, extractor_version: str, entries: Dict[str, Dict]):
+        """Upsert headline enrichments computed by the given extractor version"""
+        now = time.time()
+        self._write([(
+            "INSERT INTO enrichments (cache_key, extractor_version, data, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(cache_key) DO UPDATE SET extractor_version = excluded.extractor_version, "
+            "data = excluded.data, updated_at = excluded.updated_at",
+            [(key, extractor_version, json.dumps(data), now) for key, data in entries.items()]
+        )])
+
+    def iter_enrichments(self, extractor_version: str, limit: int) -> Iterator[tuple]:
+        """Yield (cache_key, data) for the most recent enrichments of this extractor version"""
+        for row in self._connect().execute(
+            "SELECT cache_key, data FROM enrichments WHERE extractor_version = ? "
+            "ORDER BY updated_at DESC LIMIT ?",
+            (extractor_version, limit)
+        ):
+            yield row['cache_key'], json.loads(row['data'])
+
+    def get_enrichment(self, cache_key: str, extractor_version: str) -> Optional[Dict]:
+        """Indexed lookup of one enrichment computed by the given extractor version"""
+        row = self._connect().execute(
+            "SELECT data FROM enrichments WHERE cache_key = ? AND extractor_version = ?",
+            (cache_key, extractor_version)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def delete_stale_enrichments(self, extractor_version: str) -> int:
+        """Drop enrichments computed by any other extractor version"""
+        conn = self._connect()
+        stale = conn.execute(
+            "SELECT COUNT(*) FROM enrichments WHERE extractor_version != ?", (extractor_version,)
+        ).fetchone()[0]
+        if stale:
+            self._write([("DELETE FROM enrichments WHERE extractor_version != ?", (extractor_version,))])
+        return stale
+
+    def get_profile(self, profile_url: str) -> Optional[Dict]:
+        """Indexed lookup of a single stored profile"""
+        row = self._connect().execute(
+            "SELECT data FROM profiles WHERE profile_url = ?", (canonical_profile_url(profile_url),)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def count_profiles(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def iter_profile_urls(self) -> Iterator[str]:
+        """Yield the canonical URL of every stored profile without decoding its data"""
+        for row in self._connect().execute("SELECT profile_url FROM profiles"):
+            yield row['profile_url']
+
+    def iter_profiles(self, limit: int = None) -> Iterator[Dict]:
+        """Yield stored profiles, most recently updated first"""
+        sql = "SELECT data FROM profiles ORDER BY updated_at DESC, rowid DESC"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        for row in self._connect().execute(sql, params):
+            yield json.loads(row['data'])
+
+    def get_stats(self) -> Dict:
+        """Row counts for diagnostics"""
+        conn = self._connect()
+        now = time.time()
+        return {
+            "profiles": conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0],
+            "search_results": conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0],
+            "fresh_search_results": conn.execute(
+                "SELECT COUNT(*) FROM search_results WHERE expires_at >= ?", (now,)
+            ).fetchone()[0]
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Process-wide ProfileStore shared by all searchers"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProfileStore()
+    return _store
@@ -0,0 +1,153 @@
+"""
+Budgeted search query planning: rank candidate queries by expected yield
+and record what was actually issued for each job
+"""
+import math
+import threading
+from typing import Dict, List
+
+import config
+
+# Prior share of a query's requested results that turn out to be new unique
+# profiles, per query kind. Replaced by observed yields as jobs run.
+PRIOR_YIELD = {
+    'skills_location': 0.55,
+    'skills': 0.5,
+    'skill_company': 0.35,
+    'skill': 0.3,
+    'location': 0.25,
+    'broad': 0.15
+}
+
+
+class PlannedQuery:
+    """One candidate query and what happened when it was issued"""
+
+    def __init__(self, query: str, kind: str, expected_yield: float):
+        self.query = query
+        self.kind = kind
+        self.expected_yield = expected_yield
+        self.num = 0
+        self.pages = 0
+        self.returned = None
+        self.new_profiles = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'query': self.query,
+            'kind': self.kind,
+            'expected_yield': round(self.expected_yield, 3),
+            'num': self.num,
+            'pages': self.pages,
+            'returned': self.returned,
+            'new_profiles': self.new_profiles
+        }
+
+
+class QueryPlan:
+    """Ranked queries for one job, the request budget and the outcome"""
+
+    def __init__(self, queries: List[PlannedQuery], budget: int, target: int, skipped: int = 0):
+        self.queries = queries
+        self.budget = budget
+        self.target = target
+        self.skipped = skipped
+        self.stop_reason = None
+        self.unique_profiles = 0
+
+    @property
+    def issued(self) -> List[PlannedQuery]:
+        return [query for query in self.queries if query.returned is not None]
+
+    def to_dict(self) -> Dict:
+        issued = self.issued
+        return {
+            'target_profiles': self.target,
+            'request_budget': self.budget,
+            'requests_issued': sum(query.pages for query in issued),
+            'unique_profiles': self.unique_profiles,
+            'stop_reason': self.stop_reason,
+            'queries_over_budget': self.skipped,
+            'queries': [query.to_dict() for query in self.queries]
+        }
+
+
+class QueryPlanner:
+    """
+    Builds ranked, budgeted query plans and learns per-kind yields.
+
+    Each query asks for enough results to fill what is still missing (with
+    some over-fetch for non-profile hits and duplicates), so a single
+    large-``num`` request is preferred to several small ones; later queries
+    only run while the job is still short of its target.
+    """
+
+    def __init__(self, budget: int = None, max_page_size: int = None, overfetch: float = None,
+                 smoothing: float = 0.3):
+        self.budget = budget or config.SEARCH_QUERY_BUDGET
+        self.max_page_size = max_page_size or config.SEARCH_MAX_PAGE_SIZE
+        self.overfetch = overfetch or config.SEARCH_OVERFETCH
+        self.smoothing = smoothing
+        self._yields: Dict[str, float] = dict(PRIOR_YIELD)
+        self._lock = threading.Lock()
+
+    def plan(self, keyword_groups: Dict[str, List[str]], target: int) -> QueryPlan:
+        """Rank the candidate queries for a job and cut them to the request budget"""
+        candidates = self._candidate_queries(keyword_groups)
+        with self._lock:
+            ranked = [PlannedQuery(query, kind, self._yields.get(kind, 0.1)) for query, kind in candidates]
+        # Stable sort keeps generation order (most specific first) between equal yields
+        ranked.sort(key=lambda planned: -planned.expected_yield)
+        return QueryPlan(ranked[:self.budget], self.budget, target, skipped=max(0, len(ranked) - self.budget))
+
+    def page_size(self, missing: int) -> int:
+        """Results to request from one query when ``missing`` profiles are still needed"""
+        return max(10, min(self.max_page_size, math.ceil(missing * self.overfetch)))
+
+    def record(self, planned: PlannedQuery, returned: int, new_profiles: int):
+        """Add one result page to a query's outcome and fold its yield into the per-kind estimate"""
+        planned.pages += 1
+        planned.returned = (planned.returned or 0) + returned
+        planned.new_profiles = (planned.new_profiles or 0) + new_profiles
+        if not planned.num:
+            return
+        observed = new_profiles / planned.num
+        with self._lock:
+            previous = self._yields.get(planned.kind, observed)
+            self._yields[planned.kind] = (1 - self.smoothing) * previous + self.smoothing * observed
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'request_budget': self.budget,
+                'max_page_size': self.max_page_size,
+                'expected_yield': {kind: round(value, 3) for kind, value in self._yields.items()}
+            }
+
+    def _candidate_queries(self, keyword_groups: Dict[str, List[str]]) -> List[tuple]:
+        skills = keyword_groups.get('skills', [])
+        locations = keyword_groups.get('locations', [])
+        companies = keyword_groups.get('companies', [])
+        prefix = f'site:{config.LINKEDIN_DOMAIN}'
+
+        candidates = []
+        if len(skills) >= 2:
+            candidates.append((f'{prefix} {skills[0]} {skills[1]}', 'skills'))
+        if skills and locations:
+            candidates.append((f'{prefix} {skills[0]} {locations[0]}', 'skills_location'))
+        if skills and companies:
+            candidates.append((f'{prefix} {skills[0]} {companies[0]}', 'skill_company'))
+        for skill in skills[:3]:
+            candidates.append((f'{prefix} {skill}', 'skill'))
+        for location in locations[:2]:
+            candidates.append((f'{prefix} {location}', 'location'))
+        if not candidates:
+            candidates.append((f'{prefix} software engineer', 'broad'))
+
+        seen = set()
+        unique = []
+        for query, kind in candidates:
+            if query.lower() not in seen:
+                seen.add(query.lower())
+                unique.append((query, kind))
+        return unique
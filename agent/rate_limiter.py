@@ -0,0 +1,126 @@
+"""
+Adaptive token-bucket rate limiting for outbound provider calls
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a provider answers with HTTP 429"""
+
+    def __init__(self, message: str = "Rate limited by provider", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to a provider.
+
+    The refill rate starts at ``rate_per_minute`` and adapts to throttling:
+    a 429 halves it and blocks the bucket until the provider's Retry-After has
+    passed, and each successful call restores a tenth of the configured rate.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 min_rate_per_minute: float = 1.0, default_backoff_seconds: float = 5.0):
+        self.max_rate = max(float(rate_per_minute), min_rate_per_minute) / 60.0
+        self.min_rate = min_rate_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = float(capacity) if capacity else max(1.0, float(rate_per_minute))
+        self.default_backoff_seconds = default_backoff_seconds
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttle_events = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available right now, without waiting"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return False
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available; returns False if timeout expires first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return True
+                    wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Back off after a provider 429"""
+        delay = retry_after if retry_after is not None else self.default_backoff_seconds
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Keep a single token so one probe goes out as soon as the block lifts
+            self._tokens = min(self._tokens, 1.0)
+            self._last_refill = max(now, self._blocked_until)
+            self.throttle_events += 1
+
+    def record_success(self):
+        """Additively restore the refill rate after a successful call"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def get_status(self) -> dict:
+        """Snapshot of the limiter state for diagnostics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_minute": round(self.rate * 60, 2),
+                "configured_rate_per_minute": round(self.max_rate * 60, 2),
+                "tokens_available": round(self._tokens, 2),
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+                "throttle_events": self.throttle_events
+            }
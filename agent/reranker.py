@@ -0,0 +1,143 @@
+"""
+Re-rank a job's scored candidate pool under new rubric weights, reusing the
+stored score breakdowns instead of searching, parsing and scoring again
+"""
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import config
+from batch_scorer import CandidateFeatures
+from candidate import SCORE_CATEGORIES, Candidate
+from job_context import JobContext
+
+
+def normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    """
+    Validate custom weights and return them in rubric order, scaled to sum
+    to 1 so fit scores stay on the 1-10 scale. Missing categories weigh 0.
+    Raises ValueError for unknown categories or unusable values.
+    """
+    unknown = sorted(set(weights) - set(SCORE_CATEGORIES))
+    if unknown:
+        raise ValueError(f"Unknown score categories: {', '.join(unknown)}")
+    if any(not math.isfinite(weight) for weight in weights.values()):
+        raise ValueError("Weights must be finite numbers")
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Weights must not be negative")
+    ordered = {category: float(weights.get(category, 0.0)) for category in SCORE_CATEGORIES}
+    total = sum(ordered.values())
+    if not math.isfinite(total):
+        raise ValueError("Weights are too large")
+    if total <= 0:
+        raise ValueError("At least one weight must be positive")
+    if abs(total - 1.0) > 1e-9:
+        ordered = {category: weight / total for category, weight in ordered.items()}
+    return ordered
+
+
+class ScoredPool:
+    """
+    Every candidate scored for a job, with any outreach message already
+    written. Re-ranking only recomputes weighted fit scores from the score
+    breakdowns; candidates that enter the top K for the first time get a
+    rule-based message, so no search, parse or LLM call is ever made.
+
+    Building a pool costs nothing on the request path: breakdowns are
+    collected on the first rerank, and only candidates that top-K scoring
+    left without one (the tail of a large pool) are scored then.
+    """
+
+    def __init__(self, candidates: List[Candidate], job: JobContext, scorer, top_k: int):
+        self.job = job
+        self.scorer = scorer
+        self.top_k = top_k
+        self.candidates = list(candidates)
+        # Rule breakdowns as scored so far, before any AI rescoring of the
+        # shortlist replaces them (a reference per candidate, no copying)
+        self._rule_breakdowns = None if self._large() else [
+            candidate.score_breakdown for candidate in self.candidates]
+        self._breakdowns = None
+        self._lock = threading.Lock()
+
+    def _large(self) -> bool:
+        return (self.scorer.batch_scorer is not None
+                and len(self.candidates) >= config.BATCH_SCORING_MIN_CANDIDATES)
+
+    def _get_breakdowns(self):
+        """
+        Score breakdown of every candidate: an (n, 6) array for pools the
+        vectorized engine handles, otherwise a list of breakdown dicts
+        """
+        if self._breakdowns is None:
+            if self._large():
+                features = CandidateFeatures(self.candidates, self.scorer)
+                self._breakdowns, _ = self.scorer.batch_scorer.score_matrix(features, self.job)
+            else:
+                unscored = [candidate for candidate, breakdown in zip(self.candidates, self._rule_breakdowns)
+                            if breakdown is None]
+                if unscored:
+                    self.scorer.score_candidates(unscored, self.job)
+                self._breakdowns = [candidate.score_breakdown if breakdown is None else breakdown
+                                    for candidate, breakdown in zip(self.candidates, self._rule_breakdowns)]
+                self._rule_breakdowns = None
+        return self._breakdowns
+
+    def rerank(self, weights: Dict[str, float], messenger,
+               top_k: Optional[int] = None) -> Tuple[List[Tuple[Candidate, float, Dict[str, float]]], int]:
+        """
+        Top ``top_k`` candidates under ``weights`` as (candidate, fit score,
+        score breakdown), ties keeping pool order; also returns how many
+        were new to the top K
+        """
+        top_k = top_k or self.top_k
+        with self._lock:
+            breakdowns = self._get_breakdowns()
+
+        if isinstance(breakdowns, list):
+            fit_scores = [self.scorer._calculate_weighted_score(breakdown, weights) for breakdown in breakdowns]
+            rows = heapq.nlargest(top_k, range(len(fit_scores)), key=fit_scores.__getitem__)
+            ranked = [(self.candidates[row], fit_scores[row], breakdowns[row]) for row in rows]
+        else:
+            batch_scorer = self.scorer.batch_scorer
+            fit_scores = batch_scorer.weighted_fit_scores(breakdowns, weights)
+            rows = batch_scorer.rank(fit_scores, top_k)
+            ranked = [(self.candidates[row], fit_score, dict(zip(SCORE_CATEGORIES, scores)))
+                      for row, fit_score, scores in zip(rows.tolist(), fit_scores[rows].tolist(),
+                                                        breakdowns[rows].tolist())]
+
+        with self._lock:
+            newcomers = [entry for entry in ranked if not entry[0].outreach_message]
+            # Messages quote the score, so newcomers carry their reweighted one
+            for candidate, fit_score, breakdown in newcomers:
+                candidate.fit_score = fit_score
+                candidate.score_breakdown = breakdown
+            if newcomers:
+                messenger.generate_outreach_messages([entry[0] for entry in newcomers], self.job, use_ai=False)
+
+        return ranked, len(newcomers)
+
+
+class PoolStore:
+    """Most recent job pools, bounded so stored pools can't grow without limit"""
+
+    def __init__(self, max_pools: int = None):
+        self.max_pools = max_pools or config.RERANK_MAX_POOLS
+        self._pools: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, job_id: str, pool: ScoredPool):
+        with self._lock:
+            self._pools[job_id] = pool
+            self._pools.move_to_end(job_id)
+            while len(self._pools) > self.max_pools:
+                self._pools.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[ScoredPool]:
+        with self._lock:
+            return self._pools.get(job_id)
+
+    def __len__(self) -> int:
+        return len(self._pools)
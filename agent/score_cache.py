@@ -0,0 +1,97 @@
+"""
+Memory-capped LRU cache of candidate scores keyed by candidate content, job
+and rubric, so repeated requests against the same job skip scoring
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import config
+from candidate import SCORE_CATEGORIES, Candidate
+
+# OrderedDict link + hash table slot per entry, on top of the key and value objects
+_ENTRY_OVERHEAD = 104
+
+ScoreEntry = Tuple[float, Tuple[float, ...]]
+
+
+def candidate_fingerprint(candidate: Candidate) -> bytes:
+    """Digest of every candidate field the scorer reads"""
+    # repr keeps None and '' apart (a None field fails scoring, an empty one doesn't)
+    content = repr((candidate.headline, candidate.location, candidate.skills,
+                    candidate.education, candidate.companies, candidate.skill_mask))
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _entry_size(key: Tuple, value: ScoreEntry) -> int:
+    return (_ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(key[0])
+            + sys.getsizeof(value) + sys.getsizeof(value[1]) + 24 * (1 + len(value[1])))
+
+
+class ScoreCache:
+    """
+    Maps (candidate fingerprint, job fingerprint, rubric version) to the
+    fit score and per-dimension breakdown.
+
+    The rubric version is a digest of the scorer's weights and rule code
+    (see ``CandidateScorer.rubric_version``), so changing either simply
+    stops old entries from matching and the LRU ages them out. The cache
+    is bounded by an estimate of its memory use rather than an entry count.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = config.SCORE_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(candidate: Candidate, job_fingerprint: str, rubric_version: str) -> Tuple:
+        return (candidate_fingerprint(candidate), job_fingerprint, rubric_version)
+
+    def get(self, key: Tuple) -> Optional[ScoreEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, fit_score: float, score_breakdown: Dict[str, float]):
+        entry = (fit_score, tuple(score_breakdown[category] for category in SCORE_CATEGORIES))
+        size = _entry_size(key, entry)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= _entry_size(key, previous)
+            self._entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self.bytes -= _entry_size(old_key, old_entry)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions
+            }
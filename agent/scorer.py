@@ -2,11 +2,31 @@
 Enhanced Fit Score Logic for Synapse Hackathon
 Follows the exact scoring rubric provided in the challenge
 """
+import hashlib
+import heapq
 import re
 import json
-from typing import Dict, List, Tuple
+import types
+from typing import Dict, List, Optional, Tuple, Union
 import google.generativeai as genai
 import config
+from batch_scorer import BatchScorer, np
+from candidate import SCORE_CATEGORIES, Candidate, as_candidate
+from job_context import JobContext, as_job_context
+from keyword_matcher import get_keyword_matcher
+from score_cache import ScoreCache
+from skill_bitset import get_skill_vocabulary, skill_overlap
+from vocabularies import vocabulary_hash
+
+def _update_code_digest(digest, code: types.CodeType):
+    """Hash a function's bytecode, names and constants (nested code objects included)"""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_digest(digest, const)
+        else:
+            digest.update(repr(const).encode('utf-8'))
 
 class CandidateScorer:
     def __init__(self):
@@ -25,43 +45,90 @@ class CandidateScorer:
             'tenure': 0.10          # 10%
         }
         
-        # Elite schools for education scoring
-        self.elite_schools = {
-            'mit', 'stanford', 'harvard', 'caltech', 'berkeley', 'uc berkeley',
-            'carnegie mellon', 'cmu', 'princeton', 'yale', 'columbia', 'upenn',
-            'cornell', 'brown', 'dartmouth', 'duke', 'northwestern', 'georgia tech',
-            'gatech', 'university of michigan', 'ucla', 'usc', 'university of illinois',
-            'uiuc', 'university of texas', 'ut austin', 'university of washington',
-            'uw', 'university of wisconsin', 'university of maryland', 'umd'
-        }
+        # Skill, location, school and company vocabularies in one compiled pattern
+        self.matcher = get_keyword_matcher()
+        self.skill_vocabulary = get_skill_vocabulary()
         
-        # Top tech companies for company scoring
-        self.top_tech_companies = {
-            'google', 'alphabet', 'microsoft', 'apple', 'amazon', 'meta', 'facebook',
-            'netflix', 'tesla', 'nvidia', 'intel', 'amd', 'oracle', 'salesforce',
-            'adobe', 'paypal', 'stripe', 'square', 'airbnb', 'uber', 'lyft',
-            'twitter', 'linkedin', 'github', 'spotify', 'slack', 'zoom', 'dropbox',
-            'palantir', 'databricks', 'snowflake', 'mongodb', 'elastic', 'confluent',
-            'hashicorp', 'gitlab', 'atlassian', 'jira', 'confluence', 'notion',
-            'figma', 'canva', 'discord', 'twitch', 'roblox', 'unity', 'epic games'
-        }
+        # Vectorized engine for large pools (needs numpy)
+        self.batch_scorer = BatchScorer(self) if np is not None else None
+        
+        # Scores of candidates already seen for a job under the same rubric
+        self.score_cache = ScoreCache() if config.SCORE_CACHE_MAX_MB > 0 else None
+        self._rules_digest = None
     
-    def score_candidates(self, candidates: List[Dict], job_description: str) -> List[Dict]:
+    def rubric_version(self, weights: Dict[str, float] = None) -> str:
         """
-        Score all candidates and return sorted results
+        Digest of the weights, the vocabularies and the code of every scoring
+        rule, so editing a weight or a rubric table changes it automatically
         """
+        if self._rules_digest is None:
+            digest = hashlib.sha256(vocabulary_hash().encode('utf-8'))
+            for rule in (self._score_education_text, self._score_headline_trajectory,
+                         self._score_companies_text, self._score_skills_match_enhanced,
+                         self._score_location_text, self._score_tenure_enhanced,
+                         self._calculate_weighted_score, BatchScorer._skills_scores,
+                         BatchScorer._tenure_scores):
+                _update_code_digest(digest, rule.__code__)
+            self._rules_digest = digest.hexdigest()
+        weights = self.weights if weights is None else weights
+        content = f'{self._rules_digest}:{json.dumps(list(weights.items()))}'
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    
+    def score_candidates(self, candidates: List[Candidate], job: Union[str, JobContext],
+                         top_k: Optional[int] = None) -> List[Candidate]:
+        """
+        Score all candidates and return sorted results; with ``top_k``, only
+        the best ``top_k`` (ties keep pool order, as in a full sort)
+        """
+        job = as_job_context(job)
+        candidates = list(map(as_candidate, candidates))
+        
+        # Same results as the rules below, computed over a feature matrix;
+        # rescoring a large pool this way is cheaper than cache lookups
+        if self.batch_scorer is not None and len(candidates) >= config.BATCH_SCORING_MIN_CANDIDATES:
+            return self.batch_scorer.score_candidates(candidates, job, top_k=top_k)
+        
+        if self.score_cache is not None:
+            return self._score_with_cache(candidates, job, top_k)
+        
+        return self._rank(self._score_with_rules(candidates, job), top_k)
+    
+    def _score_with_cache(self, candidates: List[Candidate], job: JobContext,
+                          top_k: Optional[int]) -> List[Candidate]:
+        """Reuse cached scores, score only the rest, then rank the whole pool"""
+        rubric_version = self.rubric_version()
+        misses = []
+        
+        for candidate in candidates:
+            key = self.score_cache.key(candidate, job.fingerprint, rubric_version)
+            cached = self.score_cache.get(key)
+            if cached is None:
+                misses.append((key, candidate))
+            else:
+                candidate.fit_score, breakdown = cached
+                candidate.score_breakdown = dict(zip(SCORE_CATEGORIES, breakdown))
+        
+        if misses:
+            self._score_with_rules([candidate for _, candidate in misses], job)
+            for key, candidate in misses:
+                self.score_cache.put(key, candidate.fit_score, candidate.score_breakdown)
+        
+        return self._rank(candidates, top_k)
+    
+    def _score_with_rules(self, candidates: List[Candidate], job: JobContext) -> List[Candidate]:
+        """Score each candidate with the rubric rules, in pool order"""
         scored_candidates = []
         
         for candidate in candidates:
             try:
-                scored = self._score_single_candidate(candidate, job_description)
+                scored = self._score_single_candidate(candidate, job)
                 if scored:
                     scored_candidates.append(scored)
             except Exception as e:
-                print(f"Error scoring candidate {candidate.get('name', 'Unknown')}: {e}")
+                print(f"Error scoring candidate {candidate.name}: {e}")
                 # Add candidate with default low score
-                candidate['fit_score'] = 1.0
-                candidate['score_breakdown'] = {
+                candidate.fit_score = 1.0
+                candidate.score_breakdown = {
                     'education': 1.0,
                     'trajectory': 1.0,
                     'company': 1.0,
@@ -71,54 +138,60 @@ class CandidateScorer:
                 }
                 scored_candidates.append(candidate)
         
-        # Sort by fit score (highest first)
-        scored_candidates.sort(key=lambda x: x.get('fit_score', 0), reverse=True)
+        return scored_candidates
+    
+    def _rank(self, scored_candidates: List[Candidate], top_k: Optional[int]) -> List[Candidate]:
+        """Sort by fit score (highest first); ties keep pool order"""
+        if top_k is not None:
+            # Bounded heap; nlargest is stable, so this equals sort-then-slice
+            return heapq.nlargest(top_k, scored_candidates, key=lambda x: x.fit_score or 0)
+        scored_candidates.sort(key=lambda x: x.fit_score or 0, reverse=True)
         
         return scored_candidates
     
-    def _score_single_candidate(self, candidate: Dict, job_description: str) -> Dict:
+    def _score_single_candidate(self, candidate: Candidate, job: JobContext) -> Candidate:
         """
         Score a single candidate using enhanced rule-based scoring
         """
         # Get rule-based scoring (more reliable for hackathon)
-        score_breakdown = self._get_enhanced_rule_based_scores(candidate, job_description)
+        score_breakdown = self._get_enhanced_rule_based_scores(candidate, job)
         
         # Calculate weighted fit score
         fit_score = self._calculate_weighted_score(score_breakdown)
         
         # Add scores to candidate
-        candidate['fit_score'] = fit_score
-        candidate['score_breakdown'] = score_breakdown
+        candidate.fit_score = fit_score
+        candidate.score_breakdown = score_breakdown
         
         return candidate
     
-    def _get_enhanced_rule_based_scores(self, candidate: Dict, job_description: str) -> Dict:
+    def _get_enhanced_rule_based_scores(self, candidate: Candidate, job: JobContext) -> Dict:
         """
         Enhanced rule-based scoring following hackathon rubric exactly
         """
         scores = {}
         
         # Education score (20%)
-        scores['education'] = self._score_education_enhanced(candidate, job_description)
+        scores['education'] = self._score_education_enhanced(candidate, job)
         
         # Career trajectory score (20%)
-        scores['trajectory'] = self._score_trajectory_enhanced(candidate, job_description)
+        scores['trajectory'] = self._score_trajectory_enhanced(candidate, job)
         
         # Company relevance score (15%)
-        scores['company'] = self._score_company_relevance_enhanced(candidate, job_description)
+        scores['company'] = self._score_company_relevance_enhanced(candidate, job)
         
         # Skills/Experience match score (25%)
-        scores['skills'] = self._score_skills_match_enhanced(candidate, job_description)
+        scores['skills'] = self._score_skills_match_enhanced(candidate, job)
         
         # Location match score (10%)
-        scores['location'] = self._score_location_match_enhanced(candidate, job_description)
+        scores['location'] = self._score_location_match_enhanced(candidate, job)
         
         # Tenure score (10%)
-        scores['tenure'] = self._score_tenure_enhanced(candidate, job_description)
+        scores['tenure'] = self._score_tenure_enhanced(candidate, job)
         
         return scores
     
-    def _score_education_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_education_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced education scoring (20% weight)
         - Elite schools (MIT, Stanford, etc.): 9-10
@@ -126,49 +199,49 @@ class CandidateScorer:
         - Standard universities: 5-6
         - Clear progression: 8-10
         """
-        education = ' '.join(candidate.get('education', [])).lower()
-        job_lower = job_description.lower()
+        return self._score_education_text(' '.join(candidate.education).lower(), job)
+    
+    def _score_education_text(self, education: str, job: JobContext) -> float:
+        """Education rules on the candidate's lower-cased education entries"""
+        # Whole-word vocabulary matches, so 'ma' or 'it' no longer hit 'mathematics'
+        matches = self.matcher.find(education)
         
         # Check for elite schools
-        if any(school in education for school in self.elite_schools):
+        if matches['elite_school']:
             return 9.5
         
         # Check for advanced degrees
-        if any(degree in education for degree in ['phd', 'doctorate', 'ph.d']):
+        if matches['doctoral_degree']:
             return 9.0
-        elif any(degree in education for degree in ['masters', 'ms', 'ma', 'm.s', 'm.a']):
+        elif matches['masters_degree']:
             return 8.0
-        elif any(degree in education for degree in ['bachelors', 'bs', 'ba', 'b.s', 'b.a']):
+        elif matches['bachelors_degree']:
             return 7.0
         
         # Check for relevant technical fields
-        tech_fields = ['computer science', 'cs', 'engineering', 'mathematics', 'statistics', 
-                      'data science', 'machine learning', 'artificial intelligence', 'ai',
-                      'software engineering', 'information technology', 'it']
-        if any(field in education for field in tech_fields):
+        if matches['tech_field']:
             return 8.0
         
         # Check for business/management fields (relevant for some roles)
-        business_fields = ['business', 'management', 'economics', 'finance', 'mba']
-        if any(field in education for field in business_fields):
+        if matches['business_field']:
             return 6.0
         
         # Check if job requires specific education
-        if any(word in job_lower for word in ['phd', 'doctorate', 'masters', 'degree required']):
+        if job.requires_education:
             return 4.0  # Lower score if education is required but not found
         
         return 5.0  # Default score for standard universities
     
-    def _score_trajectory_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_trajectory_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced career trajectory scoring (20% weight)
         - Steady growth: 6-8
         - Limited progression: 3-5
         """
-        companies = candidate.get('companies', [])
-        experience_level = candidate.get('experience_level', 'unknown').lower()
-        headline = candidate.get('headline', '').lower()
-        
+        return self._score_headline_trajectory(candidate.headline.lower())
+    
+    def _score_headline_trajectory(self, headline: str) -> float:
+        """Trajectory rules on the lower-cased headline"""
         # Check for upward progression in titles
         senior_titles = ['senior', 'lead', 'principal', 'staff', 'architect', 'director', 'manager', 'head']
         junior_titles = ['junior', 'associate', 'entry', 'graduate', 'intern']
@@ -184,38 +257,25 @@ class CandidateScorer:
         else:
             return 4.0
     
-    def _score_company_relevance_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_company_relevance_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced company relevance scoring (15% weight)
         - Top tech companies: 9-10
         - Relevant industry: 7-8
         - Any experience: 5-6
         """
-        companies = ' '.join(candidate.get('companies', [])).lower()
-        job_lower = job_description.lower()
+        return self._score_companies_text(' '.join(candidate.companies).lower(), job)
+    
+    def _score_companies_text(self, companies: str, job: JobContext) -> float:
+        """Company rules on the candidate's lower-cased company names"""
+        company_matches = self.matcher.find(companies)
         
         # Check for top tech companies
-        if any(company in companies for company in self.top_tech_companies):
+        if company_matches['top_company']:
             return 9.5
         
-        # Check for relevant industry keywords
-        industry_keywords = {
-            'fintech': ['fintech', 'financial', 'banking', 'payments', 'stripe', 'paypal', 'square'],
-            'ai/ml': ['ai', 'machine learning', 'ml', 'artificial intelligence', 'deep learning'],
-            'cloud': ['aws', 'azure', 'gcp', 'cloud', 'kubernetes', 'docker'],
-            'startup': ['startup', 'venture', 'funded', 'series a', 'series b'],
-            'enterprise': ['enterprise', 'saas', 'b2b', 'enterprise software']
-        }
-        
-        # Extract industry from job description
-        job_industry = None
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in job_lower for keyword in keywords):
-                job_industry = industry
-                break
-        
-        # Check if candidate has relevant industry experience
-        if job_industry and any(keyword in companies for keyword in industry_keywords[job_industry]):
+        # Check if candidate has experience in the job's industry
+        if job.industry and company_matches[f'industry:{job.industry}']:
             return 8.0
         
         # Check for any tech company experience
@@ -225,32 +285,19 @@ class CandidateScorer:
         
         return 5.0  # Default for any experience
     
-    def _score_skills_match_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_skills_match_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced skills/experience match scoring (25% weight)
         - Perfect skill match: 9-10
         - Strong overlap: 7-8
         - Some relevant skills: 5-6
         """
-        skills = ' '.join(candidate.get('skills', [])).lower()
-        headline = candidate.get('headline', '').lower()
-        job_lower = job_description.lower()
+        # Share of the job's skill bits set in the candidate's mask
+        match_percentage = skill_overlap(self._candidate_skill_mask(candidate), job.skill_mask)
         
-        # Extract key skills from job description
-        job_skills = self._extract_skills_from_job_description(job_description)
-        
-        if not job_skills:
+        if match_percentage is None:
             return 5.0  # Default if no skills found
         
-        # Count matching skills
-        matches = 0
-        for skill in job_skills:
-            if skill in skills or skill in headline:
-                matches += 1
-        
-        # Calculate match percentage
-        match_percentage = matches / len(job_skills)
-        
         if match_percentage >= 0.8:
             return 9.5  # Perfect match
         elif match_percentage >= 0.6:
@@ -262,44 +309,28 @@ class CandidateScorer:
         else:
             return 4.0  # Poor match
     
-    def _extract_skills_from_job_description(self, job_description: str) -> List[str]:
+    def _candidate_skill_mask(self, candidate: Candidate) -> int:
         """
-        Extract key skills from job description
+        Job skills the candidate has: the stored headline mask (computed once
+        for candidates not built by the parser) plus the candidate's skill
+        terms, which the parser merges with the job's skills
         """
-        job_lower = job_description.lower()
-        
-        # Common tech skills
-        tech_skills = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node.js', 'django', 'flask', 'fastapi', 'spring', 'express', 'ruby',
-            'go', 'rust', 'c++', 'c#', '.net', 'php', 'sql', 'postgresql', 'mysql',
-            'mongodb', 'redis', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
-            'terraform', 'jenkins', 'git', 'github', 'gitlab', 'ci/cd', 'agile',
-            'scrum', 'machine learning', 'ml', 'ai', 'deep learning', 'tensorflow',
-            'pytorch', 'scikit-learn', 'pandas', 'numpy', 'spark', 'hadoop',
-            'kafka', 'elasticsearch', 'microservices', 'api', 'rest', 'graphql',
-            'frontend', 'backend', 'full stack', 'devops', 'data science'
-        ]
-        
-        found_skills = []
-        for skill in tech_skills:
-            if skill in job_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        if candidate.skill_mask is None:
+            candidate.skill_mask = self.skill_vocabulary.encode_text(candidate.headline)
+        return candidate.skill_mask | self.skill_vocabulary.encode_skill_set(candidate.skills)
     
-    def _score_location_match_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_location_match_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced location match scoring (10% weight)
         - Exact city: 10
         - Same metro: 8
         - Remote-friendly: 6
         """
-        location = candidate.get('location', '').lower()
-        job_lower = job_description.lower()
-        
-        # Extract location from job description
-        job_location = self._extract_location_from_job_description(job_description)
+        return self._score_location_text(candidate.location.lower(), job)
+    
+    def _score_location_text(self, location: str, job: JobContext) -> float:
+        """Location rules on the lower-cased candidate location"""
+        job_location = job.location
         
         if not job_location:
             return 6.0  # Default for remote-friendly
@@ -325,38 +356,19 @@ class CandidateScorer:
                 return 8.0
         
         # Check for remote-friendly indicators
-        if any(word in job_lower for word in ['remote', 'work from home', 'wfh', 'anywhere']):
+        if job.remote:
             return 6.0
         
         return 4.0  # Poor location match
     
-    def _extract_location_from_job_description(self, job_description: str) -> str:
-        """
-        Extract location from job description
-        """
-        job_lower = job_description.lower()
-        
-        # Common tech hubs
-        locations = [
-            'san francisco', 'new york', 'seattle', 'austin', 'boston', 'los angeles',
-            'chicago', 'denver', 'atlanta', 'miami', 'dallas', 'houston', 'phoenix',
-            'portland', 'nashville', 'salt lake city', 'minneapolis', 'detroit'
-        ]
-        
-        for location in locations:
-            if location in job_lower:
-                return location
-        
-        return ''
-    
-    def _score_tenure_enhanced(self, candidate: Dict, job_description: str) -> float:
+    def _score_tenure_enhanced(self, candidate: Candidate, job: JobContext) -> float:
         """
         Enhanced tenure scoring (10% weight)
         - 2-3 years average: 9-10
         - 1-2 years: 6-8
         - Job hopping: 3-5
         """
-        companies = candidate.get('companies', [])
+        companies = candidate.companies
         experience_years = candidate.get('experience_years', 0)
         
         # Count companies to detect job hopping
@@ -382,13 +394,32 @@ class CandidateScorer:
         else:
             return 5.0  # Default
     
-    def _calculate_weighted_score(self, score_breakdown: Dict) -> float:
+    def apply_ai_scores(self, candidates: List[Candidate], job: JobContext,
+                        ai_client) -> Tuple[List[Candidate], int]:
+        """
+        Replace the rule breakdowns of a shortlist with LLM scores (a few
+        batched requests via EnhancedAIClient.score_candidates_batch) and
+        re-sort it by the resulting fit scores. Candidates the AI could not
+        score keep their rule scores. Also returns how many were AI-scored.
+        """
+        ai_scores = ai_client.score_candidates_batch(candidates, job.text)
+        ai_scored = 0
+        for candidate, score_breakdown in zip(candidates, ai_scores):
+            if score_breakdown is None:
+                continue
+            candidate.score_breakdown = score_breakdown
+            candidate.fit_score = self._calculate_weighted_score(score_breakdown)
+            ai_scored += 1
+        return sorted(candidates, key=lambda candidate: candidate.fit_score, reverse=True), ai_scored
+    
+    def _calculate_weighted_score(self, score_breakdown: Dict, weights: Dict[str, float] = None) -> float:
         """
         Calculate weighted fit score based on hackathon rubric
+        (or on custom ``weights``, e.g. when re-ranking)
         """
         total_score = 0.0
         
-        for category, weight in self.weights.items():
+        for category, weight in (weights or self.weights).items():
             score = score_breakdown.get(category, 5.0)
             total_score += score * weight
         
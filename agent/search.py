@@ -1,38 +1,20 @@
 """
 LinkedIn profile discovery via Google search
 """
-import requests
 import time
-import json
 import re
 from typing import List, Dict, Optional
 from urllib.parse import quote_plus, urlparse
-from bs4 import BeautifulSoup
 import config
+from cache_keys import job_fingerprint, search_cache_key
+from profile_store import get_profile_store
+from transport import get_transport
+from serp import extract_serp_results
 
 class LinkedInSearcher:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config.USER_AGENT
-        })
-        self.cache = self._load_cache()
-    
-    def _load_cache(self) -> Dict:
-        """Load cached search results"""
-        try:
-            with open(config.CACHE_FILE, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def _save_cache(self):
-        """Save search results to cache"""
-        try:
-            with open(config.CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save cache: {e}")
+        self.transport = get_transport()
+        self.store = get_profile_store()
     
     def _get_mock_profiles(self, job_description: str) -> List[Dict]:
         """Return mock profiles for demonstration when Google search fails"""
@@ -128,11 +110,12 @@ class LinkedInSearcher:
         if max_results is None:
             max_results = config.MAX_CANDIDATES_PER_SEARCH
         
-        # Check cache first
-        cache_key = f"{hash(job_description)}"
-        if cache_key in self.cache:
+        # Check cache first (normalized fingerprint, fresh entries only)
+        cache_key = search_cache_key(job_description)
+        cached = self.store.get_search_results(cache_key)
+        if cached is not None:
             print(f"Using cached results for job description")
-            return self.cache[cache_key][:max_results]
+            return cached[:max_results]
         
         # Try real search first
         try:
@@ -171,8 +154,14 @@ class LinkedInSearcher:
                 results = self._get_mock_profiles(job_description)
             
             # Cache results
-            self.cache[cache_key] = results
-            self._save_cache()
+            try:
+                self.store.save_search_results(
+                    cache_key, results,
+                    job_description=job_description,
+                    job_fingerprint=job_fingerprint(job_description)
+                )
+            except Exception as e:
+                print(f"Warning: Could not save cache: {e}")
             
             return results
             
@@ -211,37 +200,28 @@ class LinkedInSearcher:
         }
         
         try:
-            response = self.session.get(config.GOOGLE_SEARCH_URL, params=params, timeout=10)
+            response = self.transport.get(config.GOOGLE_SEARCH_URL, params=params)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
             profiles = []
             
-            # Find search result links
-            search_results = soup.find_all('a', href=True)
-            
-            for result in search_results:
-                href = result.get('href', '')
-                
-                # Extract LinkedIn profile URLs
-                if config.LINKEDIN_DOMAIN in href and '/in/' in href:
-                    # Clean the URL
-                    profile_url = self._clean_linkedin_url(href)
-                    if profile_url:
-                        # Extract basic info from the result
-                        title_element = result.find_parent().find('h3') if result.find_parent() else None
-                        title = title_element.get_text().strip() if title_element else "LinkedIn Profile"
-                        
-                        # Extract location if available
-                        location = self._extract_location_from_result(result)
-                        
-                        profiles.append({
-                            'linkedin_url': profile_url,
-                            'name': self._extract_name_from_title(title),
-                            'headline': title,
-                            'location': location,
-                            'confidence': 0.7  # Default confidence
-                        })
+            # Only the organic result containers are parsed
+            for result in extract_serp_results(response.text):
+                # Clean and validate the LinkedIn profile URL
+                profile_url = self._clean_linkedin_url(result['link'])
+                if profile_url:
+                    title = result['title'] or "LinkedIn Profile"
+                    
+                    # Extract location if available
+                    location = self._extract_location_from_result(result)
+                    
+                    profiles.append({
+                        'linkedin_url': profile_url,
+                        'name': self._extract_name_from_title(title),
+                        'headline': title,
+                        'location': location,
+                        'confidence': 0.7  # Default confidence
+                    })
             
             return profiles
             
@@ -277,18 +257,14 @@ class LinkedInSearcher:
         
         return name if name else "Unknown"
     
-    def _extract_location_from_result(self, result_element) -> str:
+    def _extract_location_from_result(self, result: Dict) -> str:
         """Extract location from search result"""
         try:
-            # Look for location in nearby text
-            parent = result_element.find_parent()
-            if parent:
-                text = parent.get_text()
-                # Look for location patterns
-                location_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2})\b'
-                match = re.search(location_pattern, text)
-                if match:
-                    return match.group(1)
+            # Look for location patterns in the result text
+            location_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2})\b'
+            match = re.search(location_pattern, result.get('text', ''))
+            if match:
+                return match.group(1)
         except:
             pass
         
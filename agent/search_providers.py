@@ -0,0 +1,268 @@
+"""
+Pluggable search providers behind EnhancedLinkedInSearcher, including
+record/replay providers for offline benchmarking and load testing
+"""
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import config
+from rate_limiter import RateLimitExceeded, parse_retry_after
+from serp import extract_serp_results
+from transport import get_transport
+
+RECORDED_HEADERS = ('Retry-After', 'Content-Type')
+# Google serves these instead of results once it has flagged our traffic
+GOOGLE_BLOCK_MARKERS = ('id="captcha-form"', 'unusual traffic from your computer network')
+
+
+class ProviderResponse:
+    """Raw provider response, kept raw so it can be recorded and replayed verbatim"""
+
+    def __init__(self, status_code: int, body: str, headers: Dict = None, latency: float = 0.0):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.latency = latency
+
+    def raise_for_status(self):
+        if self.status_code == 429:
+            raise RateLimitExceeded(retry_after=parse_retry_after(self.headers.get('Retry-After')))
+        if self.status_code >= 400:
+            raise RuntimeError(f"Search provider returned HTTP {self.status_code}")
+
+
+class SearchProvider:
+    """Interface: fetch one page of results for a query, then extract result dicts"""
+
+    name = 'base'
+    rate_limited = True
+
+    def fetch(self, query: str, num: int, start: int = 0) -> ProviderResponse:
+        raise NotImplementedError
+
+    def extract_results(self, response: ProviderResponse) -> List[Dict]:
+        """Return result dicts with link, title, snippet and text"""
+        raise NotImplementedError
+
+    def _get(self, url: str, params: Dict) -> ProviderResponse:
+        start = time.monotonic()
+        response = get_transport().get(url, params=params)
+        return ProviderResponse(
+            response.status_code,
+            response.text,
+            {header: response.headers[header] for header in RECORDED_HEADERS if header in response.headers},
+            time.monotonic() - start
+        )
+
+
+class GoogleProvider(SearchProvider):
+    name = 'google'
+
+    def fetch(self, query: str, num: int, start: int = 0) -> ProviderResponse:
+        params = {'q': query, 'num': num}
+        if start:
+            params['start'] = start
+        return self._get(config.GOOGLE_SEARCH_URL, params)
+
+    def extract_results(self, response: ProviderResponse) -> List[Dict]:
+        if any(marker in response.body for marker in GOOGLE_BLOCK_MARKERS):
+            raise RuntimeError("Google returned a captcha page instead of results")
+        return extract_serp_results(response.body)
+
+
+class SerpAPIProvider(SearchProvider):
+    name = 'serpapi'
+
+    def fetch(self, query: str, num: int, start: int = 0) -> ProviderResponse:
+        if not config.SERPAPI_KEY:
+            raise RuntimeError("SerpAPI key not configured")
+        params = {
+            'q': query,
+            'api_key': config.SERPAPI_KEY,
+            'engine': 'google',
+            'num': num
+        }
+        if start:
+            params['start'] = start
+        return self._get(config.SERPAPI_URL, params)
+
+    def extract_results(self, response: ProviderResponse) -> List[Dict]:
+        data = json.loads(response.body or '{}')
+        return [
+            {
+                'link': result.get('link', ''),
+                'title': result.get('title', ''),
+                'snippet': result.get('snippet', ''),
+                'text': result.get('snippet', '')
+            }
+            for result in data.get('organic_results', [])
+        ]
+
+
+def _recording_key(provider_name: str, query: str, num: int, start: int) -> str:
+    raw = json.dumps([provider_name, query, num, start])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]
+
+
+class RecordingProvider(SearchProvider):
+    """Pass-through to a live provider that saves every response to disk"""
+
+    def __init__(self, inner: SearchProvider, recordings_dir: str):
+        self.inner = inner
+        self.name = inner.name
+        self.rate_limited = inner.rate_limited
+        self.directory = os.path.join(recordings_dir, inner.name)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def fetch(self, query: str, num: int, start: int = 0) -> ProviderResponse:
+        response = self.inner.fetch(query, num, start)
+        recording = {
+            'provider': self.inner.name,
+            'query': query,
+            'num': num,
+            'start': start,
+            'status_code': response.status_code,
+            'headers': response.headers,
+            'latency': round(response.latency, 4),
+            'recorded_at': datetime.now().isoformat(),
+            'body': response.body
+        }
+        path = os.path.join(self.directory, f"{_recording_key(self.inner.name, query, num, start)}.json")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(recording, f)
+        except Exception as e:
+            print(f"Warning: Could not write search recording {path}: {e}")
+        return response
+
+    def extract_results(self, response: ProviderResponse) -> List[Dict]:
+        return self.inner.extract_results(response)
+
+
+class LatencyModel:
+    """
+    Delay distribution for replayed responses, parsed from a spec string:
+    ``recorded`` (each response's own latency), ``empirical`` (sampled from
+    all recorded latencies), ``none``, ``fixed:S``, ``uniform:LO,HI`` or
+    ``lognormal:MU,SIGMA`` (seconds).
+    """
+
+    def __init__(self, spec: str, recorded_latencies: List[float] = None, seed: int = None):
+        kind, _, args = (spec or 'recorded').partition(':')
+        self.kind = kind.strip().lower()
+        self.params = [float(value) for value in args.split(',') if value.strip()]
+        self.recorded_latencies = recorded_latencies or [0.0]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        if self.kind not in ('recorded', 'empirical', 'none', 'fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown replay latency model: {spec}")
+
+    def sample(self, recorded_latency: float) -> float:
+        with self._lock:
+            if self.kind == 'recorded':
+                return recorded_latency
+            if self.kind == 'empirical':
+                return self._random.choice(self.recorded_latencies)
+            if self.kind == 'fixed':
+                return self.params[0]
+            if self.kind == 'uniform':
+                return self._random.uniform(self.params[0], self.params[1])
+            if self.kind == 'lognormal':
+                return self._random.lognormvariate(self.params[0], self.params[1])
+            return 0.0
+
+
+class ReplayProvider(SearchProvider):
+    """
+    Serves recorded responses without touching the network. Queries that were
+    never recorded get the recording for the same query text if there is one,
+    otherwise recordings are handed out round-robin so arbitrary job
+    descriptions still exercise the full pipeline.
+    """
+
+    rate_limited = False
+
+    def __init__(self, provider_name: str, recordings_dir: str, latency_spec: str = 'recorded',
+                 strict: bool = False, extractor: SearchProvider = None):
+        self.name = provider_name
+        self.strict = strict
+        self.extractor = extractor or _live_provider(provider_name)
+        self._by_key: Dict[str, Dict] = {}
+        self._by_query: Dict[str, Dict] = {}
+        self._recordings: List[Dict] = []
+        for path in sorted(glob.glob(os.path.join(recordings_dir, provider_name, '*.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    recording = json.load(f)
+            except Exception as e:
+                print(f"Warning: Skipping unreadable search recording {path}: {e}")
+                continue
+            key = _recording_key(provider_name, recording['query'], recording['num'], recording['start'])
+            self._by_key[key] = recording
+            self._by_query.setdefault(recording['query'], recording)
+            self._recordings.append(recording)
+        self.latency = LatencyModel(latency_spec, [r.get('latency', 0.0) for r in self._recordings])
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self.misses = 0
+
+        if config.DEBUG:
+            print(f"Loaded {len(self._recordings)} {provider_name} recordings for replay")
+
+    def _find(self, query: str, num: int, start: int) -> Optional[Dict]:
+        recording = self._by_key.get(_recording_key(self.name, query, num, start))
+        if recording is None and start == 0:
+            recording = self._by_query.get(query)
+        if recording is None and not self.strict and self._recordings and start == 0:
+            with self._lock:
+                recording = self._recordings[self._cursor % len(self._recordings)]
+                self._cursor += 1
+        return recording
+
+    def fetch(self, query: str, num: int, start: int = 0) -> ProviderResponse:
+        recording = self._find(query, num, start)
+        if recording is None:
+            with self._lock:
+                self.misses += 1
+            return ProviderResponse(200, '{}' if self.name == 'serpapi' else '', {}, 0.0)
+
+        delay = self.latency.sample(recording.get('latency', 0.0))
+        if delay > 0:
+            time.sleep(delay)
+        return ProviderResponse(recording['status_code'], recording['body'], recording.get('headers', {}), delay)
+
+    def extract_results(self, response: ProviderResponse) -> List[Dict]:
+        return self.extractor.extract_results(response)
+
+
+def _live_provider(provider_name: str) -> SearchProvider:
+    if provider_name == 'serpapi':
+        return SerpAPIProvider()
+    return GoogleProvider()
+
+
+def create_search_provider(provider_name: str = None, mode: str = None) -> SearchProvider:
+    """Build the provider for config.get_search_client(), wrapped for SEARCH_MODE record/replay"""
+    mode = (mode or config.SEARCH_MODE).lower()
+    if provider_name is None and mode == 'replay':
+        provider_name = config.SEARCH_REPLAY_PROVIDER
+    provider_name = provider_name or config.get_search_client()
+    # The LinkedIn API client is not implemented; it has always fallen back to Google
+    if provider_name != 'serpapi':
+        provider_name = 'google'
+
+    if mode == 'replay':
+        return ReplayProvider(provider_name, config.SEARCH_RECORDINGS_DIR,
+                              latency_spec=config.SEARCH_REPLAY_LATENCY,
+                              strict=config.SEARCH_REPLAY_STRICT)
+    provider = _live_provider(provider_name)
+    if mode == 'record':
+        return RecordingProvider(provider, config.SEARCH_RECORDINGS_DIR)
+    return provider
@@ -0,0 +1,142 @@
+"""
+Targeted extraction of organic results from Google SERP HTML
+"""
+import re
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup, SoupStrainer
+import config
+
+try:
+    import lxml.html
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    lxml = None
+    PARSER_BACKEND = 'html.parser'
+
+_HAS_CLASS = 'contains(concat(" ", normalize-space(@class), " "), " {} ")'
+# Outermost div.g elements only, so nested result blocks are not counted twice
+RESULT_CONTAINERS_XPATH = (
+    f'//div[{_HAS_CLASS.format("g")}][not(ancestor::div[{_HAS_CLASS.format("g")}])]'
+)
+PROFILE_LINKS_XPATH = f'//a[contains(@href, "{config.LINKEDIN_DOMAIN}")]'
+
+# Without lxml, only the organic result containers are built into a
+# BeautifulSoup tree; scripts, styles and navigation are skipped.
+RESULT_CONTAINERS = SoupStrainer('div', class_=re.compile(r'(?:^|\s)g(?:\s|$)'))
+PROFILE_LINKS = SoupStrainer('a', href=re.compile(re.escape(config.LINKEDIN_DOMAIN)))
+
+SNIPPET_CLASSES = ('aCOpRe', 'VwiC3b', 'IsZvec', 'st')
+
+
+def clean_result_url(url: str) -> str:
+    """Unwrap Google /url?q= redirects and drop tracking parameters"""
+    if not url:
+        return ''
+    if '/url?q=' in url:
+        url = unquote(url.split('/url?q=', 1)[1].split('&', 1)[0])
+    return url.split('?', 1)[0]
+
+
+def is_linkedin_profile_url(url: str) -> bool:
+    return config.LINKEDIN_DOMAIN in url and '/in/' in url
+
+
+def _find_snippet(container) -> str:
+    for class_name in SNIPPET_CLASSES:
+        element = container.find(['span', 'div'], class_=class_name)
+        if element:
+            return element.get_text(' ', strip=True)
+    return ''
+
+
+def _element_text(element) -> str:
+    return ' '.join(text.strip() for text in element.itertext() if text.strip())
+
+
+def _lxml_result(element, is_anchor: bool = False) -> Optional[Dict]:
+    link_element = element if is_anchor else next(iter(element.xpath('.//a[@href]')), None)
+    if link_element is None:
+        return None
+    title_element = next(iter(element.xpath('.//h3')), None)
+    snippet = ''
+    if not is_anchor:
+        for class_name in SNIPPET_CLASSES:
+            snippet_element = next(iter(element.xpath(
+                f'.//*[self::span or self::div][{_HAS_CLASS.format(class_name)}]'
+            )), None)
+            if snippet_element is not None:
+                snippet = _element_text(snippet_element)
+                break
+    return {
+        'link': clean_result_url(link_element.get('href', '')),
+        'title': title_element.text_content().strip() if title_element is not None else '',
+        'snippet': snippet,
+        'text': _element_text(element)
+    }
+
+
+def _extract_with_lxml(html: str) -> List[Dict]:
+    """Parse with libxml2 and pull result containers out with XPath"""
+    document = lxml.html.fromstring(html)
+    results = [result for result in map(_lxml_result, document.xpath(RESULT_CONTAINERS_XPATH)) if result]
+    if not results:
+        results = [_lxml_result(anchor, is_anchor=True) for anchor in document.xpath(PROFILE_LINKS_XPATH)]
+    return results
+
+
+def _extract_with_soup(html: str) -> List[Dict]:
+    """Pure-Python fallback: BeautifulSoup restricted to result containers"""
+    soup = BeautifulSoup(html, PARSER_BACKEND, parse_only=RESULT_CONTAINERS)
+    results = [result for result in map(_container_result, soup.find_all('div', class_='g', recursive=False))
+               if result]
+    if not results:
+        soup = BeautifulSoup(html, PARSER_BACKEND, parse_only=PROFILE_LINKS)
+        results = [_anchor_result(anchor) for anchor in soup.find_all('a', recursive=False)]
+    return results
+
+
+def _container_result(container) -> Optional[Dict]:
+    link_element = container.find('a', href=True)
+    if not link_element:
+        return None
+    title_element = container.find('h3')
+    return {
+        'link': clean_result_url(link_element.get('href', '')),
+        'title': title_element.get_text().strip() if title_element else '',
+        'snippet': _find_snippet(container),
+        'text': container.get_text(' ', strip=True)
+    }
+
+
+def _anchor_result(anchor) -> Dict:
+    title_element = anchor.find('h3')
+    return {
+        'link': clean_result_url(anchor.get('href', '')),
+        'title': title_element.get_text().strip() if title_element else '',
+        'snippet': '',
+        'text': anchor.get_text(' ', strip=True)
+    }
+
+
+def extract_serp_results(html: str, linkedin_only: bool = True) -> List[Dict]:
+    """
+    Extract organic results as dicts with link, title, snippet and text.
+
+    Result containers (``div.g``) are extracted first; pages without them
+    (basic HTML layouts, consent pages) fall back to anchors pointing at
+    LinkedIn. lxml is used when installed, BeautifulSoup otherwise.
+    """
+    if not html or not html.strip():
+        return []
+
+    if lxml is not None:
+        results = _extract_with_lxml(html)
+    else:
+        results = _extract_with_soup(html)
+
+    if linkedin_only:
+        results = [result for result in results if is_linkedin_profile_url(result['link'])]
+
+    return results
@@ -0,0 +1,83 @@
+"""
+Single-flight call coalescing: concurrent callers with the same key share
+one execution and all receive its result
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-based request coalescing, in the style of Go's singleflight.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block until it finishes and get the same result (or the
+    same exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self, name: str = 'singleflight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Run ``func`` once per in-flight ``key``; returns (result, shared_from_another_caller)"""
+        call, leader = self.join(key)
+        if not leader:
+            return self.wait(call), True
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return result, False
+
+    def join(self, key: Hashable) -> Tuple[_Call, bool]:
+        """
+        Join the flight for ``key``, starting it if there is none; returns
+        (call, leader). A leader must end the flight with ``finish``, other
+        callers get its outcome from ``wait``. Lets a caller that produces
+        its result incrementally (e.g. a generator) lead a flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.executions += 1
+            return call, True
+
+    def wait(self, call: _Call) -> Any:
+        """Block until the leader finishes; returns its result or raises its exception"""
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def finish(self, key: Hashable, call: _Call, result: Any = None, error: BaseException = None):
+        """End a flight started by ``join`` and release its waiters"""
+        call.result = result
+        call.error = error
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced_calls': self.coalesced,
+                'in_flight': len(self._calls)
+            }
@@ -0,0 +1,126 @@
+"""
+Skill sets encoded as integer bitmasks over a fixed skill vocabulary, so a
+skills match is a popcount of an AND instead of substring checks
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from keyword_matcher import get_keyword_matcher
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Distinct skill lists memoized by encode_skill_set before the memo is reset
+MAX_SKILL_SETS = 65536
+
+
+class SkillVocabulary:
+    """
+    Bit ``i`` of a mask stands for the ``i``-th skill of a matcher
+    vocabulary. Text is encoded with the shared keyword matcher, so masks
+    follow the same whole-word rules as every other vocabulary match.
+    """
+
+    def __init__(self, category: str = 'job_skill'):
+        self.matcher = get_keyword_matcher()
+        self.category = category
+        self.skills: List[str] = list(self.matcher.vocabularies[category])
+        self.bits: Dict[str, int] = {skill: 1 << position for position, skill in enumerate(self.skills)}
+        self._term_masks: Dict[str, int] = {}
+        self._set_masks: Dict[Tuple[str, ...], int] = {}
+
+    @property
+    def width(self) -> int:
+        return len(self.skills)
+
+    def encode(self, skills: Iterable[str]) -> int:
+        """Mask of vocabulary skills; other terms are ignored"""
+        mask = 0
+        for skill in skills:
+            mask |= self.bits.get(skill, 0)
+        return mask
+
+    def encode_text(self, text: str) -> int:
+        return self.encode(self.matcher.find(text)[self.category])
+
+    def encode_terms(self, terms: Iterable[str]) -> int:
+        """
+        Mask of the vocabulary skills found in each term, e.g. the parser
+        skill 'react native' sets the bit for 'react'. Per-term masks are
+        memoized since terms come from a small vocabulary.
+        """
+        mask = 0
+        for term in terms:
+            term_mask = self._term_masks.get(term)
+            if term_mask is None:
+                term_mask = self._term_masks[term] = self.encode_text(term)
+            mask |= term_mask
+        return mask
+
+    def encode_skill_set(self, skills: Tuple[str, ...]) -> int:
+        """
+        encode_terms memoized on the whole tuple: candidates scored for one
+        job share a handful of skill lists
+        """
+        mask = self._set_masks.get(skills)
+        if mask is None:
+            if len(self._set_masks) >= MAX_SKILL_SETS:
+                self._set_masks.clear()
+            mask = self._set_masks[skills] = self.encode_terms(skills)
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        return [skill for skill, bit in self.bits.items() if mask & bit]
+
+
+def popcount(mask: int) -> int:
+    """Number of set bits (int.bit_count needs Python 3.10)"""
+    return bin(mask).count("1")
+
+
+def skill_overlap(candidate_mask: int, job_mask: int) -> Optional[float]:
+    """Share of the job's skills the candidate has, or None for a job without skills"""
+    job_count = popcount(job_mask)
+    if not job_count:
+        return None
+    return popcount(candidate_mask & job_mask) / job_count
+
+
+def pack_masks(masks: Iterable[int], width: int):
+    """Pack masks into a (n, words) uint64 NumPy array for batch overlap"""
+    if np is None:
+        raise RuntimeError("numpy is required for packed skill masks")
+    words = max(1, (width + 63) // 64)
+    word_mask = (1 << 64) - 1
+    return np.array([[(mask >> (64 * word)) & word_mask for word in range(words)] for mask in masks],
+                    dtype=np.uint64).reshape(-1, words)
+
+
+def batch_skill_overlap(packed, job_mask: int):
+    """skill_overlap for every row of ``pack_masks`` output at once (NaN when the job has no skills)"""
+    job_count = popcount(job_mask)
+    job_words = pack_masks([job_mask], packed.shape[1] * 64)[0]
+    if not job_count:
+        return np.full(packed.shape[0], np.nan)
+    shared = packed & job_words
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(shared).sum(axis=1)
+    else:
+        counts = np.unpackbits(shared.view(np.uint8), axis=1).sum(axis=1)
+    return counts / job_count
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    """Process-wide vocabulary for job skill masks"""
+    global _vocabulary
+    if _vocabulary is None:
+        with _vocabulary_lock:
+            if _vocabulary is None:
+                _vocabulary = SkillVocabulary()
+    return _vocabulary
@@ -0,0 +1,256 @@
+"""
+Shared HTTP transport for outbound calls: pooled keep-alive connections,
+connect/read timeouts, jittered exponential retry and usage metrics
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+_sdk_retry_exceptions = None
+
+
+def sdk_retry_exceptions() -> Tuple[type, ...]:
+    """
+    Transient SDK errors worth retrying: dropped connections and 5xx
+    responses of whichever LLM SDKs are installed. Auth failures, bad
+    requests and other 4xx errors are not retried.
+    """
+    global _sdk_retry_exceptions
+    if _sdk_retry_exceptions is None:
+        errors = [ConnectionError, *RETRY_EXCEPTIONS]
+        try:
+            import openai
+            errors += [openai.APIConnectionError, openai.InternalServerError]
+        except (ImportError, AttributeError):
+            pass
+        try:
+            import anthropic
+            errors += [anthropic.APIConnectionError, anthropic.InternalServerError]
+        except (ImportError, AttributeError):
+            pass
+        try:
+            from google.api_core import exceptions as google_exceptions
+            errors.append(google_exceptions.ServerError)
+        except ImportError:
+            pass
+        _sdk_retry_exceptions = tuple(errors)
+    return _sdk_retry_exceptions
+
+
+class HTTPTransport:
+    """
+    One requests.Session with sized per-host connection pools.
+
+    ``pool_maxsize`` caps concurrent connections to any single host and
+    ``pool_block`` makes extra callers wait for a free connection instead of
+    opening throwaway ones. 429 responses are returned to the caller untouched
+    so the search rate limiter can honour Retry-After.
+    """
+
+    def __init__(self, connect_timeout: float = None, read_timeout: float = None,
+                 max_retries: int = None, backoff_base: float = None, backoff_max: float = None,
+                 pool_connections: int = None, pool_maxsize: int = None, pool_block: bool = True):
+        self.timeout: Tuple[float, float] = (
+            connect_timeout if connect_timeout is not None else config.HTTP_CONNECT_TIMEOUT,
+            read_timeout if read_timeout is not None else config.HTTP_READ_TIMEOUT
+        )
+        self.max_retries = max_retries if max_retries is not None else config.HTTP_MAX_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else config.HTTP_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else config.HTTP_BACKOFF_MAX
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            'requests': 0, 'retries': 0, 'failures': 0, 'timeouts': 0,
+            'pool_saturated': 0, 'peak_in_flight': 0, 'total_seconds': 0.0
+        })
+        # SDK calls that missed their deadline but are still running, per label
+        self._abandoned: Dict[str, int] = defaultdict(int)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _enter(self, key: str, limit: Optional[int]):
+        with self._lock:
+            metrics = self._metrics[key]
+            metrics['requests'] += 1
+            if limit is not None and self._in_flight[key] >= limit:
+                metrics['pool_saturated'] += 1
+            self._in_flight[key] += 1
+            metrics['peak_in_flight'] = max(metrics['peak_in_flight'], self._in_flight[key])
+
+    def _exit(self, key: str, elapsed: float):
+        with self._lock:
+            self._in_flight[key] -= 1
+            self._metrics[key]['total_seconds'] += elapsed
+
+    def _count(self, key: str, field: str):
+        with self._lock:
+            self._metrics[key][field] += 1
+
+    def request(self, method: str, url: str, retry_statuses=RETRY_STATUSES, **kwargs) -> requests.Response:
+        """Send a request with default timeouts, retrying transient failures"""
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlparse(url).netloc
+
+        for attempt in range(self.max_retries + 1):
+            self._enter(host, self.pool_maxsize)
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except RETRY_EXCEPTIONS as e:
+                if isinstance(e, requests.Timeout):
+                    self._count(host, 'timeouts')
+                if attempt >= self.max_retries:
+                    self._count(host, 'failures')
+                    raise
+                self._count(host, 'retries')
+                time.sleep(self._backoff(attempt))
+                continue
+            finally:
+                self._exit(host, time.monotonic() - start)
+
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                self._count(host, 'retries')
+                response.close()
+                time.sleep(self._backoff(attempt))
+                continue
+            if response.status_code >= 500:
+                self._count(host, 'failures')
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def call(self, label: str, func: Callable, timeout: float = None, retry_on: Tuple[type, ...] = None):
+        """
+        Run an SDK call (LLM clients bring their own HTTP stack) with the same
+        deadline, jittered retry and metrics as plain HTTP requests. Only
+        ``retry_on`` errors (by default transient connection and 5xx errors)
+        are retried; a call that missed its deadline is not.
+        """
+        retry_on = retry_on or sdk_retry_exceptions()
+        for attempt in range(self.max_retries + 1):
+            self._enter(label, None)
+            start = time.monotonic()
+            try:
+                if timeout:
+                    return self._call_with_deadline(label, func, timeout)
+                return func()
+            except TimeoutError:
+                # Retrying would block for another full deadline and abandon another thread
+                self._count(label, 'failures')
+                raise
+            except retry_on as e:
+                if attempt >= self.max_retries:
+                    self._count(label, 'failures')
+                    raise
+                self._count(label, 'retries')
+                print(f"{label} call failed ({e}), retrying")
+                time.sleep(self._backoff(attempt))
+            except Exception:
+                self._count(label, 'failures')
+                raise
+            finally:
+                self._exit(label, time.monotonic() - start)
+
+    def _call_with_deadline(self, label: str, func: Callable, timeout: float):
+        """
+        Run ``func`` on its own daemon thread and stop waiting after
+        ``timeout``. A Python thread can't be interrupted, so a timed-out
+        call is abandoned rather than left holding a shared worker; once
+        ``pool_maxsize`` abandoned calls for a label are still running, new
+        calls fail fast instead of piling up more threads.
+        """
+        with self._lock:
+            if self._abandoned[label] >= self.pool_maxsize:
+                self._metrics[label]['timeouts'] += 1
+                raise TimeoutError(f"{label}: {self._abandoned[label]} timed-out calls still running")
+        state = {'done': False, 'abandoned': False}
+        finished = threading.Event()
+
+        def run():
+            try:
+                state['result'] = func()
+            except BaseException as e:
+                state['error'] = e
+            finally:
+                with self._lock:
+                    state['done'] = True
+                    if state['abandoned']:
+                        self._abandoned[label] -= 1
+                finished.set()
+
+        threading.Thread(target=run, name=f'transport-call-{label}', daemon=True).start()
+        if not finished.wait(timeout):
+            with self._lock:
+                if not state['done']:
+                    state['abandoned'] = True
+                    self._abandoned[label] += 1
+                    self._metrics[label]['timeouts'] += 1
+            if state['abandoned']:
+                raise TimeoutError(f"{label} call timed out after {timeout}s")
+        if 'error' in state:
+            raise state['error']
+        return state['result']
+
+    def get_metrics(self) -> Dict:
+        """Per-host (or per-SDK label) request, retry and pool saturation counters"""
+        with self._lock:
+            hosts = {}
+            for key, metrics in self._metrics.items():
+                requests_made = metrics['requests']
+                hosts[key] = {
+                    'requests': requests_made,
+                    'retries': metrics['retries'],
+                    'failures': metrics['failures'],
+                    'timeouts': metrics['timeouts'],
+                    'in_flight': self._in_flight[key],
+                    'abandoned': self._abandoned.get(key, 0),
+                    'peak_in_flight': metrics['peak_in_flight'],
+                    'pool_saturated': metrics['pool_saturated'],
+                    'avg_seconds': round(metrics['total_seconds'] / requests_made, 3) if requests_made else 0.0
+                }
+            return {
+                'pool_maxsize_per_host': self.pool_maxsize,
+                'timeout': {'connect': self.timeout[0], 'read': self.timeout[1]},
+                'max_retries': self.max_retries,
+                'hosts': hosts
+            }
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Process-wide transport shared by search, SerpAPI and LLM clients"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport
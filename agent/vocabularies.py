@@ -0,0 +1,159 @@
+"""
+Keyword vocabularies shared by search, parsing and scoring
+"""
+import hashlib
+import json
+
+# Skill vocabulary used by the parser, also used to index cached profiles
+SKILL_PATTERNS = {
+    'programming': [
+        'python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'swift', 'kotlin',
+        'typescript', 'php', 'ruby', 'scala', 'r', 'matlab', 'perl', 'bash', 'shell'
+    ],
+    'frameworks': [
+        'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
+        'laravel', 'rails', 'asp.net', 'fastapi', 'gin', 'echo', 'koa'
+    ],
+    'databases': [
+        'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
+        'dynamodb', 'sqlite', 'oracle', 'sql server', 'neo4j', 'influxdb'
+    ],
+    'cloud': [
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
+        'jenkins', 'gitlab', 'github actions', 'circleci', 'travis ci'
+    ],
+    'ml_ai': [
+        'machine learning', 'deep learning', 'ai', 'artificial intelligence',
+        'tensorflow', 'pytorch', 'scikit-learn', 'keras', 'opencv', 'numpy',
+        'pandas', 'matplotlib', 'seaborn', 'jupyter', 'spark', 'hadoop'
+    ],
+    'mobile': [
+        'ios', 'android', 'react native', 'flutter', 'xamarin', 'swift',
+        'kotlin', 'objective-c', 'xcode', 'android studio'
+    ]
+}
+
+# Keywords EnhancedLinkedInSearcher builds search queries from
+SEARCH_KEYWORDS = [
+    'python', 'javascript', 'java', 'react', 'node.js', 'aws', 'docker',
+    'kubernetes', 'machine learning', 'ai', 'data science', 'devops',
+    'frontend', 'backend', 'full stack', 'mobile', 'ios', 'android',
+    'sql', 'nosql', 'mongodb', 'postgresql', 'redis', 'elasticsearch',
+    'software engineer', 'developer', 'architect', 'manager', 'lead'
+]
+
+SEARCH_LOCATIONS = ['california', 'new york', 'texas', 'florida', 'washington', 'seattle', 'san francisco', 'austin']
+
+# Education hints the parser looks for in headlines
+EDUCATION_KEYWORDS = [
+    'phd', 'doctorate', 'masters', 'ms', 'ma', 'bachelors', 'bs', 'ba',
+    'computer science', 'cs', 'engineering', 'mathematics', 'statistics'
+]
+
+# Companies the parser recognizes in headlines
+HEADLINE_COMPANIES = [
+    'google', 'microsoft', 'apple', 'amazon', 'meta', 'facebook', 'netflix',
+    'uber', 'lyft', 'airbnb', 'twitter', 'linkedin', 'salesforce', 'oracle',
+    'ibm', 'intel', 'nvidia', 'amd', 'cisco', 'vmware', 'adobe', 'paypal',
+    'stripe', 'square', 'zoom', 'slack', 'dropbox', 'box', 'atlassian'
+]
+
+# Skills the scorer extracts from job descriptions
+JOB_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+    'node.js', 'django', 'flask', 'fastapi', 'spring', 'express', 'ruby',
+    'go', 'rust', 'c++', 'c#', '.net', 'php', 'sql', 'postgresql', 'mysql',
+    'mongodb', 'redis', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'terraform', 'jenkins', 'git', 'github', 'gitlab', 'ci/cd', 'agile',
+    'scrum', 'machine learning', 'ml', 'ai', 'deep learning', 'tensorflow',
+    'pytorch', 'scikit-learn', 'pandas', 'numpy', 'spark', 'hadoop',
+    'kafka', 'elasticsearch', 'microservices', 'api', 'rest', 'graphql',
+    'frontend', 'backend', 'full stack', 'devops', 'data science'
+]
+
+# Tech hubs the scorer looks for in job descriptions, in priority order
+JOB_LOCATIONS = [
+    'san francisco', 'new york', 'seattle', 'austin', 'boston', 'los angeles',
+    'chicago', 'denver', 'atlanta', 'miami', 'dallas', 'houston', 'phoenix',
+    'portland', 'nashville', 'salt lake city', 'minneapolis', 'detroit'
+]
+
+# Elite schools for education scoring
+ELITE_SCHOOLS = [
+    'mit', 'stanford', 'harvard', 'caltech', 'berkeley', 'uc berkeley',
+    'carnegie mellon', 'cmu', 'princeton', 'yale', 'columbia', 'upenn',
+    'cornell', 'brown', 'dartmouth', 'duke', 'northwestern', 'georgia tech',
+    'gatech', 'university of michigan', 'ucla', 'usc', 'university of illinois',
+    'uiuc', 'university of texas', 'ut austin', 'university of washington',
+    'uw', 'university of wisconsin', 'university of maryland', 'umd'
+]
+
+# Top tech companies for company scoring
+TOP_TECH_COMPANIES = [
+    'google', 'alphabet', 'microsoft', 'apple', 'amazon', 'meta', 'facebook',
+    'netflix', 'tesla', 'nvidia', 'intel', 'amd', 'oracle', 'salesforce',
+    'adobe', 'paypal', 'stripe', 'square', 'airbnb', 'uber', 'lyft',
+    'twitter', 'linkedin', 'github', 'spotify', 'slack', 'zoom', 'dropbox',
+    'palantir', 'databricks', 'snowflake', 'mongodb', 'elastic', 'confluent',
+    'hashicorp', 'gitlab', 'atlassian', 'jira', 'confluence', 'notion',
+    'figma', 'canva', 'discord', 'twitch', 'roblox', 'unity', 'epic games'
+]
+
+# Industries the scorer infers from job descriptions, in priority order
+INDUSTRY_KEYWORDS = {
+    'fintech': ['fintech', 'financial', 'banking', 'payments', 'stripe', 'paypal', 'square'],
+    'ai/ml': ['ai', 'machine learning', 'ml', 'artificial intelligence', 'deep learning'],
+    'cloud': ['aws', 'azure', 'gcp', 'cloud', 'kubernetes', 'docker'],
+    'startup': ['startup', 'venture', 'funded', 'series a', 'series b'],
+    'enterprise': ['enterprise', 'saas', 'b2b', 'enterprise software']
+}
+
+# Degrees and fields of study for education scoring, highest degree first
+DOCTORAL_DEGREES = ['phd', 'doctorate', 'ph.d']
+MASTERS_DEGREES = ['masters', 'ms', 'ma', 'm.s', 'm.a']
+BACHELORS_DEGREES = ['bachelors', 'bs', 'ba', 'b.s', 'b.a']
+
+TECH_FIELDS = [
+    'computer science', 'cs', 'engineering', 'mathematics', 'statistics',
+    'data science', 'machine learning', 'artificial intelligence', 'ai',
+    'software engineering', 'information technology', 'it'
+]
+
+# Business/management fields (relevant for some roles)
+BUSINESS_FIELDS = ['business', 'management', 'economics', 'finance', 'mba']
+
+# Job description phrases that make a role remote-friendly
+REMOTE_INDICATORS = ['remote', 'work from home', 'wfh', 'anywhere']
+
+# Job description phrases that mean a degree is required
+EDUCATION_REQUIREMENTS = ['phd', 'doctorate', 'masters', 'degree required']
+
+
+def all_vocabularies() -> dict:
+    """Every vocabulary by matcher category name"""
+    vocabularies = {f'skill:{category}': skills for category, skills in SKILL_PATTERNS.items()}
+    vocabularies.update({
+        'search_keyword': SEARCH_KEYWORDS,
+        'search_location': SEARCH_LOCATIONS,
+        'education': EDUCATION_KEYWORDS,
+        'headline_company': HEADLINE_COMPANIES,
+        'job_skill': JOB_SKILLS,
+        'job_location': JOB_LOCATIONS,
+        'elite_school': ELITE_SCHOOLS,
+        'doctoral_degree': DOCTORAL_DEGREES,
+        'masters_degree': MASTERS_DEGREES,
+        'bachelors_degree': BACHELORS_DEGREES,
+        'tech_field': TECH_FIELDS,
+        'business_field': BUSINESS_FIELDS,
+        'top_company': TOP_TECH_COMPANIES,
+        'remote': REMOTE_INDICATORS,
+        'education_requirement': EDUCATION_REQUIREMENTS
+    })
+    vocabularies.update({f'industry:{industry}': keywords for industry, keywords in INDUSTRY_KEYWORDS.items()})
+    return vocabularies
+
+
+def vocabulary_hash() -> str:
+    """Digest of every vocabulary; changes whenever a word list is edited"""
+    encoded = json.dumps(all_vocabularies(), sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load-test the whole /match pipeline offline against recorded search responses
+
+Record provider responses once with a live provider:
+    SEARCH_MODE=record python agent/main.py   (then send some /match requests)
+
+Then replay them at any concurrency without touching the network:
+    python benchmarks/match_load_test.py --requests 50 --concurrency 8 --latency lognormal:-1.2,0.4
+
+Each request gets a distinct requisition line so the exact-match and
+near-duplicate caches are bypassed and every request runs a full search.
+LLM outreach generation still uses whatever AI provider keys are set; unset
+them to measure the template path only.
+
+Usage:
+    python benchmarks/match_load_test.py [--requests 20] [--concurrency 4]
+        [--latency recorded] [--provider google] [--recordings DIR] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent / "agent"
+
+JOB_DESCRIPTIONS = [
+    "Senior Backend Engineer with Python, Django and PostgreSQL experience in San Francisco",
+    "Machine Learning Engineer working on NLP models with PyTorch and TensorFlow, remote friendly",
+    "Frontend Engineer skilled in React, TypeScript and Node.js based in New York",
+    "DevOps Engineer with Kubernetes, Docker, AWS and Terraform experience in Seattle",
+]
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline /match load test using replayed search responses")
+    parser.add_argument("--requests", type=int, default=20, help="Total /match requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--latency", default="recorded", help="Replay latency model (see SEARCH_REPLAY_LATENCY)")
+    parser.add_argument("--provider", help="Recorded provider to replay (google or serpapi)")
+    parser.add_argument("--recordings", help="Recordings directory (defaults to SEARCH_RECORDINGS_DIR)")
+    parser.add_argument("--max-candidates", type=int, default=10)
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # Configure replay before the app (and config) is imported
+    os.environ["SEARCH_MODE"] = "replay"
+    os.environ["SEARCH_REPLAY_LATENCY"] = args.latency
+    os.environ["JD_SIMILARITY_THRESHOLD"] = "1.1"
+    work_dir = tempfile.mkdtemp(prefix="synapse-load-")
+    os.environ["PROFILE_STORE_FILE"] = os.path.join(work_dir, "profiles.db")
+    if args.provider:
+        os.environ["SEARCH_REPLAY_PROVIDER"] = args.provider
+    if args.recordings:
+        os.environ["SEARCH_RECORDINGS_DIR"] = str(Path(args.recordings).resolve())
+
+    os.chdir(AGENT_DIR)
+    sys.path.append(str(AGENT_DIR))
+    from fastapi.testclient import TestClient
+    import main as app_module
+
+    # Keep the results file the app writes after each job out of the checkout
+    os.chdir(work_dir)
+    client = TestClient(app_module.app)
+
+    def send(n: int) -> dict:
+        job_description = f"{JOB_DESCRIPTIONS[n % len(JOB_DESCRIPTIONS)]}. Requisition load-{n}"
+        start = time.perf_counter()
+        response = client.post("/match", json={
+            "job_description": job_description,
+            "max_candidates": args.max_candidates
+        })
+        elapsed = (time.perf_counter() - start) * 1000
+        found = response.json().get("candidates_found", 0) if response.status_code == 200 else 0
+        return {"status": response.status_code, "ms": elapsed, "candidates": found}
+
+    print(f"/match load test: {args.requests} requests, concurrency {args.concurrency}, "
+          f"replay latency '{args.latency}'")
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(send, range(args.requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [result["ms"] for result in results]
+    ok = sum(1 for result in results if result["status"] == 200)
+    summary = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "latency_model": args.latency,
+        "succeeded": ok,
+        "throughput_rps": round(args.requests / wall, 2),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "max_ms": round(max(latencies), 1),
+        "mean_candidates": round(statistics.mean(result["candidates"] for result in results), 1),
+        "replay_misses": getattr(app_module.searcher.provider, "misses", 0)
+    }
+    print("=" * 60)
+    for key, value in summary.items():
+        print(f"{key:<18}{value}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"summary": summary, "requests": results}, f, indent=2)
+
+    return 0 if ok == args.requests else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark SERP extraction over the saved Google result pages in fixtures/serp
+
+Compares the targeted extractor in agent/serp.py against the previous
+approach (full html.parser tree, then walking every link) and reports
+parse time per page so regressions are easy to spot.
+
+Usage:
+    python benchmarks/serp_benchmark.py [--repeat 20] [--json results.json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "agent"))
+
+from bs4 import BeautifulSoup
+import config
+from serp import PARSER_BACKEND, extract_serp_results
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "serp"
+
+
+def full_tree_extract(html: str) -> int:
+    """The pre-serp.py approach: build the whole tree and walk every link"""
+    soup = BeautifulSoup(html, 'html.parser')
+    found = 0
+    for result in soup.find_all('div', class_='g'):
+        if result.find('h3') and result.find('a'):
+            found += 1
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if config.LINKEDIN_DOMAIN in href and '/in/' in href:
+            parent = link.find_parent()
+            if parent:
+                parent.find('h3')
+                parent.get_text()
+    return found
+
+
+def time_call(func, html: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SERP extraction benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per fixture")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return 1
+
+    print(f"SERP extraction benchmark ({PARSER_BACKEND} backend, {args.repeat} runs per page)")
+    print("=" * 78)
+    print(f"{'fixture':<34}{'KB':>7}{'results':>9}{'baseline ms':>14}{'serp.py ms':>13}")
+
+    rows = []
+    for path in fixtures:
+        html = path.read_text(encoding="utf-8")
+        results = extract_serp_results(html)
+        baseline = statistics.median(time_call(full_tree_extract, html, args.repeat))
+        targeted = statistics.median(time_call(extract_serp_results, html, args.repeat))
+        rows.append({
+            "fixture": path.name,
+            "size_kb": round(len(html) / 1024, 1),
+            "linkedin_results": len(results),
+            "baseline_ms": round(baseline, 3),
+            "serp_ms": round(targeted, 3),
+            "speedup": round(baseline / targeted, 2) if targeted else None
+        })
+        print(f"{path.name:<34}{rows[-1]['size_kb']:>7}{len(results):>9}{baseline:>14.3f}{targeted:>13.3f}")
+
+    total_baseline = sum(row["baseline_ms"] for row in rows)
+    total_targeted = sum(row["serp_ms"] for row in rows)
+    print("-" * 78)
+    print(f"Mean per page: baseline {total_baseline / len(rows):.3f} ms, "
+          f"serp.py {total_targeted / len(rows):.3f} ms "
+          f"({total_baseline / total_targeted:.1f}x)")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": PARSER_BACKEND, "repeat": args.repeat, "pages": rows}, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+pytest setup: the agent modules import each other flat (``import config``),
+so the agent directory goes on sys.path as it does for main.py
+"""
+import os
+import sys
+
+AGENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agent')
+if AGENT_DIR not in sys.path:
+    sys.path.insert(0, AGENT_DIR)
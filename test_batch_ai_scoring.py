@@ -0,0 +1,155 @@
+"""
+Batched LLM scoring: JSON reply validation and the per-candidate fallback
+"""
+import json
+import math
+import re
+
+import pytest
+
+from candidate import Candidate
+from enhanced_ai import SCORE_CATEGORIES, EnhancedAIClient
+from job_context import JobContext
+from scorer import CandidateScorer
+
+JOB = 'Senior Python engineer in San Francisco: Django, PostgreSQL, AWS, Docker and Kubernetes.'
+
+
+def _entry(index, value=8.0, **overrides):
+    entry = {'id': index, **{category: value for category in SCORE_CATEGORIES}}
+    entry.update(overrides)
+    return entry
+
+
+def _single_reply(value):
+    return '\n'.join(f'{category.title()}: {value}' for category in SCORE_CATEGORIES)
+
+
+class FakeProvider:
+    """
+    Stands in for generate_text. Batch prompts are answered for the ids in
+    ``batch_ids`` only (all ids when None), with each candidate's number as
+    its score; single prompts get ``single_value`` for every category.
+    """
+
+    def __init__(self, batch_ids=None, single_value=6.0, fail=False):
+        self.batch_ids = batch_ids
+        self.single_value = single_value
+        self.fail = fail
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    def __call__(self, prompt, max_tokens=1000, json_mode=False):
+        if json_mode:
+            self.batch_calls += 1
+            if self.fail:
+                return None
+            profiles = re.findall(r'"id": (\d+),\s*"name": "Candidate (\d+)"', prompt)
+            return json.dumps({'scores': [
+                _entry(int(index), float(number) % 10 + 1) for index, number in profiles
+                if self.batch_ids is None or int(number) in self.batch_ids
+            ]})
+        self.single_calls += 1
+        return None if self.fail else _single_reply(self.single_value)
+
+
+@pytest.fixture
+def client():
+    client = EnhancedAIClient()
+    client.ai_client = object()
+    return client
+
+
+def _candidates(count):
+    return [{'name': f'Candidate {index}', 'headline': 'Engineer'} for index in range(count)]
+
+
+def test_parses_fenced_reply_with_preamble(client):
+    reply = 'Here are the scores:\n```json\n' + json.dumps({'scores': [_entry(1, 9.0), _entry(0, 4.5)]}) + '\n```'
+    assert client._parse_batch_scoring_response(reply, 2) == [
+        dict.fromkeys(SCORE_CATEGORIES, 4.5), dict.fromkeys(SCORE_CATEGORIES, 9.0)]
+
+
+def test_accepts_bare_list(client):
+    reply = json.dumps([_entry(0, 7)])
+    assert client._parse_batch_scoring_response(reply, 1) == [dict.fromkeys(SCORE_CATEGORIES, 7.0)]
+
+
+@pytest.mark.parametrize('reply', ['not json at all', '{"scores": [', '{"scores": {"0": {}}}', '"scores"', '42'])
+def test_unusable_reply_scores_nobody(client, reply):
+    assert client._parse_batch_scoring_response(reply, 3) == [None, None, None]
+
+
+def test_invalid_entries_are_dropped(client):
+    entries = [
+        _entry(-1), _entry(3), _entry('0'), _entry(True), _entry(None), 'not an entry',
+        _entry(0, 5.0), _entry(0, 9.0),                 # duplicated id: the first one wins
+        _entry(1, skills='high'),                       # non-numeric score
+        _entry(2, location=True)                        # booleans are not scores
+    ]
+    reply = json.dumps({'scores': entries})
+    assert client._parse_batch_scoring_response(reply, 3) == [dict.fromkeys(SCORE_CATEGORIES, 5.0), None, None]
+
+
+def test_incomplete_or_non_finite_entries_are_dropped(client):
+    missing = _entry(0)
+    del missing['tenure']
+    reply = json.dumps({'scores': [missing, _entry(1, skills=math.nan), _entry(2, company=math.inf)]})
+    assert client._parse_batch_scoring_response(reply, 3) == [None, None, None]
+
+
+def test_scores_are_clamped_to_rubric_range(client):
+    reply = json.dumps([_entry(0, 0, skills=12.5, location=-3, tenure=10)])
+    assert client._parse_batch_scoring_response(reply, 1) == [
+        {'education': 1.0, 'trajectory': 1.0, 'company': 1.0, 'skills': 10.0, 'location': 1.0, 'tenure': 10.0}]
+
+
+def test_batches_keep_input_order(client, monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(client, 'generate_text', provider)
+    scores = client.score_candidates_batch(_candidates(7), JOB, batch_size=3)
+    assert provider.batch_calls == 3 and provider.single_calls == 0
+    assert [entry['education'] for entry in scores] == [float(index % 10 + 1) for index in range(7)]
+
+
+def test_candidates_missing_from_reply_are_scored_individually(client, monkeypatch):
+    provider = FakeProvider(batch_ids={0, 2, 3})
+    monkeypatch.setattr(client, 'generate_text', provider)
+    scores = client.score_candidates_batch(_candidates(5), JOB, batch_size=5)
+    assert provider.batch_calls == 1 and provider.single_calls == 2
+    assert [entry['education'] for entry in scores] == [1.0, 6.0, 3.0, 4.0, 6.0]
+
+
+def test_unscorable_candidates_come_back_as_none(client, monkeypatch):
+    monkeypatch.setattr(client, 'generate_text', FakeProvider(fail=True))
+    assert client.score_candidates_batch(_candidates(4), JOB, batch_size=2) == [None] * 4
+
+
+def test_no_client_scores_nobody():
+    client = EnhancedAIClient()
+    client.ai_client = None
+    assert client.score_candidates_batch(_candidates(3), JOB) == [None] * 3
+
+
+def test_apply_ai_scores_keeps_rule_scores_of_unscored_candidates(client, monkeypatch):
+    scorer = CandidateScorer()
+    job = JobContext(JOB)
+    candidates = [Candidate(name=f'Candidate {index}', headline=headline, location=location)
+                  for index, (headline, location) in enumerate([
+                      ('Senior Python Engineer', 'San Francisco'), ('Junior Developer', 'London'),
+                      ('Lead Engineer', 'Palo Alto'), ('Intern', 'Austin')])]
+    shortlist = scorer.score_candidates(candidates, job)
+    rule_scores = {candidate.name: (candidate.fit_score, candidate.score_breakdown) for candidate in shortlist}
+
+    monkeypatch.setattr(client, 'generate_text', FakeProvider(batch_ids={1}))
+    monkeypatch.setattr(client, '_request_score', lambda candidate, job_description: None)
+    ranked, ai_scored = scorer.apply_ai_scores(shortlist, job, client)
+
+    assert ai_scored == 1
+    for candidate in ranked:
+        if candidate.name == 'Candidate 1':
+            assert candidate.score_breakdown == dict.fromkeys(SCORE_CATEGORIES, 2.0)
+        else:
+            assert (candidate.fit_score, candidate.score_breakdown) == rule_scores[candidate.name]
+    assert [candidate.fit_score for candidate in ranked] == sorted(
+        (candidate.fit_score for candidate in ranked), reverse=True)
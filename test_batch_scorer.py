@@ -0,0 +1,104 @@
+"""
+BatchScorer: the vectorized path scores and orders a pool exactly like the rule path
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from batch_scorer import BatchScorer, CandidateFeatures
+from candidate import Candidate
+from job_context import JobContext
+from scorer import CandidateScorer
+
+HEADLINES = [
+    'Senior Python Engineer at Google', 'Junior Developer', 'Staff Engineer, Kubernetes and Go',
+    'Lead Data Scientist - machine learning, pandas, spark', 'Associate Product Manager',
+    'Full stack developer (React, Node.js, PostgreSQL)', 'Intern', 'Principal Architect | AWS | Terraform',
+    'Software Engineer', 'Graduate engineer, C++ and Rust', 'Head of DevOps', ''
+]
+EDUCATIONS = [
+    (), ('MIT',), ('Stanford University', 'BS Computer Science'), ('PhD Physics',), ('Masters in Statistics',),
+    ('State College',), ('MBA',), ('Bachelors',), ('Computer Science',), ('Mathematics',)
+]
+COMPANIES = [
+    (), ('Google',), ('Acme Software',), ('First Bank', 'Capital Finance'), ('Local Shop',),
+    ('Stripe', 'Square'), ('A', 'B', 'C', 'D', 'E'), ('Digital Health Inc',), ('Hospital Group',)
+]
+LOCATIONS = [
+    'San Francisco, CA', 'Palo Alto', 'New York, NY', 'Brooklyn', 'Seattle, WA', 'Redmond',
+    'Austin, Texas', 'Remote', 'London', 'Unknown'
+]
+SKILLS = ['python', 'go', 'kubernetes', 'react', 'aws', 'sql', 'machine learning', 'docker', 'java', 'excel']
+JOBS = [
+    'Senior Python engineer in San Francisco: Django, PostgreSQL, AWS, Docker and Kubernetes.',
+    'Machine learning engineer, New York, fintech. PhD or masters required. PyTorch, pandas, spark.',
+    'Remote frontend developer: React, TypeScript, GraphQL. Work from home anywhere.',
+    'Go and Rust backend developer for a healthcare startup in Seattle',
+    'We are hiring a generalist.'
+]
+
+
+def _pool(size, seed=11):
+    rng = random.Random(seed)
+    return [
+        {
+            'name': f'Candidate {index}',
+            'linkedin_url': f'https://www.linkedin.com/in/candidate-{index}',
+            'headline': rng.choice(HEADLINES),
+            'education': list(rng.choice(EDUCATIONS)),
+            'companies': list(rng.choice(COMPANIES)),
+            'location': rng.choice(LOCATIONS),
+            'skills': rng.sample(SKILLS, rng.randint(0, 4))
+        }
+        for index in range(size)
+    ]
+
+
+def _scores(candidates):
+    return [(candidate.linkedin_url, candidate.fit_score, candidate.score_breakdown) for candidate in candidates]
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return CandidateScorer()
+
+
+@pytest.mark.parametrize('job_description', JOBS)
+def test_matches_rule_path(scorer, job_description):
+    job = JobContext(job_description)
+    pool = _pool(400)
+    expected = scorer._rank(scorer._score_with_rules([Candidate.from_dict(data) for data in pool], job), None)
+    actual = BatchScorer(scorer).score_candidates([Candidate.from_dict(data) for data in pool], job)
+    assert _scores(actual) == _scores(expected)
+
+
+@pytest.mark.parametrize('top_k', [1, 7, 50, 400, 1000])
+def test_matches_rule_path_with_top_k(scorer, top_k):
+    job = JobContext(JOBS[0])
+    pool = _pool(400, seed=3)
+    expected = scorer._rank(scorer._score_with_rules([Candidate.from_dict(data) for data in pool], job), top_k)
+    actual = BatchScorer(scorer).score_candidates([Candidate.from_dict(data) for data in pool], job, top_k=top_k)
+    assert _scores(actual) == _scores(expected)
+
+
+def test_features_are_reused_across_jobs(scorer):
+    batch = BatchScorer(scorer)
+    features = CandidateFeatures([Candidate.from_dict(data) for data in _pool(200, seed=5)], scorer)
+    for job_description in JOBS:
+        job = JobContext(job_description)
+        expected = scorer._rank(scorer._score_with_rules(
+            [Candidate.from_dict(data) for data in _pool(200, seed=5)], job), None)
+        assert _scores(batch.score_candidates(features, job)) == _scores(expected)
+
+
+def test_weighted_fit_scores_round_like_rule_path(scorer):
+    rng = random.Random(2)
+    batch = BatchScorer(scorer)
+    categories = list(scorer.weights)
+    breakdown = np.array([[rng.choice([1.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 9.5, 10.0]) for _ in categories]
+                          for _ in range(2000)])
+    for weights in (scorer.weights, {category: rng.random() for category in categories}):
+        expected = [scorer._calculate_weighted_score(dict(zip(categories, row)), weights) for row in breakdown.tolist()]
+        assert batch.weighted_fit_scores(breakdown, weights).tolist() == expected
@@ -0,0 +1,90 @@
+"""
+CircuitBreaker state transitions and the failed-query NegativeCache
+"""
+import time
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, NegativeCache
+
+
+def _breaker(**kwargs):
+    options = {'failure_threshold': 3, 'reset_timeout': 0.05, 'half_open_probes': 1}
+    options.update(kwargs)
+    return CircuitBreaker('test', **options)
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.get_status()['rejected_requests'] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_after_reset_timeout_allows_limited_probes():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(0.06)
+
+    assert not breaker.is_open()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    # The single probe slot is taken
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+
+def test_successful_probe_closes():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(0.06)
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_failed_probe_reopens():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(0.06)
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_status()['times_opened'] == 2
+
+
+def test_negative_cache_expires_and_evicts_oldest():
+    cache = NegativeCache(ttl=0.05, max_entries=2)
+    cache.add('a')
+    assert 'a' in cache
+    time.sleep(0.06)
+    assert 'a' not in cache
+
+    cache.add('b')
+    cache.add('c')
+    cache.add('d')
+    assert 'b' not in cache
+    assert 'c' in cache and 'd' in cache
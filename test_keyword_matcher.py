@@ -0,0 +1,68 @@
+"""
+KeywordMatcher finds exactly what a per-term whole-word regex loop finds
+"""
+import random
+import re
+
+from keyword_matcher import _BOUNDARY_AFTER, _BOUNDARY_BEFORE, KeywordMatcher, get_keyword_matcher
+
+SAMPLE_TEXTS = [
+    'Go developer at Google',
+    'React Native engineer building iOS and Android apps',
+    'C++ and C# developer, .NET, ci/cd pipelines',
+    'MS Teams administrator',
+    'Senior ML engineer in San Francisco, PhD Stanford',
+    'Machine learning engineer | PyTorch, TensorFlow | ex-Meta, New York',
+    'Backend engineer (Python/Django, PostgreSQL, AWS) - remote',
+    'Data scientist, MBA, previously at Goldman Sachs',
+    '',
+    'unknown'
+]
+
+
+def _loop_matches(matcher, text):
+    """The old approach: one whole-word regex search per vocabulary term"""
+    text = (text or '').lower()
+    found = {}
+    for category, terms in matcher.vocabularies.items():
+        hits = [term for term in terms
+                if re.search(_BOUNDARY_BEFORE + re.escape(term) + _BOUNDARY_AFTER, text)]
+        if hits:
+            found[category] = hits
+    return found
+
+
+def _random_texts(matcher, count=500, seed=7):
+    terms = [term for terms in matcher.vocabularies.values() for term in terms]
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.sample(terms, 4))} at {rng.choice(terms)}, {rng.choice(terms).upper()}"
+            for _ in range(count)]
+
+
+def test_matches_per_term_regex_loop():
+    matcher = get_keyword_matcher()
+    for text in SAMPLE_TEXTS + _random_texts(matcher):
+        assert dict(matcher.find(text)) == _loop_matches(matcher, text), text
+
+
+def test_whole_words_only():
+    matcher = get_keyword_matcher()
+    assert 'go' not in matcher.find('Engineer at Google')['job_skill']
+    assert matcher.find('MS Teams administrator')['job_skill'] == []
+
+
+def test_long_match_counts_contained_terms():
+    matcher = KeywordMatcher({'mobile': ['react native'], 'frameworks': ['react', 'vue']})
+    matches = matcher.find('React Native developer')
+    assert matches['mobile'] == ['react native']
+    assert matches['frameworks'] == ['react']
+
+
+def test_results_follow_vocabulary_order():
+    matcher = KeywordMatcher({'skills': ['python', 'go', 'rust']})
+    assert matcher.find('rust, go and python')['skills'] == ['python', 'go', 'rust']
+
+
+def test_punctuated_terms():
+    matcher = KeywordMatcher({'skills': ['c++', 'c#', '.net', 'ci/cd']})
+    assert matcher.find('C++/C# on .NET with CI/CD')['skills'] == ['c++', 'c#', '.net', 'ci/cd']
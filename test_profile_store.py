@@ -0,0 +1,60 @@
+"""
+ProfileStore upserts: stored profiles are merged, never replaced
+"""
+import threading
+
+from profile_store import ProfileStore
+
+URL = 'https://www.linkedin.com/in/jane-doe'
+
+
+def _store(tmp_path):
+    return ProfileStore(str(tmp_path / 'profiles.db'))
+
+
+def test_upsert_merges_fields(tmp_path):
+    store = _store(tmp_path)
+    store.save_profiles([{'linkedin_url': URL, 'name': 'Jane Doe', 'headline': 'ML Engineer', 'skills': ['python']}])
+    # A later, sparser record keeps what it doesn't mention
+    store.save_profiles([{'linkedin_url': URL, 'name': None, 'headline': '', 'location': 'Berlin'}])
+
+    profile = store.get_profile(URL)
+    assert profile['name'] == 'Jane Doe'
+    assert profile['headline'] == 'ML Engineer'
+    assert profile['skills'] == ['python']
+    assert profile['location'] == 'Berlin'
+
+
+def test_url_variants_share_one_row(tmp_path):
+    store = _store(tmp_path)
+    store.save_profiles([{'linkedin_url': 'http://de.linkedin.com/in/Jane-Doe/', 'name': 'Jane Doe'}])
+    store.save_profiles([{'linkedin_url': URL + '?trk=x', 'location': 'Berlin'}])
+
+    assert [url for url in store.iter_profile_urls() if 'jane-doe' in url] == [URL]
+    assert store.get_profile(URL) == {'linkedin_url': URL, 'name': 'Jane Doe', 'location': 'Berlin'}
+
+
+def test_concurrent_upserts_keep_every_field(tmp_path):
+    store = _store(tmp_path)
+    writers = 8
+    rounds = 10
+    errors = []
+
+    def write(worker):
+        try:
+            for round_number in range(rounds):
+                store.save_profiles([{'linkedin_url': URL, f'field_{worker}': round_number, 'name': 'Jane Doe'}])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    profile = store.get_profile(URL)
+    assert profile['name'] == 'Jane Doe'
+    for worker in range(writers):
+        assert profile[f'field_{worker}'] == rounds - 1
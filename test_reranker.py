@@ -0,0 +1,131 @@
+"""
+Re-ranking: weight validation and ScoredPool ordering under custom weights
+"""
+import itertools
+import math
+
+import pytest
+
+import config
+from candidate import SCORE_CATEGORIES, Candidate
+from job_context import JobContext
+from reranker import ScoredPool, normalize_weights
+from scorer import CandidateScorer
+
+JOB = 'Senior Python engineer in San Francisco: Django, PostgreSQL, AWS, Docker and Kubernetes.'
+HEADLINES = ['Senior Python Engineer', 'Junior Developer', 'Lead Engineer, AWS and Docker', 'Intern']
+EDUCATIONS = [('MIT',), ('Bachelors',), ()]
+COMPANIES = [('Google',), ('Acme Software',), ('Local Shop',)]
+LOCATIONS = ['San Francisco, CA', 'Palo Alto', 'London']
+
+
+class RecordingMessenger:
+    def __init__(self):
+        self.calls = []
+
+    def generate_outreach_messages(self, candidates, job, use_ai=True):
+        self.calls.append(([candidate.name for candidate in candidates], use_ai))
+        for candidate in candidates:
+            candidate.outreach_message = f'Hi {candidate.name}'
+        return candidates
+
+
+def _candidates(size):
+    profiles = itertools.islice(itertools.cycle(itertools.product(HEADLINES, EDUCATIONS, COMPANIES, LOCATIONS)), size)
+    return [
+        Candidate(name=f'Candidate {index}', headline=headline, education=education,
+                  companies=companies, location=location)
+        for index, (headline, education, companies, location) in enumerate(profiles)
+    ]
+
+
+def _scored_pool(scorer, size, top_k):
+    job = JobContext(JOB)
+    candidates = _candidates(size)
+    shortlist = scorer.score_candidates(candidates, job, top_k=top_k)
+    messenger = RecordingMessenger()
+    messenger.generate_outreach_messages(shortlist, job, use_ai=False)
+    messenger.calls.clear()
+    return ScoredPool(candidates, job, scorer, top_k), messenger
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return CandidateScorer()
+
+
+def test_normalize_weights_scales_to_one_in_rubric_order():
+    weights = normalize_weights({'tenure': 1, 'skills': 3})
+    assert list(weights) == list(SCORE_CATEGORIES)
+    assert weights == {'education': 0.0, 'trajectory': 0.0, 'company': 0.0,
+                       'skills': 0.75, 'location': 0.0, 'tenure': 0.25}
+
+
+def test_normalize_weights_keeps_weights_that_already_sum_to_one():
+    weights = {'education': 0.2, 'trajectory': 0.2, 'company': 0.15, 'skills': 0.25, 'location': 0.1, 'tenure': 0.1}
+    assert normalize_weights(weights) == weights
+
+
+@pytest.mark.parametrize('weights, message', [
+    ({'skills': 1, 'salary': 1}, 'Unknown score categories: salary'),
+    ({'skills': -0.5, 'tenure': 1}, 'must not be negative'),
+    ({'skills': math.nan}, 'finite'),
+    ({'skills': math.inf}, 'finite'),
+    ({'skills': 1e308, 'tenure': 1e308}, 'too large'),
+    ({'skills': 0, 'tenure': 0}, 'At least one weight must be positive'),
+    ({}, 'At least one weight must be positive'),
+])
+def test_normalize_weights_rejects_unusable_weights(weights, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_weights(weights)
+
+
+@pytest.mark.parametrize('size', [30, 150])
+def test_rerank_orders_by_new_weights(scorer, size):
+    pool, messenger = _scored_pool(scorer, size, top_k=10)
+    breakdowns = pool._get_breakdowns()
+    rows = [dict(zip(SCORE_CATEGORIES, row)) for row in breakdowns.tolist()] \
+        if not isinstance(breakdowns, list) else breakdowns
+
+    for weights in (scorer.weights, normalize_weights({'location': 1}), normalize_weights({'education': 2, 'company': 1})):
+        ranked, _ = pool.rerank(weights, messenger)
+        scored = sorted(((candidate.name, scorer._calculate_weighted_score(breakdown, weights))
+                         for candidate, breakdown in zip(pool.candidates, rows)),
+                        key=lambda entry: entry[1], reverse=True)
+        assert [(candidate.name, fit_score) for candidate, fit_score, _ in ranked] == scored[:10]
+
+
+def test_small_and_large_pools_rank_alike(scorer, monkeypatch):
+    weights = normalize_weights({'location': 3, 'trajectory': 1})
+    results = []
+    for min_candidates in (10 ** 6, 1):
+        monkeypatch.setattr(config, 'BATCH_SCORING_MIN_CANDIDATES', min_candidates)
+        pool, messenger = _scored_pool(scorer, 60, top_k=5)
+        ranked, _ = pool.rerank(weights, messenger, top_k=20)
+        results.append([(candidate.name, fit_score, breakdown) for candidate, fit_score, breakdown in ranked])
+    assert results[0] == results[1]
+
+
+def test_only_newcomers_get_rule_based_messages(scorer):
+    pool, messenger = _scored_pool(scorer, 30, top_k=5)
+    shortlist = {candidate.name for candidate in pool.candidates if candidate.outreach_message}
+
+    ranked, new_entrants = pool.rerank(scorer.weights, messenger)
+    assert {candidate.name for candidate, _, _ in ranked} == shortlist
+    assert new_entrants == 0 and messenger.calls == []
+
+    ranked, new_entrants = pool.rerank(normalize_weights({'location': 1}), messenger, top_k=8)
+    newcomers = [candidate.name for candidate, _, _ in ranked if candidate.name not in shortlist]
+    assert new_entrants == len(newcomers) > 0
+    assert messenger.calls == [(newcomers, False)]
+
+
+def test_rerank_uses_rule_breakdowns_after_ai_rescoring(scorer):
+    pool, messenger = _scored_pool(scorer, 30, top_k=5)
+    rule_scores = {candidate.name: candidate.score_breakdown for candidate in pool.candidates}
+    for candidate in pool.candidates:
+        if candidate.outreach_message:
+            candidate.score_breakdown = {category: 1.0 for category in SCORE_CATEGORIES}
+
+    ranked, _ = pool.rerank(scorer.weights, messenger)
+    assert all(breakdown == rule_scores[candidate.name] for candidate, _, breakdown in ranked)
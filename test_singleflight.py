@@ -0,0 +1,111 @@
+"""
+SingleFlight: concurrent callers with the same key share one execution
+"""
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight('test')
+    calls = []
+    results = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 'result'
+
+    def caller():
+        results.append(flight.do('key', work))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    _run_concurrently(4, caller)
+    leader.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(result == 'result' for result, _ in results)
+    assert flight.get_stats() == {'executions': 1, 'coalesced_calls': 4, 'in_flight': 0}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight('test')
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+    assert flight.get_stats()['executions'] == 2
+
+
+def test_nothing_is_cached_after_completion():
+    flight = SingleFlight('test')
+    counter = iter(range(10))
+    assert flight.do('key', lambda: next(counter))[0] == 0
+    assert flight.do('key', lambda: next(counter))[0] == 1
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight('test')
+    started = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('boom')
+
+    def caller():
+        try:
+            flight.do('key', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    _run_concurrently(3, caller)
+    leader.join()
+
+    assert len(errors) == 4
+    assert flight.get_stats()['in_flight'] == 0
+    # The failed flight is gone, so the next call runs again
+    assert flight.do('key', lambda: 'ok') == ('ok', False)
+
+
+def test_join_and_finish_let_a_caller_lead_incrementally():
+    flight = SingleFlight('test')
+    call, leader = flight.join('key')
+    assert leader
+    follower_call, follower_leads = flight.join('key')
+    assert follower_call is call and not follower_leads
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(flight.wait(call)))
+    waiter.start()
+    flight.finish('key', call, ['partial', 'results'])
+    waiter.join()
+
+    assert results == [['partial', 'results']]
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_wait_raises_a_finished_error():
+    flight = SingleFlight('test')
+    call, _ = flight.join('key')
+    flight.finish('key', call, error=RuntimeError('failed'))
+    with pytest.raises(RuntimeError):
+        flight.wait(call)
@@ -0,0 +1,59 @@
+"""
+Top-K ranking: both scorer paths return exactly the head of a full stable sort
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from batch_scorer import BatchScorer
+from candidate import Candidate
+from scorer import CandidateScorer
+
+POOL_SIZE = 300
+TOP_KS = [0, 1, 2, 10, 37, 299, 300, 301]
+
+
+def _fit_scores(seed, distinct):
+    """Scores drawn from only ``distinct`` values, so the k-th place is usually tied"""
+    rng = random.Random(seed)
+    values = [round(rng.uniform(1.0, 10.0), 2) for _ in range(distinct)]
+    return [rng.choice(values) for _ in range(POOL_SIZE)]
+
+
+def _candidates(fit_scores):
+    candidates = [Candidate(name=f'Candidate {index}') for index in range(len(fit_scores))]
+    for candidate, fit_score in zip(candidates, fit_scores):
+        candidate.fit_score = fit_score
+    return candidates
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return CandidateScorer()
+
+
+@pytest.mark.parametrize('distinct', [1, 3, 20, POOL_SIZE])
+@pytest.mark.parametrize('top_k', TOP_KS)
+def test_rule_path_top_k_is_head_of_full_sort(scorer, distinct, top_k):
+    fit_scores = _fit_scores(distinct, distinct)
+    full = sorted(_candidates(fit_scores), key=lambda x: x.fit_score, reverse=True)
+    expected = [candidate.name for candidate in full[:top_k]]
+    assert [candidate.name for candidate in scorer._rank(_candidates(fit_scores), top_k)] == expected
+
+
+@pytest.mark.parametrize('distinct', [1, 3, 20, POOL_SIZE])
+@pytest.mark.parametrize('top_k', TOP_KS + [None])
+def test_batch_rank_is_head_of_full_sort(scorer, distinct, top_k):
+    fit_scores = _fit_scores(distinct, distinct)
+    full = sorted(range(POOL_SIZE), key=lambda row: fit_scores[row], reverse=True)
+    expected = full if top_k is None else full[:top_k]
+    assert BatchScorer(scorer).rank(np.array(fit_scores), top_k).tolist() == expected
+
+
+def test_ties_at_the_cutoff_keep_pool_order(scorer):
+    fit_scores = [5.0, 9.0, 7.0, 7.0, 3.0, 7.0, 9.0, 7.0]
+    assert BatchScorer(scorer).rank(np.array(fit_scores), 4).tolist() == [1, 6, 2, 3]
+    assert [candidate.name for candidate in scorer._rank(_candidates(fit_scores), 4)] == \
+        ['Candidate 1', 'Candidate 6', 'Candidate 2', 'Candidate 3']